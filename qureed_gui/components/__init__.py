@@ -4,4 +4,5 @@ from .project_explorer import ProjectExplorer
 from .board import BoardContainer
 from .simulation_bar import SimulationBar
 from .simulation_graph import SimulationGraph
-from .simulation_logs import SimulationLogs
\ No newline at end of file
+from .simulation_logs import SimulationLogs
+from .server_console import ServerConsole
\ No newline at end of file
@@ -7,6 +7,7 @@ import flet.canvas as cv
 from theme import ThemeManager
 from logic.logic_module_handler import LogicModuleHandler, LogicModuleEnum
 from logic.board_helpers import get_device_control
+from logic.spatial_index import SpatialGrid, distance
 from .device_creation import DeviceCreation
 from .canvas import Canvas
 from .select_box import SelectBox
@@ -16,8 +17,33 @@ LMH = LogicModuleHandler()
 TM = ThemeManager()
 OFFSET = 0
 BOARD_SIZE = 10000
+# Components and connections closer than the margin to the visible area
+# are rendered as well (in pixels)
+CULL_MARGIN = 600
+# The board is culled again after it is scrolled by this many pixels
+CULL_STEP = 200
+# Size of the visible area, when the page size is not known
+VIEWPORT_SIZE = (1920, 1080)
+
 
 class Board(ft.Container):
+    """
+    Board displays the board components and the connections between
+    them. All of the components are kept in the `components` registry,
+    but only the ones intersecting the visible area (with a margin) are
+    mounted to the board stack, the rest are culled as the board scrolls.
+
+    Attributes:
+    -----------
+    components (list[BoardComponent]): All of the components on the board
+    index (SpatialGrid): Spatial index of the component bounds, used for
+        culling, selection and hit testing
+    devices (dict[str, BoardComponent]): Components by the device uuid
+    ports (dict[tuple[str, str], Port]): Ports by the device uuid and
+        the port label
+    board_offset (list[float]): Scroll offset of the board
+    culled_at (Optional[list[float]]): Offset of the last culling
+    """
     def __init__(self,page, location_widget):
         super().__init__()
         print("RENDERING THE BOARD")
@@ -31,27 +57,34 @@ class Board(ft.Container):
         self.left = 0
         self.bottom = 0
         self.board_offset = [BOARD_SIZE / 2, BOARD_SIZE / 2]
+        self.components = []
+        self.index = SpatialGrid()
+        self.devices = {}
+        self.ports = {}
+        self.culled_at = None
         self.right = 0
         self.transform=ft.transform.Scale
         self.canvas = Canvas()
 
-        self.select_box = SelectBox()
+        self.select_box = SelectBox(self)
 
         SeM = LMH.get_logic(LogicModuleEnum.SELECTION_MANAGER)
         self.gesture_detection = ft.GestureDetector(
             on_tap=lambda e: SeM.deselect_all(),
             on_horizontal_drag_start=self.select_box.sb_start,
             on_horizontal_drag_update=self.select_box.sb_update,
-            on_horizontal_drag_end=lambda e: self.select_box.sb_stop(e,self.board)
+            on_horizontal_drag_end=self.select_box.sb_stop
         )
         
+        # Controls under the board components
+        self.layers = [
+            self.canvas,
+            self.select_box,
+            self.gesture_detection
+        ]
         self.board = ft.Stack(
             expand=True,
-            controls=[
-                self.canvas,
-                self.select_box,
-                self.gesture_detection
-            ]
+            controls=list(self.layers)
         )
         self.board_wrapper = ft.Container(
             height=BOARD_SIZE,
@@ -72,7 +105,7 @@ class Board(ft.Container):
 
     @property
     def device_controls(self):
-        return self.board.controls[1:]
+        return self.components
 
     @property
     def location(self):
@@ -85,12 +118,137 @@ class Board(ft.Container):
 
     def clear_board(self):
         self.canvas.clear_canvas()
-        self.board.controls = [
-            self.canvas,
-            self.select_box,
-            self.gesture_detection]
+        LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER).clear_connections()
+        self.components = []
+        self.index.clear()
+        self.devices = {}
+        self.ports = {}
+        self.culled_at = None
+        self.board.controls = list(self.layers)
         self.center_board()
-        
+
+    def visible_area(self) -> tuple:
+        """
+        Returns the (left, top, right, bottom) of the visible part of
+        the board, extended by the CULL_MARGIN
+        """
+        width, height = VIEWPORT_SIZE
+        if self.page and self.page.width and self.page.height:
+            width, height = self.page.width, self.page.height
+        x, y = self.board_offset
+        return (
+            x - CULL_MARGIN, y - CULL_MARGIN,
+            x + width + CULL_MARGIN, y + height + CULL_MARGIN
+        )
+
+    def cull(self, force: bool = False) -> None:
+        """
+        Mounts the components and connections intersecting the visible
+        area and unmounts the rest. Unless forced, the board is culled
+        only after it was scrolled by at least CULL_STEP.
+        """
+        if not force and self.culled_at is not None and all(
+            abs(o - c) < CULL_STEP for o, c in zip(self.board_offset, self.culled_at)
+        ):
+            return
+        self.culled_at = list(self.board_offset)
+        area = self.visible_area()
+        visible = self.index.query(area)
+        mounted = self.board.controls[len(self.layers):]
+        if len(visible) != len(mounted) or any(a is not b for a, b in zip(visible, mounted)):
+            self.board.controls[len(self.layers):] = visible
+            self.board.update()
+
+        CM = LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER)
+        if CM.cull_connections(area):
+            self.canvas.canvas.update()
+
+    def add_components(self, components: list, render: bool = True) -> None:
+        """
+        Adds the components to the board, they are mounted if visible.
+        If render is False the components are mounted by the next cull.
+        """
+        self.components.extend(components)
+        for component in components:
+            self.index.insert(component, component.bounds())
+            self.register_lookup(component)
+        if render:
+            self.cull(force=True)
+
+    def remove_component(self, component) -> None:
+        """
+        Removes the component from the board
+        """
+        self.components.remove(component)
+        self.index.remove(component)
+        self.unregister_lookup(component)
+        if component in self.board.controls:
+            self.board.controls.remove(component)
+            self.board.update()
+
+    def register_lookup(self, component) -> None:
+        """
+        Registers the component and its ports in the uuid lookup tables,
+        the first component with the uuid is kept
+        """
+        uuid = component.device.uuid
+        if self.devices.setdefault(uuid, component) is not component:
+            return
+        for port in [*component.ports_left.content.controls,
+                     *component.ports_right.content.controls]:
+            self.ports.setdefault((uuid, port.port_label), port)
+
+    def unregister_lookup(self, component) -> None:
+        """
+        Removes the component and its ports from the lookup tables
+        """
+        uuid = component.device.uuid
+        if self.devices.get(uuid) is not component:
+            return
+        del self.devices[uuid]
+        for port in [*component.ports_left.content.controls,
+                     *component.ports_right.content.controls]:
+            if self.ports.get((uuid, port.port_label)) is port:
+                del self.ports[(uuid, port.port_label)]
+
+    def move_components(self, components: list, delta_x: float, delta_y: float) -> None:
+        """
+        Moves the components and their connections, the mounted
+        components and paths are sent with one page update. The moved
+        components are culled at the end of the drag.
+        """
+        connections = {}
+        for component in components:
+            for connection in component.device_move(delta_x, delta_y):
+                connections[id(connection)] = connection
+            self.index.move(component, component.bounds())
+        LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER).moved(connections.values())
+        controls = [c for c in components if c.mounted]
+        controls.extend(c.connection for c in connections.values() if c.mounted)
+        if controls:
+            self.page.update(*controls)
+
+    def component_at(self, x: float, y: float):
+        """
+        Returns the topmost component at the board location
+        """
+        components = self.index.at((x, y))
+        return components[0] if components else None
+
+    def nearest_port(self, x: float, y: float, radius: float = 20):
+        """
+        Returns the port nearest to the board location, within the
+        radius, or None
+        """
+        nearest, nearest_distance = None, radius
+        for component in self.index.nearest((x, y), radius):
+            for port in [*component.ports_left.content.controls,
+                         *component.ports_right.content.controls]:
+                px, py = port.location
+                d = distance((x, y), (px, py, px, py))
+                if d <= nearest_distance:
+                    nearest, nearest_distance = port, d
+        return nearest
 
     def on_scroll_handle(self, e, direction):
         if direction == 'x':
@@ -99,6 +257,7 @@ class Board(ft.Container):
             self.board_offset[1] = e.pixels
         
         self.location_widget.update_location(*self.location)
+        self.cull()
             
     def move_board(self, e):
         location = self.location
@@ -136,55 +295,48 @@ class Board(ft.Container):
 
         device_location = location
         result = get_device_control(device)(location, device)
-        success = result.register_device_with_server()
-        if success:
-            if isinstance(result, list):
-                self.board.controls.extend(result)
-            else:
-                self.board.controls.append(result)
-            self.board.update()
-            PM.display_message("Device Created")
+
+        def device_registered(success):
+            if success:
+                self.add_components(result if isinstance(result, list) else [result])
+                LMH.get_logic(LogicModuleEnum.BOARD_MANAGER).mark_changed()
+                PM.display_message("Device Created")
+
+        result.register_device_with_server(on_done=device_registered)
 
     def load_devices_bulk(self, device_list):
+        """
+        Builds the components of the loaded scheme, nothing is rendered
+        until the connections are loaded with load_connections_bulk
+        """
         device_controls = []
         for device in device_list:
             result = get_device_control(device)(device.location, device)
             if isinstance(result, list):
-                self.board.controls.extend(result)
+                device_controls.extend(result)
             else:
-                self.board.controls.append(result)
-        self.board.update()
+                device_controls.append(result)
+        self.add_components(device_controls, render=False)
 
     def load_connections_bulk(self, connections):
+        """
+        Builds the connections and port states of the loaded scheme,
+        then renders the visible components and connections with one
+        board and one canvas update
+        """
         CM = LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER)
         for connection in connections:
             port1 = self.get_port(connection.device_one_uuid, connection.device_one_port_label)
             port2 = self.get_port(connection.device_two_uuid, connection.device_two_port_label)
-            CM.load_connection(port1, port2)
+            CM.load_connection(port1, port2, update=False)
+        self.cull(force=True)
             
 
     def get_device(self, uuid):
-        from components.board_component import BoardComponent
-        for device in self.board.controls:
-            if not isinstance(device, BoardComponent):
-                continue
-            if device.device.uuid == uuid:
-                return device
+        return self.devices.get(uuid)
 
     def get_port(self, device_uuid, port_label):
-        device = self.get_device(device_uuid)
-        for p in device.device.ports:
-            if p.label == port_label:
-                port = p
-
-        if port.direction=="input":
-            ports = device.ports_left
-        elif port.direction=="output":
-            ports = device.ports_right
-
-        for p in ports.content.controls:
-            if p.port_label == port.label:
-                return p
+        return self.ports.get((device_uuid, port_label))
 
 
 class BoardContainer(ft.Container):
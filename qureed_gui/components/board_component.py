@@ -1,18 +1,25 @@
 """
 A base component, which is the base for the other components
 """
+import time
 
 import flet as ft
 
-from qureed_project_server import server_pb2
+from google.protobuf.json_format import MessageToDict
+
 from theme import ThemeManager
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from logic.property_buffer import PropertyWriteBuffer
 
 from .ports import Ports
 
 TM = ThemeManager()
 LMH = LogicModuleHandler()
 
+# Minimal time between two rendered drag steps (in seconds), the drag
+# deltas in between are accumulated
+DRAG_FRAME_INTERVAL = 1 / 30
+
 class BoardComponent(ft.Container):
     """
     Board Component is a base component for all connectable devices on the board.
@@ -23,6 +30,8 @@ class BoardComponent(ft.Container):
         left (float): Position from the left Board border (absolute position)
         height (float): Total height of the Box
         width (float): Total width of the box
+        mounted (bool): True while the component is rendered, components
+            outside of the visible area are culled by the Board
 
     """
     def __init__(self, location:tuple, height, width):
@@ -32,7 +41,11 @@ class BoardComponent(ft.Container):
         self.height = height
         self.width = width
         self.border_radius=4
+        self.mounted = False
+        self.drag_delta = [0, 0]
+        self.drag_rendered_at = 0
         self.bgcolor=TM.get_nested_color("board_component", "bg")
+        self.property_buffer = PropertyWriteBuffer(self)
         self._compute_ports()
         self.contains = ft.Container(
             top=10,bottom=0,right=10, left=10,
@@ -47,6 +60,7 @@ class BoardComponent(ft.Container):
             content = ft.GestureDetector(
                 drag_interval=1,
                 on_vertical_drag_update=self.handle_device_move,
+                on_vertical_drag_end=self.handle_drag_end,
                 on_tap=self.handle_select,
                 )
             )
@@ -61,28 +75,82 @@ class BoardComponent(ft.Container):
             ]
             )
 
+    def did_mount(self):
+        self.mounted = True
+
+    def will_unmount(self):
+        self.mounted = False
+
+    def refresh(self):
+        """
+        Updates the component, the culled components are rendered
+        with their current state once they are mounted again
+        """
+        if self.mounted:
+            self.update()
+
+    def bounds(self) -> tuple:
+        """
+        Returns the (left, top, right, bottom) of the component
+        """
+        return (
+            self.left, self.top,
+            self.left + (self.width or 0), self.top + (self.height or 0)
+        )
+
     def _compute_ports(self):
         self.ports_left = Ports(height = self.height-10, left=0, parent=self)
         self.ports_right = Ports(height = self.height-10, right=0, parent=self)
 
-    def device_move(self, e):
-        self.top += e.delta_y
-        self.left += e.delta_x
-        self.top = max(self.top, 0)
-        self.left = max(self.left, 0)
+    def device_move(self, delta_x, delta_y) -> list:
+        """
+        Moves the component and the ends of its connections, nothing is
+        updated. Returns the moved connections.
+        """
+        top, left = self.top, self.left
+        self.top = max(self.top + delta_y, 0)
+        self.left = max(self.left + delta_x, 0)
+        delta_x, delta_y = self.left - left, self.top - top
+        connections = []
         for port in [*self.ports_left.content.controls, *self.ports_right.content.controls]:
             if port.connection:
-                port.connection.move(port, e.delta_x, e.delta_y)
-        self.update()
+                port.connection.move(port, delta_x, delta_y, update=False)
+                connections.append(port.connection)
+        LMH.get_logic(LogicModuleEnum.BOARD_MANAGER).mark_moved(self)
+        return connections
 
     def handle_device_move(self, e):
+        """
+        Accumulates the drag deltas, the selection is moved at most once
+        per DRAG_FRAME_INTERVAL
+        """
         SM = LMH.get_logic(LogicModuleEnum.SELECTION_MANAGER)
         if self not in SM.selected_components:
             SM.deselect_all()
-        if SM.selected_components == []:
-            self.device_move(e)
-        for bc in SM.selected_components:
-            bc.device_move(e)
+        self.drag_delta[0] += e.delta_x
+        self.drag_delta[1] += e.delta_y
+        if time.monotonic() - self.drag_rendered_at >= DRAG_FRAME_INTERVAL:
+            self.render_drag()
+
+    def handle_drag_end(self, e):
+        """
+        Renders the rest of the drag and culls the moved components
+        """
+        self.render_drag()
+        LMH.get_logic(LogicModuleEnum.BOARD_MANAGER).board.cull(force=True)
+
+    def render_drag(self):
+        """
+        Moves the selection (or this component) by the accumulated delta
+        """
+        delta_x, delta_y = self.drag_delta
+        self.drag_delta = [0, 0]
+        self.drag_rendered_at = time.monotonic()
+        if not delta_x and not delta_y:
+            return
+        SM = LMH.get_logic(LogicModuleEnum.SELECTION_MANAGER)
+        BM = LMH.get_logic(LogicModuleEnum.BOARD_MANAGER)
+        BM.board.move_components(SM.selected_components or [self], delta_x, delta_y)
 
     def handle_select(self, e):
         SM = LMH.get_logic(LogicModuleEnum.SELECTION_MANAGER)
@@ -91,29 +159,37 @@ class BoardComponent(ft.Container):
 
     def select(self):
         self.border=ft.border.all(1, "yellow")
-        self.update()
+        self.refresh()
 
     def deselect(self):
         self.border = None
-        self.update()
+        self.refresh()
+
+    def highlight(self, highlighted: bool = True):
+        """
+        Highlights the component while the select box is drawn, when
+        the highlight is removed the selection border is restored
+        """
+        if highlighted:
+            self.border = ft.border.all(1, "orange")
+        else:
+            SM = LMH.get_logic(LogicModuleEnum.SELECTION_MANAGER)
+            selected = self in SM.selected_components
+            self.border = ft.border.all(1, "yellow") if selected else None
+        self.refresh()
 
     def update_properties(self, properties:dict[str, dict]):
-        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-        if hasattr(self, "device"):
-            device_copy = type(self.device)()
-            device_copy.CopyFrom(self.device)
-            properties_msg = server_pb2.DeviceProperties(
-                properties=properties
-                )
-            device_copy.device_properties.CopyFrom(properties_msg)
-            SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
-            response = SvM.update_device_properties(device_copy)
-            if response.status == "success":
-                self.device = device_copy
-                PM.display_message("Device property updated")
-            else:
-                PM.display_message(f"Device property update failed: {response.message}")
-            if hasattr(self, "update_properties_hook"):
-                self.update_properties_hook()
-
-            
+        """
+        Buffers the changed properties, the edits are sent to the
+        server by the property buffer after a short quiet period.
+
+        Parameters:
+        -----------
+        properties (dict[str, dict]): property name -> {"type", "value"}
+        """
+        if not hasattr(self, "device"):
+            return
+        current = MessageToDict(self.device.device_properties.properties)
+        for name, prop in properties.items():
+            if current.get(name) != prop:
+                self.property_buffer.write(name, prop)
@@ -3,6 +3,15 @@ import flet.canvas as cv
 
 
 class Connection:
+    """
+    Connection renders the path between two connected ports on the
+    board canvas. Paths outside of the visible area are culled by the
+    Board, see `show` and `hide`.
+
+    Attributes:
+    -----------
+    mounted (bool): True while the path is on the canvas
+    """
 
     def __init__(self, port_a, port_b, canvas):
         self.port_a = port_a
@@ -10,37 +19,84 @@ class Connection:
         self._start_point = list(port_a.location)
         self._end_point = list(port_b.location)
         self.canvas = canvas
-        
-
-    def draw(self):
-        self.connection = cv.Path(
-            [
-                cv.Path.MoveTo(self._start_point[0], self._start_point[1]),
-                cv.Path.LineTo(
-                    (self._start_point[0] + self._end_point[0]) / 2,
-                    self._start_point[1],
-                ),
-                cv.Path.LineTo(
-                    (self._start_point[0] + self._end_point[0]) / 2, self._end_point[1]
-                ),
-                cv.Path.LineTo(self._end_point[0], self._end_point[1]),
-            ],
+        self.connection = None
+        self.mounted = False
+
+    def _points(self) -> list[tuple]:
+        middle = (self._start_point[0] + self._end_point[0]) / 2
+        return [
+            (self._start_point[0], self._start_point[1]),
+            (middle, self._start_point[1]),
+            (middle, self._end_point[1]),
+            (self._end_point[0], self._end_point[1]),
+        ]
+
+    def _path(self) -> cv.Path:
+        start, *lines = self._points()
+        return cv.Path(
+            [cv.Path.MoveTo(*start), *(cv.Path.LineTo(*point) for point in lines)],
             paint=ft.Paint(
                 stroke_width=3,
                 style=ft.PaintingStyle.STROKE,
             ),
         )
+
+    def bounds(self) -> tuple:
+        """
+        Returns the (left, top, right, bottom) of the path
+        """
+        return (
+            min(self._start_point[0], self._end_point[0]),
+            min(self._start_point[1], self._end_point[1]),
+            max(self._start_point[0], self._end_point[0]),
+            max(self._start_point[1], self._end_point[1]),
+        )
+
+    def draw(self, update=True):
+        self.connection = self._path()
         self.canvas.shapes.append(self.connection)
-        self.canvas.update()
+        self.mounted = True
+        if update:
+            self.canvas.update()
+
+    def build(self):
+        """
+        Builds the path without putting it on the canvas, it is mounted
+        by the Board culling (used when a scheme is loaded)
+        """
+        self.connection = self._path()
+
+    def redraw(self, update=True):
+        """
+        Moves the path to the current end points, the path elements are
+        mutated in place. If update is False the caller updates the path
+        (see Board.move_components).
+        """
+        for element, (x, y) in zip(self.connection.elements, self._points()):
+            element.x = x
+            element.y = y
+        if update and self.mounted:
+            self.connection.update()
+
+    def show(self):
+        """
+        Puts the path on the canvas, the canvas is not updated
+        """
+        if not self.mounted:
+            self.canvas.shapes.append(self.connection)
+            self.mounted = True
 
-    def redraw(self):
+    def hide(self):
         """
-        Removes the connection path and creates a new on
+        Takes the path off the canvas, the canvas is not updated. The
+        path may already be gone, if the canvas was cleared.
         """
-        self.canvas.shapes.remove(self.connection)
-        self.draw()
+        if self.mounted:
+            if self.connection in self.canvas.shapes:
+                self.canvas.shapes.remove(self.connection)
+            self.mounted = False
 
-    def move(self, port, delta_x, delta_y):
+    def move(self, port, delta_x, delta_y, update=True):
         """
         Handles the change of the connection
         when any device is moved
@@ -51,8 +107,9 @@ class Connection:
         if port == self.port_b:
             self._end_point[0] = self._end_point[0] + delta_x
             self._end_point[1] = self._end_point[1] + delta_y
-        self.redraw()
+        self.redraw(update)
 
     def remove(self):
-        self.canvas.shapes.remove(self.connection)
-        self.canvas.update()
+        if self.mounted:
+            self.hide()
+            self.canvas.update()
@@ -36,20 +36,27 @@ class Device(BoardComponent):
             ]
             )
 
-    def register_device_with_server(self) -> bool:
-        if not self.device.uuid:
-            PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-            SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+    def register_device_with_server(self, on_done) -> None:
+        """
+        Registers the new device with the server, on_done receives
+        True if the device was created.
+        """
+        if self.device.uuid:
+            on_done(False)
+            return
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
 
-            uid = uuid.uuid4()
-            self.device.uuid = str(uid)
-            response = SvM.add_device(self.device)
+        def device_added(response):
             if response.status == "failure":
                 PM.display_message(f"Device (self.device.module_class) not created: {response.message}")
-                return False
-            return True
-            #self.device.uuid = response.device_uuid
-        
+                on_done(False)
+                return
+            on_done(True)
+
+        self.device.uuid = str(uuid.uuid4())
+        SvM.add_device(self.device, on_done=device_added)
+
     def _compute_ports(self):
         input_ports = [
             (port.label, port) for port in self.device.ports if port.direction == "input"
@@ -83,13 +90,15 @@ class Device(BoardComponent):
         BM.display_info(f"")
 
     def handle_delete(self, e):
-        
         CM = LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER)
         BM = LMH.get_logic(LogicModuleEnum.BOARD_MANAGER)
-        for port in [*self.ports_left.content.controls,
-                     *self.ports_right.content.controls]:
-            CM.disconnect(port)
-        BM.remove_device(self)
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        with SvM.batch() as batch:
+            for port in [*self.ports_left.content.controls,
+                         *self.ports_right.content.controls]:
+                CM.disconnect(port)
+            batch.barrier()
+            BM.remove_device(self)
         
             
         
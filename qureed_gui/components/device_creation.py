@@ -59,17 +59,19 @@ class DeviceCreation(ft.AlertDialog):
 
     def update_dialog(self):
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
-        all_devices = SvM.get_all_devices()
-        PM.display_message("Grabbing Existing Devices")
+        CC = LMH.get_logic(LogicModuleEnum.CATALOG_CACHE)
+        if not CC.get("devices", self.devices_loaded):
+            PM.display_message("Grabbing Existing Devices")
 
+        KED = LMH.get_logic(LogicModuleEnum.KEYBOARD_DISPATCHER)
+        KED.active = False
+
+    def devices_loaded(self, all_devices):
+        """Displays the devices once the server returned them."""
         self.devices = all_devices.devices
         self.filtered_devices = self.devices
         self.update_device_list()
 
-        KED = LMH.get_logic(LogicModuleEnum.KEYBOARD_DISPATCHER)
-        KED.active = False
-
     def update_device_list(self):
         """Update the ListView based on filtered devices."""
         self.qureed_devices.controls = [
@@ -5,6 +5,7 @@ from enum import Enum
 from google.protobuf.json_format import MessageToDict
 
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from logic.property_buffer import PropertyState
 from theme import ThemeManager
 
 TM = ThemeManager()
@@ -29,8 +30,10 @@ class Setting(ft.Container):
         self.parameter=parameter
         properties = MessageToDict(self.device.device.device_properties.properties)
         self.properties = properties
+        buffer = self.device.property_buffer
+        self.status = ft.Icon(name=None, size=14)
         if properties[parameter]["type"] == "bool":
-            value = properties[parameter].get("value", False)
+            value = buffer.value(parameter, properties[parameter].get("value", False))
             selected = {}
             if value:
                 selected = {True}
@@ -60,7 +63,8 @@ class Setting(ft.Container):
                         selected = selected,
                         allow_multiple_selection=False,
                         on_change=self.handle_bool_change
-                    )
+                    ),
+                    self.status
                     ]
                 )
         else:
@@ -68,19 +72,19 @@ class Setting(ft.Container):
                 label=f"{parameter}:{properties[parameter]['type']}",
                 color=TM.get_nested_color("device_settings", "text"),
                 border_color=TM.get_nested_color("device_settings", "input_border_color"),
-                value=properties[parameter].get("value", ""),
+                value=buffer.value(parameter, properties[parameter].get("value", "")),
                 label_style=ft.TextStyle(
                     color=TM.get_nested_color("device_settings", "text"),
                     ),
+                suffix=self.status,
                 on_change=self.handle_on_change
                 )
 
     def handle_bool_change(self, e):
-        if e.data== '["true"]':
-            self.device_instance.set_value(True)
-        else:
-            self.device_instance.set_value(False)
-        self.settings.update_device()
+        self.properties[self.parameter]["value"] = e.data == '["true"]'
+        self.device.property_buffer.write(
+            self.parameter, self.properties[self.parameter]
+            )
 
     def handle_on_change(self, e):
         try:
@@ -88,8 +92,8 @@ class Setting(ft.Container):
             value_cast = type_mapping[value_cast]
             value = value_cast(e.data)
             self.properties[self.parameter]["value"]=value
-            self.device.update_properties(
-                self.properties
+            self.device.property_buffer.write(
+                self.parameter, self.properties[self.parameter]
                 )
             self.content.border_color = None
             self.content.error_text = None
@@ -100,6 +104,26 @@ class Setting(ft.Container):
         #self.settings.update_device()
         self.content.update()
 
+    def show_state(self, state: str, message: str = ""):
+        """
+        Displays whether the edited value was already committed
+        to the server.
+        """
+        if state == PropertyState.PENDING:
+            self.status.name = ft.Icons.SCHEDULE
+            self.status.color = "orange"
+            self.status.tooltip = "Pending"
+        elif state == PropertyState.COMMITTED:
+            self.status.name = ft.Icons.CHECK
+            self.status.color = "green"
+            self.status.tooltip = "Saved"
+        else:
+            self.status.name = ft.Icons.ERROR_OUTLINE
+            self.status.color = "red"
+            self.status.tooltip = message
+        if self.status.page:
+            self.status.update()
+
         
 class DeviceSettings(ft.Container):
     def __init__(self):
@@ -134,11 +158,14 @@ class DeviceSettings(ft.Container):
             )
 
     def display_settings(self, device):
+        if self.device is not None:
+            self.device.property_buffer.on_state = None
         self.device = device
         self.settings = [
             Setting(self, self.device, key, prop) for key,prop in
             self.device.device.device_properties.properties.items()
             ]
+        self.device.property_buffer.on_state = self.property_state
         self.content.controls = [
             ft.Text(
                 "Device Properties",
@@ -152,7 +179,17 @@ class DeviceSettings(ft.Container):
         self.visible = True
         self.update()
 
+    def property_state(self, name: str, state: str, message: str):
+        """
+        Property buffer listener, forwards the state to the setting
+        """
+        for setting in self.settings:
+            if setting.parameter == name:
+                setting.show_state(state, message)
+
     def hide_settings(self):
+        if self.device is not None:
+            self.device.property_buffer.on_state = None
         self.device = None
         self.visible = False
         self.update()
@@ -165,6 +202,8 @@ class DeviceSettings(ft.Container):
 
     def device_disconnect(self):
         CM = LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER)
-        for port in self.device.ports_right.content.controls:
-            CM.disconnect(port)
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        with SvM.batch():
+            for port in self.device.ports_right.content.controls:
+                CM.disconnect(port)
     
@@ -73,15 +73,11 @@ class IconSelect(ft.Container):
     def __init__(self):
         super().__init__()
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
-        response = SvM.get_all_icons()
-        self.icons = response.icons_list
+        CC = LMH.get_logic(LogicModuleEnum.CATALOG_CACHE)
+        self.icons = []
         self.expand=True
         self.height=100
 
-        
-        qureed_icons = []
-        self.icons.extend(qureed_icons)
         self.image_container = ft.Container(
             width=IMAGE_PREVIEW_SIZE, height=IMAGE_PREVIEW_SIZE, 
             border_radius=5,
@@ -100,6 +96,17 @@ class IconSelect(ft.Container):
                 self.image_container
             ]
         )
+        CC.get("icons", self.icons_loaded)
+
+    def icons_loaded(self, response):
+        self.icons = list(response.icons_list)
+        dropdown = self.content.controls[0]
+        dropdown.options = [
+            ft.dropdown.Option(text=ic.name, key=ic.abs_path)
+            for ic in self.icons
+        ]
+        if self.page:
+            dropdown.update()
 
     def on_select(self, e):
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
@@ -181,7 +188,7 @@ class NewProperty(ft.Row):
 class NewDeviceDialog(ft.AlertDialog):
     def __init__(self, page):
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        CC = LMH.get_logic(LogicModuleEnum.CATALOG_CACHE)
         super().__init__()
         self.modal = True
         self.existing_icon_list = []
@@ -192,10 +199,9 @@ class NewDeviceDialog(ft.AlertDialog):
             ]
         self.device_name = ft.TextField(label="New device name")
         #signals = QI.get_qureed_signals()
-        response = SvM.get_all_signals()
-        signals = response.signals
-        self.input_ports = PortCreation("Input Ports", signals)
-        self.output_ports = PortCreation("Output Ports", signals)
+        self.input_ports = PortCreation("Input Ports", [])
+        self.output_ports = PortCreation("Output Ports", [])
+        CC.get("signals", self.signals_loaded)
         self.icon_select = IconSelect()
         self.tags = ft.TextField(label="Tags (comma ',' separated)")
         self.properties = Properties()
@@ -220,6 +226,11 @@ class NewDeviceDialog(ft.AlertDialog):
         KED = LMH.get_logic(LogicModuleEnum.KEYBOARD_DISPATCHER)
         KED.active = False
 
+    def signals_loaded(self, response):
+        signals = list(response.signals)
+        self.input_ports.signals = signals
+        self.output_ports.signals = signals
+
     def on_confirm(self, e):
         if self.device_name.value == "":
             snack_bar = ft.SnackBar(content=ft.Text("No Device Name Given")) 
@@ -280,20 +291,24 @@ class NewDeviceDialog(ft.AlertDialog):
             ports=new_device_ports,
             device_properties=new_device_properties,
             )
-        response = SvM.generate_new_device(new_device)
-        if response.status=="failure":
-            snack_bar = ft.SnackBar(content=ft.Text(response.message)) 
-            snack_bar.open = True
-            e.page.overlay.append(snack_bar)
-            e.page.update()
-            return
-        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-        PM.project_explorer.update_project()
+        page = e.page
 
-        KED = LMH.get_logic(LogicModuleEnum.KEYBOARD_DISPATCHER)
-        KED.active = True
-        self.open = False
-        e.page.update()
+        def device_generated(response):
+            if response.status=="failure":
+                snack_bar = ft.SnackBar(content=ft.Text(response.message)) 
+                snack_bar.open = True
+                page.overlay.append(snack_bar)
+                page.update()
+                return
+            PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+            PM.project_explorer.update_project()
+
+            KED = LMH.get_logic(LogicModuleEnum.KEYBOARD_DISPATCHER)
+            KED.active = True
+            self.open = False
+            page.update()
+
+        SvM.generate_new_device(new_device, on_done=device_generated)
 
     def on_cancel(self, e):
         self.open = False  # Set the dialog's open property to False
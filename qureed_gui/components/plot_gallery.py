@@ -0,0 +1,142 @@
+from pathlib import Path
+
+import flet as ft
+
+from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from qureed_gui.logic.board_helpers import get_device_icon
+
+LMH = LogicModuleHandler()
+
+DIALOG_HEIGHT = 600
+DIALOG_WIDTH = 900
+TILE_SIZE = 180
+
+
+class PlotImage(ft.Container):
+    """
+    Plot Image displays the cached preview of the plot, it is loaded
+    in the background by the ThumbnailCache. The full resolution
+    plot is loaded only when requested.
+
+    Attributes:
+    -----------
+    path (str): Path of the plot
+    full (bool): If True the full resolution plot is displayed
+    """
+    def __init__(self, path, **kwargs):
+        super().__init__(**kwargs)
+        self.path = str(path)
+        self.full = False
+        self.loaded = False
+        self.preview = None
+        self.alignment = ft.alignment.center
+        self.content = self.loading()
+        TC = LMH.get_logic(LogicModuleEnum.THUMBNAIL_CACHE)
+        TC.get(self.path, self.preview_loaded)
+
+    @staticmethod
+    def loading() -> ft.ProgressRing:
+        return ft.ProgressRing(width=20, height=20, stroke_width=2)
+
+    def preview_loaded(self, preview):
+        self.loaded = True
+        self.preview = preview
+        if self.full:
+            return
+        if preview is None:
+            self.content = ft.Text("Plot can't be loaded", color="#f2a797")
+        else:
+            self.content = ft.Image(src_base64=preview, fit=ft.ImageFit.CONTAIN)
+        if self.page:
+            self.update()
+
+    def toggle_full(self):
+        """
+        Switches between the preview and the full resolution plot
+        """
+        self.full = not self.full
+        if self.full:
+            self.content = ft.Image(src_base64=get_device_icon(self.path), fit=ft.ImageFit.CONTAIN)
+        elif self.loaded:
+            self.preview_loaded(self.preview)
+        else:
+            self.content = self.loading()
+        self.update()
+
+
+class PlotPreview(ft.Column):
+    """
+    Preview of the plot of a figure log, the full resolution plot is
+    loaded with the button
+    """
+    def __init__(self, path):
+        super().__init__()
+        self.image = PlotImage(path, height=240)
+        self.button = ft.TextButton("Full resolution", on_click=self.toggle_full)
+        self.controls = [self.image, self.button]
+
+    def toggle_full(self, e):
+        self.image.toggle_full()
+        self.button.text = "Preview" if self.image.full else "Full resolution"
+        self.image.height = None if self.image.full else 240
+        self.update()
+
+
+class PlotGallery(ft.AlertDialog):
+    """
+    Plot Gallery lists the plots in the plots/ directory of the project,
+    the tiles display the previews from the ThumbnailCache, clicking a
+    tile opens the full resolution plot.
+    """
+    def __init__(self):
+        super().__init__()
+        TC = LMH.get_logic(LogicModuleEnum.THUMBNAIL_CACHE)
+        self.plots = TC.plots()
+        self.title = ft.Text(f"Plots ({len(self.plots)})")
+        self.actions = [ft.TextButton("Close", on_click=self.close_dialog)]
+        self.grid = ft.GridView(
+            expand=True,
+            max_extent=TILE_SIZE,
+            child_aspect_ratio=1,
+            spacing=10,
+            run_spacing=10,
+            controls=[self.tile(path) for path in self.plots],
+        )
+        self.content = ft.Container(
+            height=DIALOG_HEIGHT, width=DIALOG_WIDTH,
+            content=self.grid if self.plots else ft.Text("No plots in the project yet"),
+        )
+
+    def tile(self, path: Path) -> ft.Container:
+        return ft.Container(
+            content=ft.Column(
+                [
+                    PlotImage(path, expand=True),
+                    ft.Text(path.name, size=11, no_wrap=True, overflow=ft.TextOverflow.ELLIPSIS),
+                ],
+                spacing=2,
+            ),
+            tooltip=str(path),
+            border_radius=5,
+            padding=5,
+            bgcolor="#222222",
+            on_click=lambda e, path=path: self.show_plot(path),
+        )
+
+    def show_plot(self, path: Path):
+        image = ft.Image(src_base64=get_device_icon(path), fit=ft.ImageFit.CONTAIN, expand=True)
+        self.title.value = path.name
+        self.content.content = ft.Column(
+            [ft.TextButton("Back", icon=ft.icons.ARROW_BACK, on_click=self.show_grid), image],
+            expand=True,
+        )
+        self.update()
+
+    def show_grid(self, e):
+        self.title.value = f"Plots ({len(self.plots)})"
+        self.content.content = self.grid
+        self.update()
+
+    def close_dialog(self, e):
+        self.open = False
+        e.page.update()
@@ -76,6 +76,7 @@ class Port(ft.Container):
         self.connected = False
         self.connection = None
         self.hover = False
+        self.mounted = False
 
         if direction=="IN":
             self.right_radius = 5
@@ -113,9 +114,16 @@ class Port(ft.Container):
             return TM.get_nested_color("port", "bg_connected")
         return TM.get_nested_color("port", "bg")
 
-    def update_bg_color(self):
+    def did_mount(self):
+        self.mounted = True
+
+    def will_unmount(self):
+        self.mounted = False
+
+    def update_bg_color(self, update=True):
         self.content.controls[0].bgcolor = self.choose_bg_color()
-        self.update()
+        if update and self.mounted:
+            self.update()
 
     @property
     def location(self):
@@ -146,10 +154,10 @@ class Port(ft.Container):
         CM = LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER)
         CM.disconnect(self)
 
-    def set_connection(self, connection=None) -> None:
+    def set_connection(self, connection=None, update=True) -> None:
         self.connection = connection
         if connection:
             self.connected = True
         else:
             self.connected = False
-        self.update_bg_color()
+        self.update_bg_color(update)
@@ -169,35 +169,45 @@ class File(ft.TextButton):
         self.absolute_path = Path(PM.path) / Path(self.path)
 
 
+        self.content = ft.Text(
+            self.name, size=15, weight=ft.FontWeight.BOLD, color="#9d9ca0"
+        )
         if self.name[-3:] == ".py" and "devices" in str(self.path):
-
-            device = SvM.get_device(PM.path + "/"+ self.path)
-            if device.status == "failure":
-                return
-            device = device.device
-            self.content = DraggableDevice(
-                device=device,
-                group="device",
-                content_feedback=ft.Container(
-                    width=70,
-                    height=50,
-                    bgcolor="black",
-                    opacity=0.3,
-                    border_radius=5
-                ),
-                content=ft.Text(
-                    device.gui_name if device.gui_name else self.name[-3:],
-                    size=15,
-                    weight=ft.FontWeight.BOLD,
-                    color="#9d9ca0",
-                ),
-            )
-        else:
-            self.content = ft.Text(
-                self.name, size=15, weight=ft.FontWeight.BOLD, color="#9d9ca0"
-            )
+            SvM.get_device(
+                PM.path + "/"+ self.path,
+                on_done=self.device_loaded,
+                on_error=lambda e: print(f"Failed to load {self.path}: {e}")
+                )
         self.on_click = self.handle_on_click
 
+    def device_loaded(self, response):
+        """
+        Makes the file draggable onto the board, once the server
+        loaded the device
+        """
+        if response.status == "failure":
+            return
+        device = response.device
+        self.content = DraggableDevice(
+            device=device,
+            group="device",
+            content_feedback=ft.Container(
+                width=70,
+                height=50,
+                bgcolor="black",
+                opacity=0.3,
+                border_radius=5
+            ),
+            content=ft.Text(
+                device.gui_name if device.gui_name else self.name[-3:],
+                size=15,
+                weight=ft.FontWeight.BOLD,
+                color="#9d9ca0",
+            ),
+        )
+        if self.page:
+            self.update()
+
     def handle_on_click(self, e):
         BM = LMH.get_logic(LogicModuleEnum.BOARD_MANAGER)
         if self.name[-5:] == ".json":
@@ -1,15 +1,21 @@
 import flet as ft
-from components.board_component import BoardComponent
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
 
 LMH = LogicModuleHandler()
 
 class SelectBox(ft.Container):
-    def __init__(self):
+    """
+    Select Box (rubber band) selects the board components inside of it,
+    the components are looked up in the spatial index of the board and
+    highlighted while the box is drawn.
+    """
+    def __init__(self, board):
         super().__init__()
+        self.board = board
         self.visible = False
         self.start_x = None
         self.start_y = None
+        self.highlighted = []
         self.border = ft.border.all(1, "black")
 
     def sb_start(self,e):
@@ -31,21 +37,31 @@ class SelectBox(ft.Container):
         else:
             self.left = self.start_x
         self.update()
+        self.highlight(self.board.index.contained(self.rect()))
 
-    def sb_stop(self, e, stack):
+    def rect(self) -> tuple:
+        return (self.left, self.top, self.left + self.width, self.top + self.height)
+
+    def highlight(self, components):
+        """
+        Highlights the components, only the changes are updated
+        """
+        current = {id(c) for c in components}
+        previous = {id(c) for c in self.highlighted}
+        for component in self.highlighted:
+            if id(component) not in current:
+                component.highlight(False)
+        for component in components:
+            if id(component) not in previous:
+                component.highlight(True)
+        self.highlighted = components
+
+    def sb_stop(self, e):
         self.visible=False
         self.update()
+        self.highlight([])
         if self.top is None or self.height is None:
             return
-        top = self.top
-        bottom = self.top + self.height
-        left = self.left
-        right = self.left + self.width
-        selection = []
-        for element in stack.controls:
-            if isinstance(element, BoardComponent):
-                if element.top > top and element.top + element.height < bottom:
-                    if element.left > left and element.left + element.width < right:
-                        selection.append(element)
+        selection = self.board.index.contained(self.rect())
         SM = LMH.get_logic(LogicModuleEnum.SELECTION_MANAGER)
         SM.new_selection(selection)
@@ -0,0 +1,106 @@
+import threading
+from datetime import datetime
+
+import flet as ft
+
+from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+
+LMH = LogicModuleHandler()
+
+MAX_CONSOLE_LINES = 1000
+REFRESH_INTERVAL = 0.5
+
+
+class ServerConsoleLine(ft.Text):
+    """
+    Renders one line of the server output
+    """
+    def __init__(self, line):
+        super().__init__()
+        timestamp = datetime.fromtimestamp(line.timestamp).strftime("%H:%M:%S.%f")[:-3]
+        self.value = f"{timestamp} [{line.pid}] {line.text}"
+        self.color = "#f2a797" if line.stream == "stderr" else "white"
+        self.font_family = "Courier New"
+        self.size = 12
+        self.selectable = True
+
+
+class ServerConsole(ft.Container):
+    """
+    Server Console displays the output of the project servers. It renders
+    incrementally from the ServeManager output buffer, only the lines
+    which were not yet displayed are fetched and appended.
+
+    Attributes:
+    -----------
+    last_seq (int): Sequence number of the last displayed line
+    max_lines (int): Maximal number of the displayed lines
+    """
+    def __init__(self, max_lines: int = MAX_CONSOLE_LINES):
+        super().__init__()
+        self.top = 0
+        self.left = 20
+        self.right = 20
+        self.bottom = 10
+        self.bgcolor = "black"
+        self.padding = ft.padding.all(5)
+        self.max_lines = max_lines
+        self.last_seq = 0
+        self._stop = None
+        self.lines = ft.ListView(expand=True, spacing=0, auto_scroll=True)
+        self.content = ft.Column(
+            [
+                ft.Row(
+                    [
+                        ft.Text("Server Output", color="white"),
+                        ft.IconButton(
+                            icon=ft.Icons.DELETE_SWEEP,
+                            icon_color="white",
+                            icon_size=16,
+                            tooltip="Clear",
+                            on_click=self.clear
+                        )
+                    ],
+                    alignment=ft.MainAxisAlignment.SPACE_BETWEEN
+                ),
+                self.lines
+            ],
+            expand=True,
+            spacing=0
+        )
+
+    def did_mount(self):
+        self._stop = threading.Event()
+        threading.Thread(
+            target=self._refresh_loop, args=(self._stop,), daemon=True
+            ).start()
+
+    def will_unmount(self):
+        if self._stop:
+            self._stop.set()
+
+    def _refresh_loop(self, stop):
+        while not stop.wait(REFRESH_INTERVAL):
+            self.refresh()
+
+    def refresh(self):
+        """
+        Appends the lines, which were added to the buffer since
+        the last refresh
+        """
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        new_lines = SvM.output.since(self.last_seq)
+        if not new_lines:
+            return
+        self.last_seq = new_lines[-1].seq
+        self.lines.controls.extend(
+            ServerConsoleLine(line) for line in new_lines[-self.max_lines:]
+            )
+        del self.lines.controls[:-self.max_lines]
+        self.lines.update()
+
+    def clear(self, e=None):
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        SvM.output.clear()
+        self.lines.controls = []
+        self.lines.update()
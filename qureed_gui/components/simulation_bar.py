@@ -1,3 +1,4 @@
+import time
 from pathlib import Path
 
 from logic.logic_module_handler import (
@@ -6,6 +7,8 @@ from logic.logic_module_handler import (
 
 import flet as ft
 
+from .plot_gallery import PlotGallery
+
 LMH = LogicModuleHandler()
 
 class SimulationBar(ft.Container):
@@ -34,6 +37,19 @@ class SimulationBar(ft.Container):
                 options=[],
                 on_change=self.on_scheme_select
             )
+        self.runs = ft.Dropdown(
+                label="Run",
+                hint_text="Logs of the previous runs",
+                width=300,
+                color="white",
+                bgcolor="#594c4c",
+                border_color="gray",
+                text_size=15,
+                label_style=ft.TextStyle(color="white"),
+                padding=ft.Padding(0,0,0,0),
+                options=[],
+                on_change=self.on_run_select
+            )
         self.content = ft.Row(
             [
                 ft.IconButton(
@@ -50,7 +66,15 @@ class SimulationBar(ft.Container):
                     border_color="grey",
                     label_style=ft.TextStyle(color="white"),
                     on_change=self.update_simulation_time
-                )
+                ),
+                self.runs,
+                ft.IconButton(
+                    icon=ft.icons.PHOTO_LIBRARY,
+                    icon_color="white",
+                    tooltip="Plots of the project",
+                    on_click=self.open_plot_gallery,
+                    icon_size=20
+                ),
             ],
             alignment=ft.MainAxisAlignment.START
         )
@@ -114,4 +138,32 @@ class SimulationBar(ft.Container):
         print("SELECTED")
         print(e)
         SiM = LMH.get_logic(LogicModuleEnum.SIMULATION_MANAGER)
-        SiM.select_scheme(e.data)
\ No newline at end of file
+        SiM.select_scheme(e.data)
+
+    def update_runs(self, runs):
+        """
+        Lists the archived runs, runs is the output of `LogArchive.runs`
+        """
+        self.runs.options.clear()
+        for run in runs:
+            started = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(run["started"]))
+            scheme = Path(run["scheme"]).name if run["scheme"] else ""
+            state = "" if run["ended"] else " (not finished)"
+            self.runs.options.append(
+                ft.dropdown.Option(
+                    text=f"{started} {scheme}{state}",
+                    key=run["simulation_id"]
+                )
+            )
+        if self.page:
+            self.runs.update()
+
+    def on_run_select(self, e):
+        SiM = LMH.get_logic(LogicModuleEnum.SIMULATION_MANAGER)
+        SiM.open_run(e.data)
+
+    def open_plot_gallery(self, e):
+        gallery = PlotGallery()
+        e.page.overlay.append(gallery)
+        gallery.open = True
+        e.page.update()
@@ -1,156 +1,198 @@
 import flet as ft
 
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
-from qureed_project_server.utils import tensor_from_message
-from qureed_gui.logic.board_helpers import get_device_icon
+from logic.log_index import LogFilter
+from .plot_gallery import PlotPreview
+from .tensor_viewer import LazyTensor, TensorViewer
 
 LMH = LogicModuleHandler()
 
-class SimulationLogLine(ft.Container):
+# Fixed height of one log row (in pixels)
+LOG_ROW_HEIGHT = 20
+# Number of the recycled rows, must cover the tallest viewport
+LOG_WINDOW_ROWS = 60
+FONT_FAMILY = "Courier New"
+
+
+class SimulationLogRow(ft.Container):
     """
-    Individual Log Line renders one log line. It understands, what kind
-    of log it should display. It can display general logs, tensor logs or 
-    plot (picture) logs.
+    Simulation Log Row renders one log line of the visible window.
+    Rows are recycled, when the window moves the row is bound to
+    another log from the log store.
 
     Attributes:
     -----------
-    log: the log message to be generated and displayed
-    expanded: expansion flag, used for plot or tensor logging
-    tensor_data: Optional tensor data
-    plot_path: The path to the plot
-
+    index (Optional[int]): Position of the bound log in the log store
+    log: The bound log message
     """
-    def __init__(self, log):
+    def __init__(self, on_select):
         super().__init__()
-        self.log = log
-        self.spacing = 2
+        self.height = LOG_ROW_HEIGHT
         self.bgcolor = "black"
-        font_family = "Courier New"
-        self.expanded = False
-        controls = [
-            ft.Text(
-                f"[ {float(log.simulation_timestamp):<5} ]", 
-                color="#f1f1f1",
-                font_family=font_family),
-            ft.Text(
-                f"[ {log.log_type[:3]:<3} ]", 
-                color="#d3f2b1",
-                font_family=font_family)
-        ]
-        if hasattr(log, "device_name"):
-            controls.append(
-                ft.Text(
-                    f"{log.device_name[:15]:<15}", 
-                    color="#f2a797",
-                    font_family=font_family)
-            )
-        if hasattr(log, "device_type"):
-            controls.append(
-                ft.Text(
-                    f" {log.device_type:<20} ", 
-                    color="white", 
-                    font_family=font_family)
+        self.index = None
+        self.log = None
+        self.visible = False
+        self.on_click = lambda e: on_select(self.index)
+        self.timestamp = ft.Text(color="#f1f1f1", font_family=FONT_FAMILY, size=12)
+        self.log_type = ft.Text(color="#d3f2b1", font_family=FONT_FAMILY, size=12)
+        self.device_name = ft.Text(color="#f2a797", font_family=FONT_FAMILY, size=12)
+        self.device_type = ft.Text(color="white", font_family=FONT_FAMILY, size=12)
+        self.message = ft.Text(
+            color="white", font_family=FONT_FAMILY, size=12,
+            no_wrap=True, overflow=ft.TextOverflow.ELLIPSIS, expand=True
             )
-        controls.append(
-            ft.Text(
-                " : ",
-                color="#797979", 
-                font_family=font_family),
-        )
-        controls.append(
-            ft.Text(
-                log.message, 
-                color="white", 
-                font_family=font_family),
+        self.attachment = ft.Icon(ft.icons.EXPAND_MORE, color="white", size=10)
+        self.content = ft.Row(
+            [
+                self.timestamp,
+                self.log_type,
+                self.device_name,
+                self.device_type,
+                ft.Text(" : ", color="#797979", font_family=FONT_FAMILY, size=12),
+                self.message,
+                self.attachment,
+            ],
+            spacing=4,
         )
-        self.tensor_data = None
-        self.tensor_display = None
-        self.plot_display = None
 
-        if log.figure:
-            self.plot_path = log.figure
-            self.expand_button = ft.IconButton(
-                icon=ft.icons.EXPAND_MORE,
-                on_click=self.toggle_plot_display,
-                icon_color="white",
-                icon_size=10,
-            )
-            controls.append(self.expand_button)  # Add the button at the start
+    def bind(self, index: int, log, selected: bool = False) -> None:
+        """
+        Binds the row to the log
+        """
+        self.index = index
+        self.visible = True
+        self.bgcolor = "#424242" if selected else "black"
+        if log is self.log:
+            return
+        self.log = log
+        self.timestamp.value = f"[ {float(log.simulation_timestamp):<5} ]"
+        self.log_type.value = f"[ {log.log_type[:3]:<3} ]"
+        self.device_name.value = f"{getattr(log, 'device_name', '')[:15]:<15}"
+        self.device_type.value = f" {getattr(log, 'device_type', ''):<20} "
+        self.message.value = log.message
+        self.attachment.visible = bool(log.figure or log.tensor.real_values)
 
-        if log.tensor.real_values:
-            self.tensor_data = tensor_from_message(log.tensor)  # Convert tensor to NumPy array
-            self.expand_button = ft.IconButton(
-                icon=ft.icons.EXPAND_MORE,
-                on_click=self.toggle_tensor_display,
-                icon_color="white",
-                icon_size=10
-            )
-            controls.append(self.expand_button)  # Add the button at the start
+    def unbind(self) -> None:
+        self.index = None
+        self.log = None
+        self.visible = False
 
-        self.main_row = ft.Row(controls)
-        self.content = ft.Column([self.main_row])
 
-        self.on_hover = self.on_hover_handler
+class SimulationLogDetail(ft.Container):
+    """
+    Detail pane, displays the plot or the tensor of the selected log
+    """
+    def __init__(self):
+        super().__init__()
+        self.visible = False
+        self.height = 300
+        self.bgcolor = "#222222"
+        self.padding = ft.padding.all(10)
+        self.border_radius = 5
 
-    def toggle_tensor_display(self, e):
-        """ Expands or collapses the tensor display """
-        if self.expanded:
-            self.content.controls.remove(self.tensor_display)  # Hide tensor
-            self.expand_button.icon = ft.icons.EXPAND_MORE  # Update button icon
-        else:
-            self.tensor_display = self.create_tensor_display()
-            self.content.controls.append(self.tensor_display)  # Show tensor
-            self.expand_button.icon = ft.icons.EXPAND_LESS  # Update button icon
+    def show(self, log) -> None:
+        controls = [ft.Text(log.message, color="white", font_family=FONT_FAMILY, selectable=True)]
+        if log.figure:
+            controls.append(PlotPreview(log.figure))
+        if log.tensor.real_values:
+            # The tensor is decoded only now, when it is viewed
+            controls.append(TensorViewer(LazyTensor(log.tensor)))
+        self.content = ft.Column(controls, scroll=ft.ScrollMode.AUTO)
+        self.visible = True
 
-        self.expanded = not self.expanded
-        self.update()
+    def hide(self) -> None:
+        self.content = None
+        self.visible = False
 
-    def toggle_plot_display(self, e):
-        if self.expanded:
-            self.content.controls.remove(self.plot_display)
-            self.expand_button.icon = ft.icons.EXPAND_MORE  # Update button icon
-        else:
-            self.plot_display = self.create_plot_display()
-            self.content.controls.append(self.plot_display)  # Show tensor
-            self.expand_button.icon = ft.icons.EXPAND_LESS  # Update button icon
 
-        self.expanded = not self.expanded
-        self.update()
-        print(self.plot_path)
-
-    def create_plot_display(self):
-        """Creates plot display"""
-        plot_img = get_device_icon(self.plot_path)
-        return ft.Container(
-            content=ft.Image(src_base64=plot_img),
-            padding=ft.padding.all(10)
+class SimulationLogFilter(ft.Container):
+    """
+    Filter bar of the simulation logs, every change of the fields
+    filters the displayed logs
+    """
+    def __init__(self):
+        super().__init__()
+        self.padding = ft.padding.only(bottom=5)
+        self.device = self.field("Device", 150)
+        self.device_type = self.field("Device type", 150)
+        self.log_type = self.field("Type", 80)
+        self.text = self.field("Message", None, expand=True)
+        self.start = self.field("From (s)", 90)
+        self.end = self.field("To (s)", 90)
+        self.content = ft.Row(
+            [
+                ft.Icon(ft.icons.FILTER_LIST, color="white", size=18),
+                self.device, self.device_type, self.log_type,
+                self.text, self.start, self.end,
+                ft.IconButton(
+                    icon=ft.icons.CLEAR,
+                    icon_color="white",
+                    icon_size=15,
+                    tooltip="Clear the filter",
+                    on_click=self.clear_filter
+                ),
+            ],
+            spacing=5,
         )
 
-
-    def create_tensor_grid(self):
-        """ Creates a formatted display of the tensor """
-        tensor_str = str(self.tensor_data)  # Convert NumPy array to string
-        return ft.Container(
-            content=ft.Text(tensor_str, font_family="Courier New", color="white"),
-            padding=ft.padding.all(10),
-            bgcolor="#222222",
-            border_radius=5
+    def field(self, label: str, width, expand: bool = False) -> ft.TextField:
+        return ft.TextField(
+            label=label,
+            width=width,
+            expand=expand,
+            height=35,
+            text_size=12,
+            color="white",
+            border_color="grey",
+            label_style=ft.TextStyle(color="white", size=12),
+            content_padding=ft.Padding(8, 0, 8, 0),
+            on_change=self.apply_filter
         )
 
-    def create_tensor_display(self):
-        """ Creates a DataTable for a 2D tensor """
-        return self.create_tensor_grid()
+    @staticmethod
+    def time_value(field: ft.TextField):
+        try:
+            value = float(field.value) if field.value.strip() else None
+            field.error_text = None
+        except ValueError:
+            value = None
+            field.error_text = "Invalid"
+        return value
 
-    def on_hover_handler(self, e):
-        if e.data == "true":
-            self.bgcolor="#424242"
-        else:
-            self.bgcolor = "black"
+    def apply_filter(self, e=None):
+        log_filter = LogFilter(
+            device=self.device.value.strip() or None,
+            device_type=self.device_type.value.strip() or None,
+            log_type=self.log_type.value.strip() or None,
+            text=self.text.value.strip() or None,
+            start=self.time_value(self.start),
+            end=self.time_value(self.end),
+        )
+        SiM = LMH.get_logic(LogicModuleEnum.SIMULATION_MANAGER)
+        SiM.apply_filter(log_filter)
         self.update()
 
+    def clear_filter(self, e):
+        for field in (self.device, self.device_type, self.log_type,
+                      self.text, self.start, self.end):
+            field.value = ""
+        self.apply_filter()
 
 
 class SimulationLogs(ft.Container):
+    """
+    Virtualized view of the simulation logs. Only the visible window
+    of the store (`LogStore` or `ArchivedRun`) is rendered into a fixed number of recycled rows,
+    a spacer gives the scrollable area the height of all of the logs.
+    The view follows the end of the logs, unless the user scrolls up.
+
+    Attributes:
+    -----------
+    first (int): Position of the first log in the window
+    follow (bool): If True the window moves with the new logs
+    selected (Optional[int]): Position of the selected log
+    dropped (int): Number of the logs dropped by the stream buffer
+    """
     def __init__(self):
         super().__init__()
         self.top=150
@@ -159,21 +201,114 @@ class SimulationLogs(ft.Container):
         self.bottom=10
         SiM = LMH.get_logic(LogicModuleEnum.SIMULATION_MANAGER)
         SiM.register_log_component(self)
+        self.store = SiM.log_store
+        self.first = 0
+        self.follow = True
+        self.selected = None
+        self.dropped = 0
+        self.dropped_notice = ft.Text(
+            "", color="#f2a797", font_family=FONT_FAMILY, visible=False
+            )
+        self.rows = [SimulationLogRow(self.select) for _ in range(LOG_WINDOW_ROWS)]
+        self.window = ft.Container(
+            top=0, left=0, right=0,
+            content=ft.Column(self.rows, spacing=0)
+            )
+        self.spacer = ft.Container(height=0)
+        self.scroller = ft.Column(
+            [ft.Stack([self.spacer, self.window])],
+            expand=True,
+            scroll=ft.ScrollMode.ALWAYS,
+            on_scroll=self.on_scroll,
+            on_scroll_interval=30,
+        )
+        self.detail = SimulationLogDetail()
+        self.filter_bar = SimulationLogFilter()
         self.content = ft.Column(
+            [self.filter_bar, self.dropped_notice, self.scroller, self.detail],
             expand=True,
-            scroll=True,
             spacing=0,
         )
 
-    def submit_log(self, log):
-        self.content.controls.append(SimulationLogLine(log))
-        if hasattr(log, "tensor") and log.tensor.real_values:
-            print(tensor_from_message(log.tensor))
-        self.content.controls.sort(
-            key=lambda lc: float(lc.log.simulation_timestamp)
-        )
+    def insert_logs(self, logs, positions, dropped: int = 0):
+        """
+        Displays a batch of logs, which were inserted into the log store
+        at the given positions. Only the window is re-rendered, if the
+        positions are None the window is always re-rendered.
+        """
+        self.dropped += dropped
+        self.update_dropped()
+        if positions is None:
+            positions = [self.first]
+        elif self.selected is not None:
+            # Insertions before the selected log shift it
+            for position in positions:
+                if position <= self.selected:
+                    self.selected += 1
+        self.spacer.height = len(self.store) * LOG_ROW_HEIGHT
+        if self.follow:
+            self.render_window(len(self.store) - LOG_WINDOW_ROWS)
+        elif positions and min(positions) < self.first + LOG_WINDOW_ROWS:
+            self.render_window(self.first)
+        if self.page:
+            self.update()
+            if self.follow:
+                self.scroller.scroll_to(offset=-1, duration=0)
+
+    def render_window(self, first: int) -> None:
+        """
+        Binds the recycled rows to the logs starting at position first
+        """
+        self.first = max(min(first, len(self.store) - LOG_WINDOW_ROWS), 0)
+        self.window.top = self.first * LOG_ROW_HEIGHT
+        for offset, row in enumerate(self.rows):
+            index = self.first + offset
+            if index < len(self.store):
+                row.bind(index, self.store[index], index == self.selected)
+            else:
+                row.unbind()
+
+    def on_scroll(self, e: ft.OnScrollEvent):
+        self.follow = e.pixels >= e.max_scroll_extent - LOG_ROW_HEIGHT
+        first = int(e.pixels // LOG_ROW_HEIGHT)
+        if first != self.first:
+            self.render_window(first)
+            self.window.update()
+
+    def select(self, index):
+        """
+        Selects the log and shows its details, selecting the selected
+        log again hides the details
+        """
+        if index is None:
+            return
+        if index == self.selected:
+            self.selected = None
+            self.detail.hide()
+        else:
+            self.selected = index
+            self.detail.show(self.store[index])
+        self.render_window(self.first)
         self.update()
 
+    def update_dropped(self):
+        self.dropped_notice.visible = self.dropped > 0
+        self.dropped_notice.value = f"{self.dropped} logs dropped (stream outran the display)"
+
+    def show_store(self, store):
+        """
+        Displays the logs of another store, e.g. an archived run
+        """
+        self.store = store
+        self.dropped = 0
+        self.selected = None
+        self.follow = True
+        self.detail.hide()
+        self.update_dropped()
+        self.spacer.height = len(self.store) * LOG_ROW_HEIGHT
+        self.render_window(0)
+        if self.page:
+            self.update()
+
     def clear_logs(self):
-        self.content.controls = []
-        self.update()
\ No newline at end of file
+        self.show_store(self.store)
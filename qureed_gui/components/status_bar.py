@@ -1,5 +1,6 @@
 import flet as ft
 import threading
+import time
 from theme import ThemeManager
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
 
@@ -9,6 +10,9 @@ LMH = LogicModuleHandler()
 PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
 TM = ThemeManager()
 
+# Minimal time (in seconds) between two updates of the rpc summary
+RPC_SUMMARY_INTERVAL = 1.0
+
 
 class StatusBar(ft.Container):
     def __init__(self, page: ft.Page):
@@ -32,12 +36,19 @@ class StatusBar(ft.Container):
             expand=True,
             content=self.message
             )
+        self.rpc_summary = ft.Text(
+            "", color=TM.get_nested_color("toolbar", "text"), size=11
+            )
+        self.rpc_summary_updated = 0.0
+        self.rpc_summary_timer = None
+        self.rpc_summary_lock = threading.Lock()
 
         # Layout
         self.content = ft.Row(
             [
                 self.project_status_icon,
                 self.message_wrapper,
+                self.rpc_summary,
                 self.simulation_status_icon,
             ],
             alignment=ft.MainAxisAlignment.SPACE_BETWEEN,
@@ -49,6 +60,9 @@ class StatusBar(ft.Container):
 
         # Register this StatusBar with ProjectManager
         PM.register_status_bar(self)
+        LMH.get_logic(LogicModuleEnum.SERVER_MANAGER).metrics.subscribe(
+            self.update_rpc_summary
+            )
 
     def update_project_status(self, status: int):
         if status == 1:
@@ -69,4 +83,34 @@ class StatusBar(ft.Container):
             self.message_timer = threading.Timer(
                 10.0,
                 lambda : self.set_message("", timer=False))
-            self.message_timer.start()
\ No newline at end of file
+            self.message_timer.start()
+
+    def update_rpc_summary(self, metrics):
+        """
+        Displays the summary of the last rpc call, updates are throttled
+        so that bursts of calls don't flood the page with updates. The
+        last call of a burst is displayed by a trailing refresh.
+        """
+        with self.rpc_summary_lock:
+            wait = self.rpc_summary_updated + RPC_SUMMARY_INTERVAL - time.monotonic()
+            if wait > 0:
+                if self.rpc_summary_timer is None:
+                    self.rpc_summary_timer = threading.Timer(
+                        wait, self.refresh_rpc_summary, (metrics,)
+                        )
+                    self.rpc_summary_timer.daemon = True
+                    self.rpc_summary_timer.start()
+                return
+        self.refresh_rpc_summary(metrics)
+
+    def refresh_rpc_summary(self, metrics):
+        with self.rpc_summary_lock:
+            self.rpc_summary_timer = None
+            self.rpc_summary_updated = time.monotonic()
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        SvM.dispatch_to_ui(self.show_rpc_summary, metrics)
+
+    def show_rpc_summary(self, metrics):
+        self.rpc_summary.value = metrics.summary()
+        if self.rpc_summary.page:
+            self.rpc_summary.update()
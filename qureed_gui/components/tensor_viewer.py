@@ -0,0 +1,120 @@
+import flet as ft
+import numpy as np
+
+from qureed_project_server.utils import tensor_from_message
+from logic.tensor_summary import as_matrix, heatmap, page, summarize
+
+# Size of one page of the displayed entries
+PAGE_ROWS = 16
+PAGE_COLUMNS = 8
+FONT_FAMILY = "Courier New"
+
+
+class LazyTensor:
+    """
+    Logged tensor, which is decoded only once it is viewed. The log
+    keeps the tensor message, the decoded array is cached.
+    """
+    def __init__(self, message):
+        self.message = message
+        self._array = None
+
+    @property
+    def array(self) -> np.ndarray:
+        if self._array is None:
+            self._array = np.asarray(tensor_from_message(self.message))
+        return self._array
+
+
+def format_value(value) -> str:
+    if isinstance(value, complex):
+        return f"{value.real:.4g}{value.imag:+.4g}j"
+    return f"{value:.4g}"
+
+
+class TensorViewer(ft.Column):
+    """
+    Tensor Viewer displays the summary of the tensor, its downsampled
+    heatmap and one page of the entries, which can be paged through.
+
+    Attributes:
+    -----------
+    tensor (LazyTensor): The displayed tensor
+    row (int): First displayed row
+    col (int): First displayed column
+    """
+    def __init__(self, tensor: LazyTensor):
+        super().__init__()
+        self.tensor = tensor
+        self.row = 0
+        self.col = 0
+        self.spacing = 5
+        array = tensor.array
+        self.rows, self.cols = as_matrix(array).shape
+        summary = summarize(array)
+        lines = [
+            f"shape: {summary['shape']}  dtype: {summary['dtype']}  "
+            f"norm: {summary['norm']:.6g}"
+            + (f"  trace: {format_value(summary['trace'])}" if summary["trace"] is not None else ""),
+            "max |x|: " + ", ".join(
+                f"{index}: {format_value(value)}" for index, value in summary["max_abs"]
+            ),
+        ]
+        self.entries = ft.Text(color="white", font_family=FONT_FAMILY, size=12, selectable=True)
+        self.position = ft.Text(color="#797979", font_family=FONT_FAMILY, size=12)
+        self.controls = [
+            ft.Text("\n".join(lines), color="white", font_family=FONT_FAMILY, selectable=True),
+            ft.Row(
+                [
+                    ft.Image(
+                        src_base64=heatmap(array),
+                        width=192, height=192,
+                        fit=ft.ImageFit.CONTAIN,
+                        filter_quality=ft.FilterQuality.NONE,
+                        tooltip="|x|, downsampled (maximum of every block)"
+                    ),
+                    ft.Column(
+                        [
+                            ft.Row(
+                                [
+                                    self.page_button(ft.icons.KEYBOARD_ARROW_UP, -PAGE_ROWS, 0),
+                                    self.page_button(ft.icons.KEYBOARD_ARROW_DOWN, PAGE_ROWS, 0),
+                                    self.page_button(ft.icons.KEYBOARD_ARROW_LEFT, 0, -PAGE_COLUMNS),
+                                    self.page_button(ft.icons.KEYBOARD_ARROW_RIGHT, 0, PAGE_COLUMNS),
+                                    self.position,
+                                ],
+                                spacing=0,
+                            ),
+                            self.entries,
+                        ],
+                        expand=True,
+                    ),
+                ],
+                vertical_alignment=ft.CrossAxisAlignment.START,
+            ),
+        ]
+        self.render_page()
+
+    def page_button(self, icon, rows: int, cols: int) -> ft.IconButton:
+        return ft.IconButton(
+            icon=icon,
+            icon_color="white",
+            icon_size=15,
+            on_click=lambda e: self.move(rows, cols)
+        )
+
+    def move(self, rows: int, cols: int) -> None:
+        self.row = min(max(self.row + rows, 0), max(self.rows - PAGE_ROWS, 0))
+        self.col = min(max(self.col + cols, 0), max(self.cols - PAGE_COLUMNS, 0))
+        self.render_page()
+        self.update()
+
+    def render_page(self) -> None:
+        block = page(self.tensor.array, self.row, self.col, PAGE_ROWS, PAGE_COLUMNS)
+        self.entries.value = np.array2string(
+            block, precision=3, suppress_small=True, max_line_width=10**6
+            )
+        self.position.value = (
+            f"rows {self.row}-{self.row + block.shape[0] - 1} of {self.rows}, "
+            f"columns {self.col}-{self.col + block.shape[1] - 1} of {self.cols}"
+        )
@@ -1,3 +1,5 @@
+from pathlib import Path
+
 import flet as ft
 
 from theme import ThemeManager
@@ -74,6 +76,7 @@ class FileMenu(ft.SubmenuButton):
     - New Project
     - Open Project
     - Save Scheme
+    - Export RPC Metrics
     """
     def __init__(self):
         super().__init__(
@@ -94,6 +97,10 @@ class FileMenu(ft.SubmenuButton):
                  content=ft.Text("Save Scheme"),
                  on_click=self.save_scheme
              ),
+             ft.MenuItemButton(
+                 content=ft.Text("Export RPC Metrics"),
+                 on_click=self.export_rpc_metrics
+             ),
             ]
         )
 
@@ -162,3 +169,18 @@ class FileMenu(ft.SubmenuButton):
 
     def save_scheme(self, e):
         PM.save_scheme()
+
+    def export_rpc_metrics(self, e):
+        """
+        Writes the rpc metrics as JSON and CSV into the logs
+        directory of the opened project
+        """
+        if not PM.path:
+            PM.display_message("No project is opened!")
+            return
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        logs = Path(PM.path) / "logs"
+        logs.mkdir(parents=True, exist_ok=True)
+        SvM.metrics.to_json(logs / "rpc_metrics.json")
+        SvM.metrics.to_csv(logs / "rpc_metrics.csv")
+        PM.display_message(f"RPC metrics exported to {logs}")
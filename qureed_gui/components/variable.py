@@ -84,30 +84,54 @@ class Variable(BoardComponent):
     def handle_delete(self, e):
         CM = LMH.get_logic(LogicModuleEnum.CONNECTION_MANAGER)
         BM = LMH.get_logic(LogicModuleEnum.BOARD_MANAGER)
-        for port in [*self.ports_left.content.controls,
-                     *self.ports_right.content.controls]:
-            CM.disconnect(port)
-        BM.remove_device(self)
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        with SvM.batch() as batch:
+            for port in [*self.ports_left.content.controls,
+                         *self.ports_right.content.controls]:
+                CM.disconnect(port)
+            batch.barrier()
+            BM.remove_device(self)
 
     def update(self):
+        self.fit_width()
+        super().update()
+
+    def fit_width(self):
+        """
+        Fits the width to the value, the resized component is indexed
+        again (like a moved one)
+        """
+        width = self.width
         self.width = 40 + len(self.contains.content.value)*9
         if self.width < 70:
             self.width=70
-        super().update()
-
-    def register_device_with_server(self):
-        if not self.device.uuid:
-            PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-            SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
-            uid = uuid.uuid4()
-            self.device.uuid = str(uid)
-            response = SvM.add_device(self.device)
+        board = LMH.get_logic(LogicModuleEnum.BOARD_MANAGER).board
+        if self.width != width and board is not None and self in board.index:
+            board.index.move(self, self.bounds())
+
+    def register_device_with_server(self, on_done) -> None:
+        """
+        Registers the new device with the server, on_done receives
+        True if the device was created.
+        """
+        if self.device.uuid:
+            on_done(False)
+            return
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+
+        def device_added(response):
             if response.status == "failure":
                 PM.display_message(f"Device (self.device.module_class) not created: {response.message}")
-                return False
-            return True
+                on_done(False)
+                return
+            on_done(True)
+
+        self.device.uuid = str(uuid.uuid4())
+        SvM.add_device(self.device, on_done=device_added)
 
     def update_properties_hook(self):
         self.properties = MessageToDict(self.device.device_properties.properties)
         self.contains.content.value=str(self.properties["value"]["value"])
-        self.update()
+        self.fit_width()
+        self.refresh()
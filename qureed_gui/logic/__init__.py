@@ -6,6 +6,8 @@ from qureed_gui.logic.connection_manager import ConnectionManager
 from qureed_gui.logic.selection_manager import SelectionManager
 from qureed_gui.logic.server_manager import ServeManager
 from qureed_gui.logic.simulation_manager import SimulationManager
+from qureed_gui.logic.catalog_cache import CatalogCache
+from qureed_gui.logic.thumbnail_cache import ThumbnailCache
 
 PM = ProjectManager()
 KED = KeyboardEventDispatcher()
@@ -13,4 +15,6 @@ BM = BoardManager()
 CM = ConnectionManager()
 SeM = SelectionManager()
 SM = ServeManager()
-SiM = SimulationManager()
\ No newline at end of file
+SiM = SimulationManager()
+CC = CatalogCache()
+TC = ThumbnailCache()
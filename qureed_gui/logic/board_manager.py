@@ -4,6 +4,7 @@ Module containing BoardManager, one of the logic modules.
 from __future__ import annotations
 import typing
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from logic.scheme_journal import SchemeAutosave
 from qureed_project_server import server_pb2
 
 if typing.TYPE_CHECKING:
@@ -22,10 +23,17 @@ class BoardManager:
     -----------
     board (ft.Control): actual board component
     opened_scheme (str): the name of currently displayed scheme
+    opening_scheme (str): the name of the scheme being opened
     board_bar (ft.Control): Board bar displays the name of the scheme
     board_info (ft.Control): Board info displays the information
        about device/port the user is currently hovering
     board_controls (ft.Control): Board controls (like + (add device))
+    moved_devices (dict[str, BoardComponent]): Devices moved since the
+        scheme was last opened or saved
+    scheme_dirty (bool): True if devices were added, removed, edited or
+        (dis)connected since the scheme was last opened or saved
+    autosave (SchemeAutosave): Journals the edits and saves the scheme
+        in the background
     initialized (bool): Initialization flag, part of the Singleton Pattern
 
     Methods:
@@ -35,7 +43,9 @@ class BoardManager:
     register_board(): Registers the board, which displays the scheme
     close_board(): Closes the scheme
     open_scheme(scheme): Opens existing scheme
-    save_scheme(): Saves the current scheme
+    save_scheme(): Saves the changes of the current scheme
+    mark_moved(component): Records that the device was moved
+    mark_changed(): Records an edit of the scheme
     add_device(device): Adds the device to the board/scheme
     remove_device(device): Removes the device from the board/scheme
     display_info(info): Displays information on the board_info
@@ -65,9 +75,13 @@ class BoardManager:
         if not hasattr(self, "initialized"):
             self.board=None
             self.opened_scheme=None
+            self.opening_scheme=None
             self.board_bar=None
             self.board_info=None
             self.board_controls=None
+            self.moved_devices={}
+            self.scheme_dirty=False
+            self.autosave=SchemeAutosave(self)
             LMH.register(LogicModuleEnum.BOARD_MANAGER, self)
             self.initialized=True
 
@@ -120,6 +134,8 @@ class BoardManager:
         Clears the board and removes the name of the scheme.
         """
         self.opened_scheme = ""
+        self.autosave.close()
+        self.reset_changes()
         if self.board_bar:
             self.board_bar.update_scheme_name("No Scheme Opened")
         if self.board:
@@ -130,57 +146,169 @@ class BoardManager:
         Opens the scheme and displays it on the board.
         The scheme is opened using the server (Server Manager),
         which loads the QuReed modules and returns the devices and
-        connections.
+        connections. The currently opened scheme is saved first,
+        all of the requests are non-blocking. Repeated requests for
+        the scheme being opened are ignored.
 
         Parameters:
         -----------
         scheme (str): the name of the scheme
         """
         LMH.get_logic(LogicModuleEnum.SELECTION_MANAGER).deselect_all()
-        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
         SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
 
-        if self.opened_scheme != scheme:
-            self.save_scheme()
+        if scheme in (self.opened_scheme, self.opening_scheme):
+            return
+        self.opening_scheme = scheme
+
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+
+        def opening_done():
+            if self.opening_scheme == scheme:
+                self.opening_scheme = None
+
+        def display_scheme(scheme_resp, locations):
+            opening_done()
             self.board.clear_board()
-            scheme_resp = SvM.open_scheme(scheme) 
-            if scheme_resp.status == "success":
-                self.opened_scheme = scheme
-                if self.board_bar:
-                    self.board_bar.update_scheme_name(self.opened_scheme)
+            self.opened_scheme = scheme
+            if self.board_bar:
+                self.board_bar.update_scheme_name(self.opened_scheme)
+            # Journaled, not yet saved locations
+            for device in scheme_resp.devices:
+                if device.uuid in locations:
+                    device.location[:] = locations[device.uuid]
+            # Rendering is recorded next to the OpenBoard call
+            with SvM.metrics.time("Board.load_devices_bulk"):
                 self.board.load_devices_bulk(scheme_resp.devices)
+            with SvM.metrics.time("Board.load_connections_bulk"):
                 self.board.load_connections_bulk(scheme_resp.connections)
+            self.reset_changes()
+            self.autosave.open(PM.path, scheme)
+            for device_uuid in locations:
+                component = self.board.get_device(device_uuid)
+                if component is not None:
+                    self.mark_moved(component)
+
+        def scheme_opened(scheme_resp):
+            if scheme_resp.status == "success":
+                # Edits left in the journal by a crash are replayed first
+                self.autosave.recover(PM.path, scheme, scheme_resp, display_scheme)
+            else:
+                opening_done()
 
-    def save_scheme(self):
-        """
-        Saves the current scheme. It compiles the devices and their
-        positions on the board and then sends the list to the server,
-        which actually saves the scheme.
+        def open_failed(error):
+            opening_done()
+            SvM.report_error(error)
+
+        def open_board():
+            SvM.open_scheme(scheme, on_done=scheme_opened, on_error=open_failed)
+
+        def save_failed(error):
+            # The changes stay journaled, the scheme is opened anyway
+            SvM.report_error(error)
+            open_board()
+
+        self.save_scheme(on_done=lambda _: open_board(), on_error=save_failed)
+
+    def save_scheme(self, on_done=None, notify=True, on_error=None):
         """
+        Saves the current scheme. If nothing changed since the scheme
+        was opened or saved, saving is a no-op. Otherwise all of the
+        devices on the board are sent with their locations, SaveBoard
+        replaces the device list of the scheme (partial saves aren't
+        supported by the server). Saving doesn't block, the server
+        response is handled in the background.
 
-        from components.board_component import BoardComponent
+        Parameters:
+        -----------
+        on_done (callable): Optional callback, receives the response
+            (None if nothing had to be saved)
+        notify (bool): If False only the failures are displayed (autosave)
+        on_error (callable): Optional callback, receives the transport
+            error (the error is reported if not given)
+        """
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
         SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
-        devices = []
-        if not self.opened_scheme:
+        if not self.opened_scheme or not self.has_unsaved_changes:
+            if self.opened_scheme and notify:
+                PM.display_message(f"{self.opened_scheme} has no unsaved changes")
+            if on_done:
+                on_done(None)
             return
-        for device in self.device_controls:
-            if not isinstance(device, BoardComponent):
+
+        scheme = self.opened_scheme
+        moved, self.moved_devices = self.moved_devices, {}
+        changed, self.scheme_dirty = self.scheme_dirty, False
+        journal, offset = self.autosave.checkpoint()
+        devices = []
+        for component in self.device_controls:
+            device_msg = getattr(component, "device", None)
+            if device_msg is None:
                 continue
-            device_msg = device.device
-            device_msg.location[:] = [device.left, device.top]
+            device_msg.location[:] = [component.left, component.top]
             devices.append(device_msg)
 
-        response = SvM.save_scheme(
-            board=self.opened_scheme,
-            devices=devices
+        def keep_changes():
+            if self.opened_scheme == scheme:
+                # Changes stay unsaved, newer moves take precedence
+                self.moved_devices = {**moved, **self.moved_devices}
+                self.scheme_dirty = self.scheme_dirty or changed
+
+        def scheme_saved(response):
+            if response.status == "success":
+                self.autosave.compacted(journal, offset)
+                if notify:
+                    PM.display_message(f"{scheme} succesfully saved")
+            else:
+                PM.display_message(
+                    f"Saving of Scheme {scheme} failed: {response.message}"
+                    )
+                keep_changes()
+            if on_done:
+                on_done(response)
+
+        def save_failed(error):
+            keep_changes()
+            (on_error or SvM.report_error)(error)
+
+        SvM.save_scheme(
+            board=scheme, devices=devices, on_done=scheme_saved, on_error=save_failed
             )
-        if response.status == "success":
-            PM.display_message(f"{self.opened_scheme} succesfully saved")
-        else:
-            PM.display_message(
-                f"Saving of Scheme {self.opened_scheme} failed: {response.message}"
-                )
+
+    @property
+    def has_unsaved_changes(self) -> bool:
+        """
+        True if the scheme changed since it was last opened or saved
+        """
+        return self.scheme_dirty or bool(self.moved_devices)
+
+    def mark_moved(self, component: BoardComponent) -> None:
+        """
+        Records that the device was moved, its location is sent with
+        the next save.
+
+        Parameters:
+        -----------
+        component (BoardComponent): the moved device
+        """
+        if self.opened_scheme and getattr(component, "device", None) is not None:
+            self.moved_devices[component.device.uuid] = component
+            self.autosave.record_move(component)
+
+    def mark_changed(self) -> None:
+        """
+        Records an edit (add, remove, property or connection change)
+        of the scheme, which makes the next save necessary.
+        """
+        if self.opened_scheme:
+            self.scheme_dirty = True
+
+    def reset_changes(self) -> None:
+        """
+        Forgets the recorded changes, used when a scheme is (re)loaded
+        """
+        self.moved_devices = {}
+        self.scheme_dirty = False
 
     def add_device(self, device:server_pb2.Device):
         """
@@ -207,13 +335,17 @@ class BoardManager:
         """
         SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
-        response = SvM.remove_device(device.device.uuid)
-        if response.status=="success":
-            self.board.board.controls.remove(device)
-            self.board.update()
-            PM.display_message("Device succesfully removed")
-            return
-        PM.display_message(f"Device removal failed {response.message}")
+
+        def device_removed(response):
+            if response.status=="success":
+                self.moved_devices.pop(device.device.uuid, None)
+                self.mark_changed()
+                self.board.remove_component(device)
+                PM.display_message("Device succesfully removed")
+                return
+            PM.display_message(f"Device removal failed {response.message}")
+
+        SvM.remove_device(device.device.uuid, on_done=device_removed)
 
     def display_info(self, info:str) -> None:
         """
@@ -0,0 +1,173 @@
+"""
+This module implements the cache of the device, signal and icon
+catalogs, which are otherwise requested from the server every time
+a dialog is opened.
+"""
+from __future__ import annotations
+import os
+import threading
+from pathlib import Path
+
+from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+
+LMH = LogicModuleHandler()
+
+# Catalogs with the project directory whose changes invalidate them and
+# the ServeManager call which fetches them
+CATALOGS = {
+    "devices": ("custom/devices", "get_all_devices"),
+    "signals": ("custom/signals", "get_all_signals"),
+    "icons": ("custom/icons", "get_all_icons"),
+}
+
+
+def directory_signature(directory: Path) -> tuple:
+    """
+    Cheap fingerprint of the directory tree, consisting of the paths,
+    modification times and sizes of the files (caches are skipped).
+
+    Returns:
+    --------
+    tuple: the signature, empty if the directory doesn't exist
+    """
+    signature = []
+    for root, dirs, files in os.walk(directory):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for name in sorted(files):
+            try:
+                stat = os.stat(os.path.join(root, name))
+            except OSError:
+                continue
+            signature.append(
+                (os.path.join(root, name), stat.st_mtime_ns, stat.st_size)
+                )
+    return tuple(signature)
+
+
+class CatalogCache:
+    """
+    CatalogCache (Singleton) keeps the catalog responses of the server,
+    keyed by the project. A cached catalog is served only while the
+    files under its project directory are unchanged, otherwise it is
+    fetched again. Concurrent requests of the same catalog share one
+    server call.
+
+    Attributes:
+    -----------
+    entries (dict[tuple, tuple]): (project, venv, catalog) -> (signature, response)
+    waiting (dict[tuple, list]): callbacks waiting for an ongoing fetch
+    initialized (bool): Initialization flag for the Singleton Pattern
+
+    Methods:
+    --------
+    get(catalog, on_done): Hands the catalog to the callback
+    prefetch(): Fetches all of the catalogs in the background
+    invalidate(catalog): Drops the cached catalog(s)
+
+    Examples:
+    ---------
+        >>> CC = LogicModuleHandler().get_logic(LogicModuleEnum.CATALOG_CACHE)
+        >>> CC.get("devices", self.devices_loaded)
+
+    Notes:
+    ------
+    This Singleton instance is initiated once in the `logic/__init__.py`
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(CatalogCache, cls).__new__(cls, *args, **kwargs)
+        return cls._instance
+
+    def __init__(self):
+        if not hasattr(self, "initialized"):
+            self.entries = {}
+            self.waiting = {}
+            self._lock = threading.Lock()
+            LMH.register(LogicModuleEnum.CATALOG_CACHE, self)
+            self.initialized = True
+
+    def _key(self, catalog: str) -> tuple:
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        return (str(PM.path), str(PM.venv), catalog)
+
+    def _signature(self, catalog: str) -> tuple:
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        directory, _ = CATALOGS[catalog]
+        return directory_signature(Path(PM.path) / directory)
+
+    def get(self, catalog: str, on_done=None) -> bool:
+        """
+        Hands the catalog response to the callback. If the cached
+        catalog is still valid the callback is called right away,
+        otherwise once the server answers.
+
+        Parameters:
+        -----------
+        catalog (str): "devices", "signals" or "icons"
+        on_done (callable): called with the catalog response
+
+        Returns:
+        --------
+        bool: True if the catalog was served from the cache
+        """
+        key = self._key(catalog)
+        signature = self._signature(catalog)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is not None and entry[0] == signature:
+                response = entry[1]
+            else:
+                response = None
+                callbacks = self.waiting.get(key)
+                fetch = callbacks is None
+                if fetch:
+                    callbacks = self.waiting[key] = []
+                if on_done:
+                    callbacks.append(on_done)
+        if response is not None:
+            if on_done:
+                on_done(response)
+            return True
+        if fetch:
+            self._fetch(key, catalog, signature)
+        return False
+
+    def _fetch(self, key: tuple, catalog: str, signature: tuple) -> None:
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        _, method = CATALOGS[catalog]
+
+        def fetched(response):
+            with self._lock:
+                self.entries[key] = (signature, response)
+                callbacks = self.waiting.pop(key, [])
+            for callback in callbacks:
+                callback(response)
+
+        def failed(error):
+            with self._lock:
+                self.waiting.pop(key, None)
+            SvM.report_error(error)
+
+        try:
+            getattr(SvM, method)(on_done=fetched, on_error=failed)
+        except Exception as e:
+            failed(e)
+
+    def prefetch(self) -> None:
+        """
+        Fetches all of the catalogs of the opened project in the
+        background, so that the dialogs open without waiting.
+        """
+        for catalog in CATALOGS:
+            self.get(catalog)
+
+    def invalidate(self, catalog: str = None) -> None:
+        """
+        Drops the cached catalog, or all of the catalogs if none is given
+        """
+        with self._lock:
+            for key in list(self.entries):
+                if catalog is None or key[2] == catalog:
+                    del self.entries[key]
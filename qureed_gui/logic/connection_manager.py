@@ -4,6 +4,7 @@ Manages the connections between the ports
 from __future__ import annotations
 import typing
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from logic.spatial_index import SpatialGrid
 
 if typing.TYPE_CHECKING:
     from qureed_gui.components.ports import Port
@@ -14,7 +15,9 @@ LMH = LogicModuleHandler()
 class ConnectionManager:
     """
     Connection Manger, manages the connecting and disconnecting of
-    the devices currently on the board.
+    the devices currently on the board. The bounds of the connections
+    are kept in a spatial index, so that the culling only looks at
+    the connections in the visible area.
     """
     _instance = None
 
@@ -29,6 +32,8 @@ class ConnectionManager:
             self.canvas = None
             self.canvas_connections = {}
             self.all_connections = {}
+            self.index = SpatialGrid()
+            self.shown = {}
             LMH.register(LogicModuleEnum.CONNECTION_MANAGER, self)
             self.initialized = True
 
@@ -40,6 +45,17 @@ class ConnectionManager:
             self.first_port[2].set_connection()
             self.first_port = None
 
+    def clear_connections(self):
+        """
+        Forgets the rendered connections, called when the board is
+        cleared (e.g. before another scheme is opened)
+        """
+        self.first_port = None
+        self.canvas_connections = {}
+        self.all_connections = {}
+        self.index.clear()
+        self.shown = {}
+
     def connect_action_interrupt(self):
         self.first_port = None
 
@@ -61,30 +77,43 @@ class ConnectionManager:
             return True
         else:
             SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
-            response = SvM.connect_devices(
-                device_uuid_1=self.first_port.device.uuid,
-                device_port_1=self.first_port.port_label,
-                device_uuid_2=port.device.uuid,
-                device_port_2=port.port_label
-                )
-
             first_port = self.first_port
             self.first_port = None
-            if response.status == "success":
-                self.load_connection(first_port, port)
-                return True
-            return False
 
-    def load_connection(self, port1, port2):
+            def devices_connected(response):
+                if response.status == "success":
+                    LMH.get_logic(LogicModuleEnum.BOARD_MANAGER).mark_changed()
+                    self.load_connection(first_port, port)
+                    return
+                for p in (first_port, port):
+                    if p.connection is None:
+                        p.set_connection()
+
+            SvM.connect_devices(
+                device_uuid_1=first_port.device.uuid,
+                device_port_1=first_port.port_label,
+                device_uuid_2=port.device.uuid,
+                device_port_2=port.port_label,
+                on_done=devices_connected
+                )
+            return True
+
+    def load_connection(self, port1, port2, update=True):
         """
-        Renders the connection, which already exist in the backend
+        Renders the connection, which already exist in the backend.
+        If update is False nothing is sent to the page, the connection
+        and the ports are rendered by the next Board culling.
         """
         from components.connection import Connection
         connection = Connection(port1, port2, self.canvas.canvas)
-        port1.set_connection(connection)
-        port2.set_connection(connection)
+        port1.set_connection(connection, update=update)
+        port2.set_connection(connection, update=update)
         self.register_connection(port1, port2, connection)
-        connection.draw()
+        if update:
+            connection.draw()
+            self.shown[id(connection)] = connection
+        else:
+            connection.build()
             
     def register_connection(self, port1, port2, connection):
         if port1 not in self.all_connections.keys():
@@ -93,13 +122,56 @@ class ConnectionManager:
             self.all_connections[port2] = []
         self.all_connections[port1].append((port2, connection))
         self.all_connections[port2].append((port1, connection))
+        self.index.insert(connection, connection.bounds())
     
+    def connections(self) -> list:
+        """
+        Returns all of the rendered connections
+        """
+        unique = {}
+        for port_connections in self.all_connections.values():
+            for _, connection in port_connections:
+                unique[id(connection)] = connection
+        return list(unique.values())
+
+    def moved(self, connections) -> None:
+        """
+        Updates the indexed bounds of the moved connections
+        """
+        for connection in connections:
+            self.index.move(connection, connection.bounds())
+
+    def cull_connections(self, area: tuple) -> bool:
+        """
+        Shows the connections intersecting the (left, top, right, bottom)
+        area and hides the previously shown ones outside of it, the
+        canvas is not updated.
+
+        Returns:
+        --------
+        bool: True if any connection was shown or hidden
+        """
+        changed = False
+        visible = {id(c): c for c in self.index.query(area)}
+        for connection in visible.values():
+            if not connection.mounted:
+                connection.show()
+                changed = True
+        for key, connection in self.shown.items():
+            if key not in visible and connection.mounted:
+                connection.hide()
+                changed = True
+        self.shown = visible
+        return changed
+
     def deregister_connection(self, connection):
         try:
             self.all_connections[connection.port_a].remove((connection.port_b, connection))
             self.all_connections[connection.port_b].remove((connection.port_a, connection))
         except Exception as e:
             print("Error in degeristering connection", e)
+        self.index.remove(connection)
+        self.shown.pop(id(connection), None)
         
     def disconnect(self, port:Port):
         """
@@ -117,14 +189,22 @@ class ConnectionManager:
             ]
 
         for conn in connections_to_remove:
-            response = SvM.disconnect_devices(
+            SvM.disconnect_devices(
                 conn.port_a.device.uuid,
                 conn.port_a.port_label,
                 conn.port_b.device.uuid,
                 conn.port_b.port_label,
+                on_done=lambda response, conn=conn: self._disconnected(response, conn)
                 )
-            if response.status == "success":
-                conn.remove()
-                conn.port_a.set_connection()
-                conn.port_b.set_connection()
-                self.deregister_connection(conn)
\ No newline at end of file
+
+    def _disconnected(self, response, conn):
+        """
+        Removes the rendered connection once the server confirmed
+        the disconnection.
+        """
+        if response.status == "success":
+            LMH.get_logic(LogicModuleEnum.BOARD_MANAGER).mark_changed()
+            conn.remove()
+            conn.port_a.set_connection()
+            conn.port_b.set_connection()
+            self.deregister_connection(conn)
@@ -0,0 +1,286 @@
+"""
+This module implements the on-disk archive of the simulation logs.
+Every streamed log is appended to a sqlite database in the logs/
+directory of the project, the log viewer pages the runs from it.
+"""
+from __future__ import annotations
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from logic.log_index import LogFilter, tokenize
+
+# Name of the archive in the logs/ directory of the project
+LOG_ARCHIVE_NAME = "simulation_logs.sqlite"
+# Number of the logs loaded from the archive at once
+LOG_PAGE_SIZE = 256
+# Number of the pages kept in memory by one archived run
+LOG_CACHED_PAGES = 16
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    simulation_id TEXT PRIMARY KEY,
+    scheme TEXT,
+    started REAL,
+    ended REAL
+);
+CREATE TABLE IF NOT EXISTS logs (
+    id INTEGER PRIMARY KEY,
+    simulation_id TEXT NOT NULL,
+    timestamp REAL NOT NULL,
+    device TEXT,
+    device_type TEXT,
+    log_type TEXT,
+    message TEXT,
+    payload BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_by_time ON logs (simulation_id, timestamp, id);
+CREATE INDEX IF NOT EXISTS logs_by_device ON logs (simulation_id, device, timestamp, id);
+"""
+# Columns added after the first version of the archive
+MIGRATED_COLUMNS = ("device_type", "message")
+
+
+def encode_log(log) -> bytes:
+    return log.SerializeToString()
+
+
+def has_words(message, text) -> bool:
+    """
+    Text filter of the archive, same as `LogFilter.matches`
+    """
+    words = tokenize(message or "")
+    return all(
+        any(word.startswith(token) for word in words)
+        for token in tokenize(text)
+    )
+
+
+class LogArchive:
+    """
+    LogArchive is the append-only store of the simulation logs of one
+    project. Logs are kept in the order of their simulation timestamp
+    within a run, logs with equal timestamps in the order of arrival
+    (the same order as in the `LogStore`).
+
+    Attributes:
+    -----------
+    path (Path): Path of the sqlite database
+    encode (callable): Serializes the log into bytes
+    decode (callable): Deserializes the log from bytes
+
+    Methods:
+    --------
+    start_run(simulation_id, scheme): Registers a new run
+    end_run(simulation_id): Marks the run as finished
+    append(simulation_id, logs): Appends the logs, returns their positions
+    runs(): Lists the archived runs, newest first
+    count(simulation_id, log_filter): Number of the logs of the run
+    page(simulation_id, offset, limit, log_filter): Loads the logs of the run
+    close(): Closes the database
+    """
+    def __init__(self, path, decode, encode=encode_log):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.encode = encode
+        self.decode = decode
+        self._last_keys = {}
+        self._sizes = {}
+        # Logs are appended on the gui threads and paged by the viewer
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._db:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(SCHEMA)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(logs)")}
+            for column in MIGRATED_COLUMNS:
+                if column not in columns:
+                    self._db.execute(f"ALTER TABLE logs ADD COLUMN {column} TEXT")
+        self._db.create_function("has_words", 2, has_words, deterministic=True)
+
+    def start_run(self, simulation_id, scheme=None) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR IGNORE INTO runs VALUES (?, ?, ?, NULL)",
+                (str(simulation_id), str(scheme) if scheme else None, time.time())
+            )
+
+    def end_run(self, simulation_id) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "UPDATE runs SET ended = ? WHERE simulation_id = ?",
+                (time.time(), str(simulation_id))
+            )
+
+    def append(self, simulation_id, logs) -> list[int]:
+        """
+        Appends the logs in one transaction and returns their positions
+        within the run. Like `LogStore.insert`, a position is valid
+        after all of the previous positions were applied in order.
+        """
+        simulation_id = str(simulation_id)
+        positions = []
+        with self._lock, self._db:
+            last_key = self._last_keys.get(simulation_id)
+            size = self._sizes.get(simulation_id)
+            if size is None:
+                size = self._count(simulation_id)
+            for log in logs:
+                key = float(log.simulation_timestamp)
+                cursor = self._db.execute(
+                    "INSERT INTO logs (simulation_id, timestamp, device, device_type,"
+                    " log_type, message, payload) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (simulation_id, key, getattr(log, "device_name", None),
+                     getattr(log, "device_type", None), getattr(log, "log_type", None),
+                     getattr(log, "message", None), self.encode(log))
+                )
+                size += 1
+                if last_key is None or key >= last_key:
+                    positions.append(size - 1)
+                    last_key = key
+                else:
+                    # Out of order, the position is counted through the index
+                    positions.append(self._db.execute(
+                        "SELECT COUNT(*) FROM logs WHERE simulation_id = ?"
+                        " AND (timestamp < ? OR (timestamp = ? AND id < ?))",
+                        (simulation_id, key, key, cursor.lastrowid)
+                    ).fetchone()[0])
+            self._last_keys[simulation_id] = last_key
+            self._sizes[simulation_id] = size
+        return positions
+
+    @staticmethod
+    def _where(simulation_id: str, log_filter: LogFilter = None) -> tuple[str, list]:
+        clause = "WHERE simulation_id = ?"
+        args = [simulation_id]
+        if log_filter is None:
+            return clause, args
+        for column in ("device", "device_type", "log_type"):
+            value = getattr(log_filter, column)
+            if value is not None:
+                clause += f" AND {column} = ?"
+                args.append(value)
+        if log_filter.start is not None:
+            clause += " AND timestamp >= ?"
+            args.append(log_filter.start)
+        if log_filter.end is not None:
+            clause += " AND timestamp <= ?"
+            args.append(log_filter.end)
+        if log_filter.text:
+            clause += " AND has_words(message, ?)"
+            args.append(log_filter.text)
+        return clause, args
+
+    def _count(self, simulation_id: str, log_filter: LogFilter = None) -> int:
+        clause, args = self._where(simulation_id, log_filter)
+        return self._db.execute(f"SELECT COUNT(*) FROM logs {clause}", args).fetchone()[0]
+
+    def count(self, simulation_id, log_filter: LogFilter = None) -> int:
+        with self._lock:
+            return self._count(str(simulation_id), log_filter)
+
+    def runs(self) -> list[dict]:
+        """
+        Lists the archived runs, newest first
+        """
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT simulation_id, scheme, started, ended FROM runs"
+                " ORDER BY started DESC"
+            ).fetchall()
+        return [
+            {"simulation_id": r[0], "scheme": r[1], "started": r[2], "ended": r[3]}
+            for r in rows
+        ]
+
+    def page(self, simulation_id, offset: int, limit: int = LOG_PAGE_SIZE,
+             log_filter: LogFilter = None) -> list:
+        """
+        Loads `limit` logs of the run starting at the position `offset`,
+        optionally only the logs matching the filter
+        """
+        clause, args = self._where(str(simulation_id), log_filter)
+        with self._lock:
+            rows = self._db.execute(
+                f"SELECT payload FROM logs {clause} ORDER BY timestamp, id LIMIT ? OFFSET ?",
+                args + [limit, offset]
+            ).fetchall()
+        return [self.decode(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class ArchivedRun:
+    """
+    ArchivedRun is a read view of one run in the archive, it can back
+    the log viewer in place of the `LogStore`. Logs are loaded in pages,
+    only the last `LOG_CACHED_PAGES` pages are kept in memory.
+
+    Attributes:
+    -----------
+    archive (LogArchive): The archive
+    simulation_id (str): The run
+    log_filter (Optional[LogFilter]): If given, only the matching logs
+    """
+    def __init__(self, archive: LogArchive, simulation_id, log_filter: LogFilter = None,
+                 page_size: int = LOG_PAGE_SIZE, cached_pages: int = LOG_CACHED_PAGES):
+        self.archive = archive
+        self.simulation_id = str(simulation_id)
+        self.log_filter = log_filter
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        self.pages = OrderedDict()
+        self.size = archive.count(self.simulation_id, log_filter)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: int):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError(index)
+        number = index // self.page_size
+        page = self.pages.get(number)
+        if page is None:
+            page = self.archive.page(
+                self.simulation_id, number * self.page_size,
+                self.page_size, self.log_filter
+            )
+            self.pages[number] = page
+            while len(self.pages) > self.cached_pages:
+                self.pages.popitem(last=False)
+        else:
+            self.pages.move_to_end(number)
+        return page[index - number * self.page_size]
+
+    def __iter__(self):
+        for index in range(self.size):
+            yield self[index]
+
+    def extend(self, logs) -> list[int]:
+        """
+        Appends the logs of the live run to the archive, returns their
+        positions. The cached pages after the first insertion are dropped.
+        """
+        if self.log_filter is not None:
+            raise ValueError("Logs are appended to the whole run, not to a filtered view")
+        positions = self.archive.append(self.simulation_id, logs)
+        self.size += len(positions)
+        if positions:
+            first = min(positions) // self.page_size
+            for number in [n for n in self.pages if n >= first]:
+                del self.pages[number]
+        return positions
+
+    def refresh(self) -> None:
+        """
+        Reloads the view, e.g. after the logs of the live run were
+        appended to a filtered view
+        """
+        self.size = self.archive.count(self.simulation_id, self.log_filter)
+        self.pages.clear()
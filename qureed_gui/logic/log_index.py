@@ -0,0 +1,181 @@
+"""
+This module implements the search index of the simulation logs. The
+index is built incrementally as the logs arrive and answers the queries
+of the log filter bar without scanning the logs.
+"""
+from __future__ import annotations
+import bisect
+import re
+from typing import NamedTuple, Optional
+
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class LogFilter(NamedTuple):
+    """
+    Filter of the displayed logs, the fields which are None are not
+    applied. Text matches the logs whose message contains words starting
+    with every word of the text.
+    """
+    device: Optional[str] = None
+    device_type: Optional[str] = None
+    log_type: Optional[str] = None
+    text: Optional[str] = None
+    start: Optional[float] = None
+    end: Optional[float] = None
+
+    def is_empty(self) -> bool:
+        return all(value is None for value in self)
+
+    def matches(self, log) -> bool:
+        """
+        Matches a single log, the same way the index does
+        """
+        for field in ("device", "device_type", "log_type"):
+            expected = getattr(self, field)
+            if expected is not None and field_value(log, field) != expected:
+                return False
+        timestamp = float(log.simulation_timestamp)
+        if self.start is not None and timestamp < self.start:
+            return False
+        if self.end is not None and timestamp > self.end:
+            return False
+        if self.text:
+            words = tokenize(getattr(log, "message", ""))
+            for token in tokenize(self.text):
+                if not any(word.startswith(token) for word in words):
+                    return False
+        return True
+
+
+def field_value(log, field: str):
+    if field == "device":
+        return getattr(log, "device_name", None)
+    return getattr(log, field, None)
+
+
+class LogIndex:
+    """
+    LogIndex is an inverted index of the logs of one run. Every log gets
+    an id in the order of the arrival, the posting lists of the device
+    name, device type, log type and message words hold the ids in the
+    increasing order. The timestamps are kept in a sorted index, which
+    also gives the display order of the results.
+
+    Attributes:
+    -----------
+    logs (list): Logs by their id
+    postings (dict[tuple[str, str], list[int]]): Ids by (field, value)
+    words (list[str]): Vocabulary of the message words, sorted before
+        the prefix lookups
+    times (list[tuple[float, int]]): Sorted (timestamp, id) pairs
+
+    Methods:
+    --------
+    add(log): Indexes the log, returns its id
+    extend(logs): Indexes the logs
+    values(field): Indexed values of the field
+    query(log_filter): Returns the matching logs in the timestamp order
+    clear(): Removes all of the logs
+    """
+    FIELDS = ("device", "device_type", "log_type")
+
+    def __init__(self):
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.logs)
+
+    def clear(self) -> None:
+        self.logs = []
+        self.postings = {}
+        self.words = []
+        self.words_sorted = True
+        self.times = []
+
+    def add(self, log) -> int:
+        log_id = len(self.logs)
+        self.logs.append(log)
+        for field in self.FIELDS:
+            value = field_value(log, field)
+            if value is not None:
+                self.postings.setdefault((field, value), []).append(log_id)
+        for word in set(tokenize(getattr(log, "message", ""))):
+            postings = self.postings.get(("word", word))
+            if postings is None:
+                postings = self.postings[("word", word)] = []
+                self.words.append(word)
+                self.words_sorted = False
+            postings.append(log_id)
+        entry = (float(log.simulation_timestamp), log_id)
+        if not self.times or entry >= self.times[-1]:
+            self.times.append(entry)
+        else:
+            bisect.insort(self.times, entry)
+        return log_id
+
+    def extend(self, logs) -> None:
+        for log in logs:
+            self.add(log)
+
+    def values(self, field: str) -> list[str]:
+        return sorted(value for f, value in self.postings if f == field)
+
+    def _prefixed(self, token: str) -> set[int]:
+        """
+        Ids of the logs containing a word starting with the token
+        """
+        if not self.words_sorted:
+            self.words.sort()
+            self.words_sorted = True
+        ids = set()
+        start = bisect.bisect_left(self.words, token)
+        for word in self.words[start:]:
+            if not word.startswith(token):
+                break
+            ids.update(self.postings[("word", word)])
+        return ids
+
+    def query(self, log_filter: LogFilter) -> list:
+        """
+        Returns the logs matching the filter, ordered by the timestamp
+        """
+        candidates = None
+        for field in self.FIELDS:
+            value = getattr(log_filter, field)
+            if value is None:
+                continue
+            ids = set(self.postings.get((field, value), ()))
+            candidates = ids if candidates is None else candidates & ids
+        for token in tokenize(log_filter.text or ""):
+            ids = self._prefixed(token)
+            candidates = ids if candidates is None else candidates & ids
+
+        low, high = 0, len(self.times)
+        if log_filter.start is not None:
+            low = bisect.bisect_left(self.times, (log_filter.start, -1))
+        if log_filter.end is not None:
+            high = bisect.bisect_right(self.times, (log_filter.end, len(self.logs)))
+        if candidates is None:
+            return [self.logs[log_id] for _, log_id in self.times[low:high]]
+        if len(candidates) < high - low:
+            # Fewer candidates than logs in the range, the candidates are sorted
+            entries = sorted(
+                (self._timestamp(log_id), log_id) for log_id in candidates
+            )
+            return [
+                self.logs[log_id] for key, log_id in entries
+                if (log_filter.start is None or key >= log_filter.start)
+                and (log_filter.end is None or key <= log_filter.end)
+            ]
+        return [
+            self.logs[log_id] for _, log_id in self.times[low:high]
+            if log_id in candidates
+        ]
+
+    def _timestamp(self, log_id: int) -> float:
+        return float(self.logs[log_id].simulation_timestamp)
@@ -0,0 +1,63 @@
+"""
+This module implements the ordered store of the simulation logs.
+"""
+from __future__ import annotations
+import bisect
+
+
+class LogStore:
+    """
+    LogStore keeps the simulation logs ordered by the simulation
+    timestamp. Logs mostly arrive in order, so they are appended,
+    out of order logs are inserted with a binary search. Logs with
+    equal timestamps keep the order of the arrival.
+
+    Attributes:
+    -----------
+    keys (list[float]): Sorted timestamps of the logs
+    logs (list): Logs, in the order of the keys
+
+    Methods:
+    --------
+    insert(log): Inserts the log, returns its position
+    extend(logs): Inserts the logs, returns their positions
+    clear(): Removes all of the logs
+    """
+    def __init__(self):
+        self.keys = []
+        self.logs = []
+
+    def __len__(self) -> int:
+        return len(self.logs)
+
+    def __getitem__(self, index):
+        return self.logs[index]
+
+    def __iter__(self):
+        return iter(self.logs)
+
+    def insert(self, log) -> int:
+        """
+        Inserts the log and returns its position. The position is
+        valid after all of the previously returned positions were
+        applied in order.
+        """
+        key = float(log.simulation_timestamp)
+        if not self.keys or key >= self.keys[-1]:
+            self.keys.append(key)
+            self.logs.append(log)
+            return len(self.logs) - 1
+        position = bisect.bisect_right(self.keys, key)
+        self.keys.insert(position, key)
+        self.logs.insert(position, log)
+        return position
+
+    def extend(self, logs) -> list[int]:
+        """
+        Inserts the logs, returns the positions of the insertions
+        """
+        return [self.insert(log) for log in logs]
+
+    def clear(self) -> None:
+        self.keys = []
+        self.logs = []
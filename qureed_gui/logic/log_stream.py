@@ -0,0 +1,150 @@
+"""
+This module implements the buffering of the simulation log stream.
+Logs are collected on the asyncio side and handed to the gui in
+batches at a capped rate, the buffer applies backpressure (or drops
+logs) when the stream outruns the rendering.
+"""
+from __future__ import annotations
+import asyncio
+from collections import deque
+
+# Maximal number of the batches handed to the gui per second
+LOG_FLUSH_FPS = 10
+# Maximal number of the logs in one batch
+LOG_BATCH_SIZE = 500
+# Number of the buffered logs, after which the policy kicks in
+LOG_BUFFER_SIZE = 10000
+
+
+class LogPolicy:
+    """
+    Policies applied when the log buffer is full
+
+    BLOCK: The stream is not read until the gui catches up, the
+        pressure propagates to the server through the gRPC flow control
+    DROP_OLDEST: The oldest buffered logs are dropped
+    DECIMATE: Every other buffered log is dropped, logs carrying a
+        figure, a tensor or the end flag are always kept
+    """
+    BLOCK = "block"
+    DROP_OLDEST = "drop_oldest"
+    DECIMATE = "decimate"
+
+
+def is_essential(log) -> bool:
+    """
+    Logs which are never decimated
+    """
+    return bool(log.end or log.figure or log.tensor.real_values)
+
+
+class LogStreamBuffer:
+    """
+    LogStreamBuffer sits between the log stream and the gui. The stream
+    puts the logs into the buffer, a flusher task hands them to the gui
+    in batches. The next batch is flushed only after the gui finished
+    rendering the previous one and at most `fps` times per second.
+
+    Attributes:
+    -----------
+    flush (callable): Called on the gui side with (logs, dropped)
+    dispatch (callable): Runs the callback on the gui side,
+        e.g. ServeManager.dispatch_to_ui
+    fps (float): Maximal flush rate
+    batch_size (int): Maximal number of the logs per flush
+    capacity (int): Number of the buffered logs, after which the policy
+        is applied
+    policy (str): One of the LogPolicy values
+    dropped (int): Number of the dropped logs since the last flush
+    total_dropped (int): Number of all of the dropped logs
+
+    Methods:
+    --------
+    put(log): Buffers the log (awaits if the policy is BLOCK and the
+        buffer is full)
+    close(): Flushes the remaining logs and stops the flusher
+    """
+    def __init__(self, flush, dispatch, fps: float = LOG_FLUSH_FPS,
+                 batch_size: int = LOG_BATCH_SIZE, capacity: int = LOG_BUFFER_SIZE,
+                 policy: str = LogPolicy.BLOCK):
+        self.flush = flush
+        self.dispatch = dispatch
+        self.fps = fps
+        self.batch_size = batch_size
+        self.capacity = capacity
+        self.policy = policy
+        self.logs = deque()
+        self.dropped = 0
+        self.total_dropped = 0
+        self._closed = False
+        self._changed = asyncio.Condition()
+        self._flusher = asyncio.create_task(self._run())
+
+    async def put(self, log) -> None:
+        async with self._changed:
+            if len(self.logs) >= self.capacity:
+                if self.policy == LogPolicy.BLOCK:
+                    await self._changed.wait_for(
+                        lambda: len(self.logs) < self.capacity
+                        )
+                elif self.policy == LogPolicy.DROP_OLDEST:
+                    self.logs.popleft()
+                    self._drop(1)
+                else:
+                    self._decimate()
+            self.logs.append(log)
+            self._changed.notify_all()
+
+    def _drop(self, count: int) -> None:
+        self.dropped += count
+        self.total_dropped += count
+
+    def _decimate(self) -> None:
+        kept = deque()
+        for i, log in enumerate(self.logs):
+            if i % 2 == 0 or is_essential(log):
+                kept.append(log)
+        self._drop(len(self.logs) - len(kept))
+        if len(kept) >= self.capacity:
+            # Only the essential logs are left, drop the oldest
+            self._drop(len(kept) - self.capacity + 1)
+            while len(kept) >= self.capacity:
+                kept.popleft()
+        self.logs = kept
+
+    async def close(self) -> None:
+        """
+        Flushes the remaining logs and waits for the flusher to finish
+        """
+        async with self._changed:
+            self._closed = True
+            self._changed.notify_all()
+        await self._flusher
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        interval = 1 / self.fps if self.fps else 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.logs or self._closed)
+                if not self.logs and self._closed:
+                    return
+                count = min(len(self.logs), self.batch_size)
+                batch = [self.logs.popleft() for _ in range(count)]
+                dropped, self.dropped = self.dropped, 0
+                self._changed.notify_all()
+            started = loop.time()
+            rendered = loop.create_future()
+
+            def flush(batch=batch, dropped=dropped, rendered=rendered):
+                try:
+                    self.flush(batch, dropped)
+                finally:
+                    loop.call_soon_threadsafe(
+                        lambda: rendered.done() or rendered.set_result(None)
+                        )
+
+            self.dispatch(flush)
+            # Backpressure: the next batch waits for the gui
+            await rendered
+            await asyncio.sleep(max(interval - (loop.time() - started), 0))
@@ -13,6 +13,8 @@ class LogicModuleEnum(StrEnum):
     SELECTION_MANAGER = "selection_manager"
     SIMULATION_MANAGER = "simulation_manager"
     SERVER_MANAGER = "server_manager"
+    CATALOG_CACHE = "catalog_cache"
+    THUMBNAIL_CACHE = "thumbnail_cache"
 
 class LogicModuleHandler:
     """
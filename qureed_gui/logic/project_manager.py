@@ -284,6 +284,7 @@ class ProjectManager:
         SiM.clear_logs()
         SvM.start()
         SvM.connect_venv()
+        LMH.get_logic(LogicModuleEnum.CATALOG_CACHE).prefetch()
         self.is_opened = True
         
         if self.project_explorer:
@@ -0,0 +1,164 @@
+"""
+Module implementing the property write buffer, which coalesces the
+device property edits before they are sent to the server.
+"""
+from __future__ import annotations
+import threading
+import typing
+
+from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from qureed_project_server import server_pb2
+
+if typing.TYPE_CHECKING:
+    from qureed_gui.components.board_component import BoardComponent
+
+LMH = LogicModuleHandler()
+
+# Quiet period (in seconds) after the last edit of a property of the given
+# type, before the edits are sent to the server
+PROPERTY_DEBOUNCE = {
+    "bool": 0.0,
+    "char": 0.2,
+    "int": 0.4,
+    "float": 0.4,
+    "cmplx": 0.4,
+    "str": 0.6,
+}
+DEFAULT_DEBOUNCE = 0.4
+
+
+class PropertyState:
+    """
+    States of a buffered property, reported to the state listener
+    """
+    PENDING = "pending"
+    COMMITTED = "committed"
+    FAILED = "failed"
+
+
+class PropertyWriteBuffer:
+    """
+    PropertyWriteBuffer collects the property edits of one device.
+    Rapid edits are coalesced into one trailing UpdateDeviceProperties
+    request. The request carries the whole device with the edited
+    properties merged in, the server replaces the device properties.
+
+    Attributes:
+    -----------
+    component (BoardComponent): the component owning the device message
+    debounce (dict[str, float]): debounce delay per property type
+    pending (dict[str, dict]): edited properties, not yet sent
+    in_flight (dict[str, dict]): properties sent, but not yet confirmed
+    on_state (callable): Optional listener, called with (name, state, message)
+        whenever the state of a property changes
+
+    Methods:
+    --------
+    write(name, prop): Buffers the property edit
+    flush(): Sends the buffered edits to the server
+    value(name): Latest (possibly uncommitted) value of the property
+    """
+    def __init__(self, component: BoardComponent, debounce: dict = None):
+        self.component = component
+        self.debounce = {**PROPERTY_DEBOUNCE, **(debounce or {})}
+        self.pending = {}
+        self.in_flight = {}
+        self.on_state = None
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def write(self, name: str, prop: dict) -> None:
+        """
+        Buffers the new property value and (re)starts the debounce timer.
+
+        Parameters:
+        -----------
+        name (str): Name of the property
+        prop (dict): Property description ({"type": ..., "value": ...})
+
+        Raises:
+        -------
+        ValueError, TypeError: if the value cannot be encoded in the message
+        """
+        prop = dict(prop)
+        # Fail early (on the gui side), if the value can't be encoded
+        server_pb2.DeviceProperties(properties={name: prop})
+        delay = self.debounce.get(prop.get("type"), DEFAULT_DEBOUNCE)
+        with self._lock:
+            self.pending[name] = prop
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            if delay > 0:
+                self._timer = threading.Timer(delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        self._notify(name, PropertyState.PENDING)
+        if delay <= 0:
+            self.flush()
+
+    def flush(self) -> None:
+        """
+        Sends all of the pending edits in one update.
+        """
+        with self._lock:
+            if self._timer:
+                self._timer.cancel()
+                self._timer = None
+            changes = self.pending
+            self.pending = {}
+            if not changes:
+                return
+            self.in_flight.update(changes)
+            # Earlier unconfirmed edits are sent again, they might fail
+            edited = dict(self.in_flight)
+
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        device = server_pb2.Device()
+        device.CopyFrom(self.component.device)
+        device.device_properties.properties.update(edited)
+        SvM.update_device_properties(
+            device,
+            on_done=lambda response: self._flushed(changes, response),
+            on_error=lambda error: self._failed(changes, str(error))
+            )
+
+    def value(self, name: str, default=None):
+        """
+        Returns the latest value of the property, including the edits
+        which were not yet confirmed by the server.
+        """
+        with self._lock:
+            for props in (self.pending, self.in_flight):
+                if name in props:
+                    return props[name].get("value", default)
+        return default
+
+    def _flushed(self, changes: dict, response) -> None:
+        if response.status != "success":
+            self._failed(changes, response.message)
+            return
+        self.component.device.device_properties.properties.update(changes)
+        LMH.get_logic(LogicModuleEnum.BOARD_MANAGER).mark_changed()
+        self._settle(changes, PropertyState.COMMITTED)
+        if hasattr(self.component, "update_properties_hook"):
+            self.component.update_properties_hook()
+
+    def _failed(self, changes: dict, message: str) -> None:
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        PM.display_message(f"Device property update failed: {message}")
+        self._settle(changes, PropertyState.FAILED, message)
+
+    def _settle(self, changes: dict, state: str, message: str = "") -> None:
+        for name, prop in changes.items():
+            with self._lock:
+                if self.in_flight.get(name) is prop:
+                    del self.in_flight[name]
+                # Newer edit is already waiting, it reports its own state
+                superseded = name in self.pending or name in self.in_flight
+            if not superseded:
+                self._notify(name, state, message)
+
+    def _notify(self, name: str, state: str, message: str = "") -> None:
+        if self.on_state:
+            self.on_state(name, state, message)
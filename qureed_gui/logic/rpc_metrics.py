@@ -0,0 +1,259 @@
+"""
+This module implements the instrumentation of the server communication.
+Every call is recorded into per-method histograms, which can be queried
+at runtime or exported as JSON or CSV.
+"""
+from __future__ import annotations
+import bisect
+import csv
+import io
+import json
+import math
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+# Upper bounds (in seconds) of the histogram buckets
+LATENCY_BUCKETS = (
+    0.001, 0.002, 0.005, 0.01, 0.02, 0.05,
+    0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, math.inf
+)
+
+
+class Histogram:
+    """
+    Histogram with fixed bucket bounds
+
+    Attributes:
+    -----------
+    bounds (tuple[float]): upper bounds of the buckets
+    counts (list[int]): number of samples per bucket
+    count (int): number of samples
+    total (float): sum of the samples
+    minimum (float): smallest sample
+    maximum (float): largest sample
+    """
+    def __init__(self, bounds: tuple = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * len(bounds)
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Upper bound of the bucket containing the q-th quantile (0 < q <= 1),
+        clipped to the largest sample.
+        """
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            if cumulative >= target:
+                return min(bound, self.maximum)
+        return self.maximum
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "min": self.minimum if self.count else 0.0,
+            "max": self.maximum,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "buckets": {
+                str(bound): count for bound, count in zip(self.bounds, self.counts)
+            },
+        }
+
+
+class MethodStats:
+    """
+    Statistics of one rpc method (or client side phase)
+    """
+    def __init__(self, method: str):
+        self.method = method
+        self.wall = Histogram()
+        self.queued = Histogram()
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.statuses = Counter()
+
+    def to_dict(self) -> dict:
+        return {
+            "method": self.method,
+            "calls": self.wall.count,
+            "wall": self.wall.to_dict(),
+            "queued": self.queued.to_dict(),
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "statuses": dict(self.statuses),
+        }
+
+
+class RpcMetrics:
+    """
+    RpcMetrics collects the timing and payload size of every call to the
+    project server.
+
+    Attributes:
+    -----------
+    methods (dict[str, MethodStats]): Statistics per method
+    last (Optional[dict]): The last recorded call
+
+    Methods:
+    --------
+    record(method, queued, wall, request_bytes, response_bytes, status):
+        Records one call
+    time(name): Context manager, records the duration of a client side phase
+    get(method): Returns the statistics of the method as a dict
+    snapshot(): Returns the statistics of all methods
+    to_json(path): Exports the statistics as JSON
+    to_csv(path): Exports the statistics as CSV
+    summary(): Short human readable summary
+    subscribe(listener): Listener is called after every recorded call
+    reset(): Clears the statistics
+    """
+    def __init__(self):
+        self.methods = {}
+        self.last = None
+        self.listeners = []
+        self._lock = threading.Lock()
+
+    def record(self, method: str, queued: float, wall: float,
+               request_bytes: int = 0, response_bytes: int = 0,
+               status: str = "success") -> None:
+        """
+        Records one call
+
+        Parameters:
+        -----------
+        method (str): Name of the rpc method
+        queued (float): Time (s) between the submission and the start of the call
+        wall (float): Duration (s) of the call
+        request_bytes (int): Serialized size of the request
+        response_bytes (int): Serialized size of the response
+        status (str): Status of the response or the exception name
+        """
+        with self._lock:
+            stats = self.methods.get(method)
+            if stats is None:
+                stats = self.methods[method] = MethodStats(method)
+            stats.wall.add(wall)
+            stats.queued.add(queued)
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.statuses[status] += 1
+            self.last = {
+                "method": method,
+                "queued": queued,
+                "wall": wall,
+                "request_bytes": request_bytes,
+                "response_bytes": response_bytes,
+                "status": status,
+            }
+        for listener in self.listeners:
+            listener(self)
+
+    @contextmanager
+    def time(self, name: str):
+        """
+        Records the duration of a client side phase (e.g. rendering of the
+        opened scheme) next to the rpc methods.
+        """
+        started = time.perf_counter()
+        status = "success"
+        try:
+            yield
+        except Exception as e:
+            status = type(e).__name__
+            raise
+        finally:
+            self.record(name, 0.0, time.perf_counter() - started, status=status)
+
+    def get(self, method: str) -> dict | None:
+        with self._lock:
+            stats = self.methods.get(method)
+            return stats.to_dict() if stats else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {name: stats.to_dict() for name, stats in self.methods.items()}
+
+    def to_json(self, path=None) -> str:
+        """
+        Returns the statistics as JSON, optionally writes them to path
+        """
+        data = json.dumps(self.snapshot(), indent=2)
+        if path:
+            with open(path, "w") as file:
+                file.write(data)
+        return data
+
+    def to_csv(self, path=None) -> str:
+        """
+        Returns the statistics as CSV (one row per method), optionally
+        writes them to path
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow([
+            "method", "calls", "errors", "wall_mean", "wall_p50", "wall_p95",
+            "wall_max", "queued_mean", "queued_p95", "request_bytes",
+            "response_bytes",
+        ])
+        for name, stats in self.snapshot().items():
+            wall, queued = stats["wall"], stats["queued"]
+            errors = sum(
+                count for status, count in stats["statuses"].items()
+                if status != "success"
+            )
+            writer.writerow([
+                name, stats["calls"], errors, wall["mean"], wall["p50"],
+                wall["p95"], wall["max"], queued["mean"], queued["p95"],
+                stats["request_bytes"], stats["response_bytes"],
+            ])
+        data = buffer.getvalue()
+        if path:
+            with open(path, "w", newline="") as file:
+                file.write(data)
+        return data
+
+    def summary(self) -> str:
+        """
+        Short summary of the server communication, displayed in the
+        status bar
+        """
+        with self._lock:
+            if self.last is None:
+                return ""
+            calls = sum(stats.wall.count for stats in self.methods.values())
+            last = self.last
+        return (
+            f"RPC {calls} | {last['method']} {last['wall'] * 1000:.0f} ms"
+            f" (queued {last['queued'] * 1000:.0f} ms,"
+            f" {last['response_bytes'] / 1024:.1f} kB)"
+        )
+
+    def subscribe(self, listener) -> None:
+        self.listeners.append(listener)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.methods = {}
+            self.last = None
@@ -0,0 +1,319 @@
+"""
+This module implements the crash journal of the opened scheme and
+the background autosave, which compacts the journal into SaveBoard
+calls.
+"""
+from __future__ import annotations
+import base64
+import hashlib
+import json
+import os
+import threading
+import time
+import typing
+from pathlib import Path
+
+from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+import qureed_project_server.server_pb2 as MSG
+
+if typing.TYPE_CHECKING:
+    from qureed_gui.logic.board_manager import BoardManager
+    from qureed_gui.components.board_component import BoardComponent
+
+LMH = LogicModuleHandler()
+
+JOURNAL_DIR = ".autosave"
+# Time (in seconds) between writing the pending moves into the journal
+JOURNAL_INTERVAL = 0.5
+# Time (in seconds) between the compactions of the journal
+AUTOSAVE_INTERVAL = 30.0
+
+
+class SchemeJournal:
+    """
+    SchemeJournal is an append-only file of the edits of one scheme,
+    one JSON entry per line. Entries are either rpc calls
+    ({"op": "rpc", "stub", "method", "type", "data"}) or device moves
+    ({"op": "move", "uuid", "location"}).
+
+    Attributes:
+    -----------
+    path (Path): Location of the journal file
+
+    Methods:
+    --------
+    append(entry): Appends the entry
+    entries(): Reads all of the entries
+    offset(): Current size of the journal
+    truncate(offset): Drops the entries before the offset
+    """
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, entry: dict) -> None:
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+                file.flush()
+
+    def entries(self) -> list[dict]:
+        """
+        Returns the journaled entries, a partially written last line
+        (crash during the write) is skipped.
+        """
+        with self._lock:
+            if not self.path.exists():
+                return []
+            lines = self.path.read_text(encoding="utf-8").splitlines()
+        entries = []
+        for line in lines:
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries
+
+    def offset(self) -> int:
+        with self._lock:
+            return self.path.stat().st_size if self.path.exists() else 0
+
+    def truncate(self, offset: int = None) -> None:
+        """
+        Drops the entries written before the offset (all of them if no
+        offset is given), entries appended later are kept.
+        """
+        with self._lock:
+            if not self.path.exists():
+                return
+            data = self.path.read_bytes()[offset:] if offset is not None else b""
+            if not data:
+                self.path.unlink()
+                return
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, self.path)
+
+
+class SchemeAutosave:
+    """
+    SchemeAutosave journals the edits of the opened scheme as they
+    happen and periodically saves the scheme in the background, after
+    which the journal is compacted. A journal which is left over after
+    a crash is replayed the next time the scheme is opened.
+
+    Attributes:
+    -----------
+    board_manager (BoardManager): Manager, which tracks and saves the changes
+    interval (float): Time between the autosaves, 0 disables the autosave
+    journal (Optional[SchemeJournal]): Journal of the opened scheme
+    pending_moves (dict[str, BoardComponent]): Moves not yet journaled
+
+    Methods:
+    --------
+    journal_for(project, scheme): Returns the journal of the scheme
+    open(project, scheme): Starts journaling the scheme
+    close(): Stops journaling
+    record_rpc(stub, method, request): Journals a confirmed edit
+    record_move(component): Queues the move of the device
+    checkpoint(): Journal and its offset, passed to compacted after a save
+    compacted(journal, offset): Drops the saved entries
+    recover(scheme, response, on_done): Replays the journal of the scheme
+    """
+    def __init__(self, board_manager: BoardManager,
+                 interval: float = AUTOSAVE_INTERVAL,
+                 journal_interval: float = JOURNAL_INTERVAL):
+        self.board_manager = board_manager
+        self.interval = interval
+        self.journal_interval = journal_interval
+        self.journal = None
+        self.pending_moves = {}
+        self.last_save = time.monotonic()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def journal_for(project, scheme: str) -> SchemeJournal:
+        digest = hashlib.sha1(str(scheme).encode()).hexdigest()[:8]
+        return SchemeJournal(
+            Path(project) / JOURNAL_DIR / f"{Path(scheme).stem}-{digest}.journal"
+            )
+
+    def open(self, project, scheme: str) -> None:
+        """
+        Starts journaling the edits of the scheme
+        """
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        self.interval = PM.load_config().get("autosave_interval", self.interval)
+        if self.record_rpc not in SvM.mutation_listeners:
+            SvM.mutation_listeners.append(self.record_rpc)
+        with self._lock:
+            self.journal = self.journal_for(project, scheme)
+            self.pending_moves = {}
+        self.last_save = time.monotonic()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def close(self) -> None:
+        """
+        Writes the pending moves and stops journaling
+        """
+        self._write_moves()
+        with self._lock:
+            self.journal = None
+
+    def record_rpc(self, stub: str, method: str, request) -> None:
+        """
+        Journals the edit, which was confirmed by the server
+        """
+        journal = self.journal
+        if journal is None:
+            return
+        journal.append({
+            "op": "rpc",
+            "stub": stub,
+            "method": method,
+            "type": request.DESCRIPTOR.name,
+            "data": base64.b64encode(request.SerializeToString()).decode("ascii"),
+        })
+
+    def record_move(self, component: BoardComponent) -> None:
+        """
+        Queues the move, moves are journaled in intervals so that a
+        drag doesn't write on every frame
+        """
+        with self._lock:
+            self.pending_moves[component.device.uuid] = component
+
+    def checkpoint(self) -> tuple[SchemeJournal | None, int | None]:
+        """
+        Returns the journal and its offset before a save, the entries
+        before the offset are covered by the save
+        """
+        self._write_moves()
+        journal = self.journal
+        return journal, journal.offset() if journal else None
+
+    def compacted(self, journal: SchemeJournal, offset: int) -> None:
+        """
+        Drops the journal entries covered by a successful save
+        """
+        self.last_save = time.monotonic()
+        if journal is not None and offset is not None:
+            journal.truncate(offset)
+
+    def _write_moves(self) -> None:
+        with self._lock:
+            moves, self.pending_moves = self.pending_moves, {}
+            journal = self.journal
+        if journal is None:
+            return
+        for device_uuid, component in moves.items():
+            journal.append({
+                "op": "move",
+                "uuid": device_uuid,
+                "location": [component.left, component.top],
+            })
+
+    def _run(self) -> None:
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        while True:
+            time.sleep(self.journal_interval)
+            try:
+                self._write_moves()
+                due = time.monotonic() - self.last_save >= self.interval
+                if self.interval and due and self.board_manager.has_unsaved_changes:
+                    self.last_save = time.monotonic()
+                    # The save reads the board state, which the ui thread edits
+                    SvM.dispatch_to_ui(self._save)
+            except Exception as e:
+                self._report(e)
+
+    def _save(self) -> None:
+        try:
+            self.board_manager.save_scheme(notify=False)
+        except Exception as e:
+            self._report(e)
+
+    @staticmethod
+    def _report(error: Exception) -> None:
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        PM.display_message(f"Autosave failed: {error}")
+
+    def recover(self, project, scheme: str, response, on_done) -> None:
+        """
+        Replays the journal left over after a crash. The journaled edits
+        are sent to the server, saved and the scheme is reopened. The
+        callback receives the reopened scheme and the journaled device
+        locations, which are not yet saved.
+
+        Parameters:
+        -----------
+        project (str): Path of the project
+        scheme (str): The opened scheme
+        response (OpenBoardResponse): The scheme as it was last saved
+        on_done (callable): Called with (response, locations)
+        """
+        SvM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
+        journal = self.journal_for(project, scheme)
+        entries = journal.entries()
+        locations = {
+            entry["uuid"]: entry["location"]
+            for entry in entries if entry.get("op") == "move"
+        }
+        edits = [
+            (entry["stub"], entry["method"],
+             getattr(MSG, entry["type"]).FromString(base64.b64decode(entry["data"])))
+            for entry in entries if entry.get("op") == "rpc"
+        ]
+        if not edits:
+            journal.truncate()
+            on_done(response, locations)
+            return
+
+        # SaveBoard replaces the device list, it is rebuilt from the
+        # saved scheme and the replayed edits
+        devices = {device.uuid: device for device in response.devices}
+
+        async def replay():
+            SvM.replaying = True
+            try:
+                for stub, method, request in edits:
+                    result = await SvM._call(stub, method, request)
+                    if result.status != "success":
+                        print(f"Journaled {method} not replayed: {result.message}")
+                    elif method == "AddDevice":
+                        devices[request.device.uuid] = request.device
+                    elif method == "UpdateDeviceProperties":
+                        # Only the changed properties might be sent
+                        device = devices.get(request.device.uuid)
+                        if device is not None:
+                            device.device_properties.properties.update(
+                                request.device.device_properties.properties
+                                )
+                    elif method == "RemoveDevice":
+                        devices.pop(request.device_uuid, None)
+                await SvM._call(
+                    "qm_stub", "SaveBoard",
+                    MSG.SaveBoardRequest(board=scheme, devices=list(devices.values()))
+                    )
+                return await SvM._call("qm_stub", "OpenBoard", MSG.OpenBoardRequest(board=scheme))
+            finally:
+                SvM.replaying = False
+
+        def replayed(reopened):
+            journal.truncate()
+            PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+            PM.display_message(f"Recovered {len(edits)} unsaved edits of {Path(scheme).name}")
+            on_done(reopened, locations)
+
+        def failed(error):
+            # Journal is kept for the next attempt
+            SvM.report_error(error)
+            on_done(response, locations)
+
+        SvM.submit(replay(), on_done=replayed, on_error=failed)
@@ -5,47 +5,162 @@ also manages the communication with the server
 import inspect
 import uuid
 import asyncio
+import atexit
 import time
-import socket
-import subprocess
 import sys
 import threading
 import traceback
-from pathlib import Path
+from concurrent.futures import Future
+from contextlib import contextmanager
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from logic.log_stream import (
+    LogStreamBuffer, LogPolicy, LOG_FLUSH_FPS, LOG_BUFFER_SIZE
+)
+from logic.rpc_metrics import RpcMetrics
+from logic.server_output import ServerOutput
+from logic.server_supervisor import ServerSupervisor
+from logic.server_pool import (
+    ProjectServer, ServerPool, SERVER_START_TIMEOUT,
+    STANDBY_POOL_SIZE, STANDBY_POOL_VENVS
+)
 import qureed_project_server.server_pb2 as MSG
 from qureed_project_server.client import GrpcClient
 
 
 LMH = LogicModuleHandler()
 
-def is_port_free(port):
+# Board edits, which are replayed on a restarted server
+REPLAYED_METHODS = (
+    "AddDevice",
+    "RemoveDevice",
+    "ConnectDevices",
+    "DisconnectDevices",
+    "UpdateDeviceProperties",
+)
+
+class BatchAborted(Exception):
     """
-    Bind temporarily to a port to check if it's free.
+    Raised for the requests of a batch, which were not sent because an
+    earlier stage of the batch failed
     """
-    try:
-        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-            print(f"Testing availability 127.0.0.1:{port}")
-            return s.connect_ex(("127.0.0.1", port)) != 0
-    except OSError:
-        return False
-
-def find_unused_port(start=50000, end=60000):
+
+
+class MutationBatch:
     """
-    Find an unused port in the specified range.
-    
-    Parameters:
-    - start (int): Starting port number.
-    - end (int): Ending port number.
-    
-    Returns:
-    - int: An unused port.
+    MutationBatch collects the non-blocking requests issued within one
+    ui gesture and flushes them to the server in a single submission.
+    Requests of the same stage are sent concurrently, stages are
+    separated by barriers and executed in order. If any request of a
+    stage fails, the later stages are not sent (they depend on it).
+
+    Attributes:
+    -----------
+    manager (ServeManager): Manager which executes the batch
+    stages (list[list[tuple]]): Queued (coroutine, on_done, on_error,
+        future) tuples, grouped by stage
+
+    Methods:
+    --------
+    add(coro, on_done, on_error): Queues the request
+    barrier(): Requests queued after the barrier are sent only after
+        all of the requests before the barrier were answered
+    flush(): Sends the queued requests to the server
+    discard(): Drops the queued requests without sending them
+
+    Examples:
+    ---------
+        >>> with SvM.batch() as batch:
+        >>>     for port in ports:
+        >>>         CM.disconnect(port)
+        >>>     batch.barrier()
+        >>>     BM.remove_device(device)
     """
-    for port in range(start, end):
-        if is_port_free(port):
-            print(f"Availability confirmed 127.0.0.1:{port}")
-            return port  # Return the reserved port
-    raise RuntimeError("No unused port found in the specified range.")
+    def __init__(self, manager):
+        self.manager = manager
+        self.stages = [[]]
+
+    def add(self, coro, on_done=None, on_error=None) -> Future:
+        """
+        Queues the coroutine, returned future resolves with its result
+        after the batch was flushed.
+        """
+        future = Future()
+        self.stages[-1].append((coro, on_done, on_error, future))
+        return future
+
+    def barrier(self) -> None:
+        """
+        Starts a new stage.
+        """
+        if self.stages[-1]:
+            self.stages.append([])
+
+    @staticmethod
+    def _failed(result) -> bool:
+        return isinstance(result, Exception) or getattr(result, "status", None) == "failure"
+
+    @staticmethod
+    async def _run(stages):
+        results = []
+        for i, stage in enumerate(stages):
+            stage_results = await asyncio.gather(
+                *(coro for coro, *_ in stage),
+                return_exceptions=True
+                )
+            results.extend(stage_results)
+            if any(MutationBatch._failed(result) for result in stage_results):
+                skipped = [item for later in stages[i + 1:] for item in later]
+                for coro, *_ in skipped:
+                    coro.close()
+                results.extend(
+                    BatchAborted("an earlier request of the batch failed")
+                    for _ in skipped
+                    )
+                break
+        return results
+
+    def flush(self):
+        """
+        Sends all of the queued requests to the server. Once every
+        request is answered the callbacks are invoked together on
+        the gui side, each with the result of its own request.
+        """
+        stages = self.stages
+        self.stages = [[]]
+        items = [item for stage in stages for item in stage]
+        if not items:
+            return None
+
+        def batch_done(results):
+            for (_, on_done, on_error, future), result in zip(items, results):
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                    (on_error if on_error else self.manager.report_error)(result)
+                    continue
+                future.set_result(result)
+                if on_done:
+                    on_done(result)
+
+        def batch_failed(error):
+            for _, _, on_error, future in items:
+                future.set_exception(error)
+                (on_error if on_error else self.manager.report_error)(error)
+
+        return self.manager.submit(
+            self._run(stages), on_done=batch_done, on_error=batch_failed
+            )
+
+    def discard(self) -> None:
+        """
+        Drops the queued requests, their futures are cancelled and their
+        callbacks are not called
+        """
+        stages = self.stages
+        self.stages = [[]]
+        for stage in stages:
+            for coro, _, _, future in stage:
+                coro.close()
+                future.cancel()
 
 
 class ServeManager:
@@ -56,24 +171,50 @@ class ServeManager:
 
     Attributes:
     -----------
+    server (Optional[ProjectServer]): Handle of the currently used server
     server_process (Optional[Subprocess]): Server subprocess after it was
        created
+    output (ServerOutput): Ring buffer with the output of the servers
+    pool (ServerPool): Warm standby servers, claimed by start()
+    supervisor (ServerSupervisor): Restarts the server if it fails
+    replay_log (list[tuple]): Board edits since the scheme was last opened
+        or saved, replayed on a restarted server
+    replaying (bool): True while the recorded edits are being replayed
+    mutation_listeners (list[callable]): Called with (stub, method, request)
+        after every confirmed board edit (except the replayed ones)
+    downtimes (list[float]): Durations (s) of the server recoveries
     port (int): The port over which server and main process communicate
     client (GrpcClient): The Grpc Client, which is managing the gRPC protocol
     loop (asyncion event loop): The asyncio event loop, so that we 
         can work with asynchronous tasks
     grpc_thread (Thread): thread running the loop (asyncio)
+    startup_timings (dict[str, float]): Durations (s) of the startup phases
+        (claim or spawn, ready, loop, client, venv_connect) of the last start
+    metrics (RpcMetrics): Per method latency, queueing delay, payload size
+        and status histograms of the rpc calls
     initialized (bool): Initialization flag for the Singleton Pattern
 
     Methods:
     --------
-    is_server_ready(): Checks if the server is ready
-    poll_server_output(): Polls and displays stdout and stderr of the server
-        subprocess
+    start_loop(): Starts the asyncio loop thread
     start(): Starts the server and related processes
-    run_in_loop(): Asyncio utility method
+    close_client(): Closes the channel of the client
+    run_in_loop(): Asyncio utility method, blocks until the result arrives
+    submit(): Asyncio utility method, returns a future and hands the
+        result to the callbacks on the gui side
+    dispatch_to_ui(): Runs a callback outside of the asyncio loop thread
+    batch(): Context manager, collecting the non-blocking calls of one
+        ui gesture into a single MutationBatch
     interrupt_signal_hook(): Hook to stop the server
+    handle_server_failure(server, reason): Restarts the failed server
+    replay(scheme): Restores the board state on a restarted server
     ... the rest are the communication calls
+
+    All of the communication calls accept the optional `on_done` and
+    `on_error` callbacks. If neither is given the call blocks and returns
+    the response (as before), otherwise the call returns immediately with
+    a `concurrent.futures.Future` and the callbacks are invoked with the
+    response (or the exception) once the server has answered.
     
     Examples:
     ---------
@@ -98,124 +239,197 @@ class ServeManager:
 
     def __init__(self):
         if not hasattr(self,"initialized"):
+            self.server = None
             self.server_process = None
             self.port = None
+            self.output = ServerOutput()
+            self.pool = ServerPool(self.output)
+            atexit.register(self.pool.shutdown)
             self.client = None
             self.loop = None
             self.grpc_thread = None
+            self.startup_timings = {}
+            self.metrics = RpcMetrics()
+            self.supervisor = ServerSupervisor(self.handle_server_failure)
+            self.replay_log = []
+            self.replaying = False
+            self.mutation_listeners = []
+            self.downtimes = []
+            self._local = threading.local()
             LMH.register(LogicModuleEnum.SERVER_MANAGER, self)
             self.initialized=True
 
-    def is_server_ready(self) -> bool:
+    def start(self) -> None:
         """
-        Check if the server is ready to accept connections.
+        Starts the project specific server. A warm standby server of the
+        project venv is claimed from the pool if available, otherwise
+        a new server subprocess is spawned. After the server accepts
+        connections (handshake over a probe channel) it starts grpc
+        thread and the pool is replenished in the background.
 
-        Returns:
-        bool: True if the server was succesfully created
+        Durations of the startup phases are stored in `startup_timings`.
         """
-        try:
-            with socket.create_connection(("localhost", self.port), timeout=1):
-                return True
-        except OSError:
-            return False
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        self.startup_timings = {}
+        phase_start = time.perf_counter()
+
+        def phase(name):
+            nonlocal phase_start
+            now = time.perf_counter()
+            self.startup_timings[name] = now - phase_start
+            phase_start = now
+
+        conf = PM.load_config()
+        self.pool.size = conf.get("server_pool_size", STANDBY_POOL_SIZE)
+        self.pool.max_venvs = conf.get("server_pool_venvs", STANDBY_POOL_VENVS)
+
+        server = self.pool.claim(PM.venv)
+        if server is not None:
+            phase("claim")
+            try:
+                server.wait_ready(SERVER_START_TIMEOUT)
+                phase("ready")
+            except Exception as e:
+                print(f"Standby server unusable: {e}")
+                server.kill()
+                server = None
+        if server is None:
+            server = ProjectServer(PM.venv, self.output)
+            PM.display_message(f"Starting server in {PM.venv}")
+            try:
+                server.start()
+            except FileNotFoundError:
+                raise
+            except Exception as e:
+                PM.display_message(f"Failed to start the server: {e}")
+                return
+            self.startup_timings.update(server.timings)
+            phase_start = time.perf_counter()
+
+        self.server = server
+        self.server_process = server.process
+        self.port = server.port
+
+        self.start_loop()
+        phase("loop")
 
-    def poll_server_output(self):
-        """
-        Method that polls the server ouput and displays it in the
-        stdout of the gui process.
-        """
-        if self.server_process:
-            def poll(process):
-                for line in iter(process.stdout.readline, ""):
-                    print(f"[SERVER STDOUT] {line.strip()}")
-                for line in iter(process.stderr.readline, ""):
-                    print(f"[SERVER STDERR] {line.strip()}")
+        # Initialize the gRPC client asynchronously
+        async def init_client():
+            self.client = GrpcClient(f"localhost:{self.port}")
 
-            output_thread = threading.Thread(target=poll, args=(self.server_process,), daemon=True)
-            output_thread.start()
+        # Submit the init_client coroutine to the running event loop
+        future = asyncio.run_coroutine_threadsafe(init_client(), self.loop)
+        try:
+            # Wait for the client initialization to complete
+            future.result()
+        except Exception as e:
+            print(f"Error initializing gRPC client: {e}")
+        phase("client")
 
-    def start(self) -> None:
-        """
-        Starts the project specific server as a subprocess.
-        Then it starts the thread which polls the server stdout
-        and stderr. After the connection to the server can be
-        established it starts grpc thread.
+        total = sum(self.startup_timings.values())
+        PM.display_message(
+            f"Project server started succesfully on port: {self.port} "
+            f"({total:.2f} s)"
+            )
+        print(f"Server startup timings: {self.format_startup_timings()}")
+        self.supervisor.watch(server)
+        self.pool.replenish(PM.venv)
 
+    def handle_server_failure(self, server: ProjectServer, reason: str) -> None:
+        """
+        Supervisor hook, called when the server exits or stops responding.
+        A new server is started, connected to the venv and the opened
+        scheme together with the unsaved edits is replayed on it.
+
+        Parameters:
+        -----------
+        server (ProjectServer): the failed server
+        reason (str): description of the failure
         """
+        if server is not self.server:
+            return
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        BM = LMH.get_logic(LogicModuleEnum.BOARD_MANAGER)
+        failed_at = time.perf_counter()
+        PM.display_message(f"Project server failed ({reason}), restarting...", timer=False)
+        self.close_client()
+        self.start()
+        if self.server is server:
+            PM.display_message("Project server could not be restarted")
+            return
+        try:
+            self.connect_venv()
+            self.replay(BM.opened_scheme)
+        except Exception as e:
+            traceback.print_exc()
+            PM.display_message(f"Project server restarted, but the board could not be restored: {e}")
+            return
+        downtime = time.perf_counter() - failed_at
+        self.downtimes.append(downtime)
+        PM.display_message(f"Project server recovered after {downtime:.1f} s")
 
-        python_executable = Path(PM.venv) / "bin" / "python" if sys.platform != "win32" else Path(PM.venv) / "Scripts" / "python.exe"
-        python_executable = Path(PM.venv) / (
-            "bin/python" if sys.platform != "win32" else "Scripts/python.exe"
-        )
-
-
-        if not python_executable.exists():
-            raise FileNotFoundError(
-                f"Python executable not found in virtual environment: {python_executable}"
-                )
+    def close_client(self) -> None:
+        """
+        Closes the channel of the current client and drops the client
+        """
+        client, self.client = self.client, None
+        channel = getattr(client, "channel", None)
+        if channel is None:
+            return
+        try:
+            closed = channel.close()
+            if inspect.isawaitable(closed):
+                self.run_in_loop(closed)
+        except Exception as e:
+            print(f"Closing the client channel failed: {e}")
 
-        # Find an unused port
-        self.port = find_unused_port()
-        # self.port = 60000
+    def replay(self, scheme: str) -> None:
+        """
+        Opens the scheme on the (restarted) server and replays the board
+        edits which were made since the scheme was last opened or saved.
 
-        # Command to start the server
-        command = [str(python_executable), "-u", "-m", 
-                   "qureed_project_server.server", "--port", str(self.port)]
-        PM.display_message("Starting server:" + " ".join(command))
+        Parameters:
+        -----------
+        scheme (str): the scheme opened on the board
+        """
+        edits, self.replay_log = self.replay_log, []
+        if scheme:
+            response = self.open_scheme(scheme)
+            if response.status != "success":
+                raise RuntimeError(response.message)
+        self.replaying = True
         try:
-            # Start the server process
-            self.server_process = subprocess.Popen(
-                command,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                bufsize=1,
-                encoding="utf-8"
-                )
-            print(f"Server started with PID {self.server_process.pid} on interface 127.0.0.1:{self.port},  {self.server_process.poll()}")
-            self.poll_server_output()
-
+            for stub, method, request in edits:
+                self.run_in_loop(self._call(stub, method, request))
+        finally:
+            self.replaying = False
 
-            # Poll for readiness
-            for _ in range(20):  # Wait up to 10 seconds
-                time.sleep(0.5)
-                if self.is_server_ready():
-                    break
-            else:
-                raise TimeoutError("Server did not become ready in time.")
-            
-        except Exception as e:
-            PM.display_message("Failed to start the server: {e}")
+    def start_loop(self) -> None:
+        """
+        Starts the asyncio event loop in the grpc thread (if it is not
+        already running) and waits until the loop is running.
+        """
+        if self.grpc_thread is not None:
             return
+        loop_ready = threading.Event()
 
-        PM.display_message(f"Project server started succesfully on port: {self.port}")
-        # Define a function to start the asyncio event loop in a new thread
         def grpc_thread_func():
             self.loop = asyncio.new_event_loop()
             asyncio.set_event_loop(self.loop)
+            self.loop.call_soon(loop_ready.set)
             self.loop.run_forever()
 
-        # Start the gRPC thread if not already running
-        if self.grpc_thread is None:
-            self.grpc_thread = threading.Thread(target=grpc_thread_func, daemon=True)
-            self.grpc_thread.start()
-
-        # Wait for the event loop to initialize
-        while self.loop is None:
-            pass
-
-        # Initialize the gRPC client asynchronously
-        async def init_client():
-            self.client = GrpcClient(f"localhost:{self.port}")
+        self.grpc_thread = threading.Thread(target=grpc_thread_func, daemon=True)
+        self.grpc_thread.start()
+        loop_ready.wait()
 
-        # Submit the init_client coroutine to the running event loop
-        future = asyncio.run_coroutine_threadsafe(init_client(), self.loop)
-        try:
-            # Wait for the client initialization to complete
-            future.result()
-        except Exception as e:
-            print(f"Error initializing gRPC client: {e}")
+    def format_startup_timings(self) -> str:
+        """
+        Returns the startup phase durations as a readable string
+        """
+        return ", ".join(
+            f"{name} {duration:.3f} s" for name, duration in self.startup_timings.items()
+            )
 
     def run_in_loop(self, coro):
         """
@@ -237,6 +451,142 @@ class ServeManager:
         future = asyncio.run_coroutine_threadsafe(coro, self.loop)
         return future.result()
 
+    def submit(self, coro, on_done=None, on_error=None) -> Future:
+        """
+        Utility method to run a coroutine in the correct event loop
+        without blocking the caller.
+
+        Args:
+            coro (coroutine): The coroutine to execute.
+            on_done (callable): Called with the result of the coroutine
+            on_error (callable): Called with the exception if the coroutine
+                fails, if not given the error is reported in the status bar
+
+        Returns:
+            Future: concurrent future, resolved when the coroutine finishes
+        """
+        if self.loop is None:
+            coro.close()
+            raise RuntimeError("Event loop is not initialized. Did you call start()?")
+
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+        def done(fut):
+            try:
+                result = fut.result()
+            except Exception as e:
+                self.dispatch_to_ui(on_error if on_error else self.report_error, e)
+                return
+            if on_done:
+                self.dispatch_to_ui(on_done, result)
+
+        future.add_done_callback(done)
+        return future
+
+    def dispatch_to_ui(self, callback, *args) -> None:
+        """
+        Runs the callback on the gui side. Callbacks are handed over to
+        flet, so that updating the controls never blocks the asyncio loop.
+
+        Args:
+            callback (callable): the callback to run
+            *args: arguments passed to the callback
+        """
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        if PM.page is not None:
+            PM.page.run_thread(callback, *args)
+        else:
+            callback(*args)
+
+    def report_error(self, error: Exception) -> None:
+        """
+        Default error callback of the non-blocking calls.
+        """
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        traceback.print_exception(error)
+        PM.display_message(f"Server request failed: {error}")
+
+    def _call(self, stub: str, method: str, request):
+        """
+        Creates the coroutine calling the rpc method `method` on the
+        client stub `stub`. The creation time is recorded, so that the
+        time the call waited for the loop shows up in the metrics.
+        """
+        return self._rpc(stub, method, request, time.perf_counter())
+
+    async def _rpc(self, stub: str, method: str, request, submitted: float):
+        """
+        Calls the rpc method and records its timing, payload sizes and
+        status in the metrics. Successful board edits are recorded in the
+        replay log, which is cleared whenever the scheme is opened or saved.
+        """
+        started = time.perf_counter()
+        try:
+            response = await self.client.call(
+                getattr(getattr(self.client, stub), method), request
+                )
+        except Exception as e:
+            self.metrics.record(
+                method, started - submitted, time.perf_counter() - started,
+                request_bytes=request.ByteSize(), status=type(e).__name__
+                )
+            raise
+        self.metrics.record(
+            method, started - submitted, time.perf_counter() - started,
+            request_bytes=request.ByteSize(),
+            response_bytes=response.ByteSize(),
+            status=getattr(response, "status", "") or "success"
+            )
+        if getattr(response, "status", None) == "success":
+            if method in REPLAYED_METHODS:
+                self.replay_log.append((stub, method, request))
+                if not self.replaying:
+                    for listener in self.mutation_listeners:
+                        listener(stub, method, request)
+            elif method in ("OpenBoard", "SaveBoard"):
+                self.replay_log.clear()
+        return response
+
+    def _dispatch(self, coro, on_done=None, on_error=None):
+        """
+        Blocks on the coroutine if no callbacks are given, otherwise
+        submits it and returns the future.
+        """
+        if on_done is None and on_error is None:
+            return self.run_in_loop(coro)
+        batch = getattr(self._local, "batch", None)
+        if batch is not None:
+            return batch.add(coro, on_done=on_done, on_error=on_error)
+        return self.submit(coro, on_done=on_done, on_error=on_error)
+
+    @contextmanager
+    def batch(self):
+        """
+        Collects all of the non-blocking calls made by the current thread
+        within the context and flushes them as one batch on exit. If the
+        context raised, the collected calls are discarded. Nested
+        contexts join the outer batch.
+
+        Yields:
+        -------
+        MutationBatch: the batch collecting the calls
+        """
+        current = getattr(self._local, "batch", None)
+        if current is not None:
+            yield current
+            return
+        batch = MutationBatch(self)
+        self._local.batch = batch
+        try:
+            yield batch
+        except BaseException:
+            batch.discard()
+            raise
+        else:
+            batch.flush()
+        finally:
+            self._local.batch = None
+
     def interrupt_signal_hook(self, *_, **__):
         """
         Interrupt signal hook, stops the server when 
@@ -244,156 +594,152 @@ class ServeManager:
         """
         print("Interrupt received! Stopping the server...")
         self.stop()
+        self.pool.shutdown()
         sys.exit(0)
 
-    def connect_venv(self):
+    def connect_venv(self, on_done=None, on_error=None):
         """
         Connect to the virtual environment using the gRPC client.
         """
         PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        started = time.perf_counter()
 
-        async def connect():
-            response = await self.client.call(
-                self.client.venv_stub.Connect,
+        def connected(response):
+            self.startup_timings["venv_connect"] = time.perf_counter() - started
+            if on_done:
+                on_done(response)
+            return response
+
+        if on_done is None and on_error is None:
+            return connected(self._dispatch(
+                self._call(
+                    "venv_stub", "Connect",
+                    MSG.VenvConnectRequest(venv_path=str(PM.venv))
+                    )))
+        return self._dispatch(
+            self._call(
+                "venv_stub", "Connect",
                 MSG.VenvConnectRequest(venv_path=str(PM.venv))
-            )
-        self.run_in_loop(connect())
+                ),
+            connected, on_error)
 
-    def open_scheme(self, scheme):
+    def open_scheme(self, scheme, on_done=None, on_error=None):
         """
         Request to open a scheme, receives the scheme elements.
         """
-        async def load_scheme():
-            response = await self.client.call(
-                self.client.qm_stub.OpenBoard,
+        return self._dispatch(
+            self._call(
+                "qm_stub", "OpenBoard",
                 MSG.OpenBoardRequest(board=scheme)
-                )
-            return response
-        return self.run_in_loop(load_scheme())
+                ),
+            on_done, on_error)
 
-    def get_device(self, path: str):
+    def get_device(self, path: str, on_done=None, on_error=None):
         """
         Get the module class string given a path of the module
         """
-        async def get_device():
-            response = await self.client.call(
-                self.client.qm_stub.GetDevice,
+        return self._dispatch(
+            self._call(
+                "qm_stub", "GetDevice",
                 MSG.GetDeviceRequest(module_path=path)
-                )
-            return response
-        return self.run_in_loop(get_device())
+                ),
+            on_done, on_error)
 
-    def save_scheme(self, board, devices=[], connections=[]):
+    def save_scheme(self, board, devices=[], connections=[],
+                    on_done=None, on_error=None):
         """
         Requests the saving of the scheme
         """
-        async def save_scheme():
-            response = await self.client.call(
-                self.client.qm_stub.SaveBoard,
+        return self._dispatch(
+            self._call(
+                "qm_stub", "SaveBoard",
                 MSG.SaveBoardRequest(
                     board=board,
                     devices=devices,
                     connections=connections
                     )
-                )
-            return response
-        return self.run_in_loop(save_scheme())
+                ),
+            on_done, on_error)
 
     def update_device(self, device):
         """
         TODO
         """
 
-    def connect_devices(self, device_uuid_1, device_port_1, device_uuid_2, device_port_2):
-        async def connect_devices():
-            response = await self.client.call(
-                self.client.qm_stub.ConnectDevices,
+    def connect_devices(self, device_uuid_1, device_port_1, device_uuid_2, device_port_2,
+                        on_done=None, on_error=None):
+        return self._dispatch(
+            self._call(
+                "qm_stub", "ConnectDevices",
                 MSG.ConnectDevicesRequest(
                     device_uuid_1=device_uuid_1,
                     device_port_1=device_port_1,
                     device_uuid_2=device_uuid_2,
                     device_port_2=device_port_2
                     )
-                )
-            return response
-        return self.run_in_loop(connect_devices())
-
-    def disconnect_devices(self, device_uuid_1, device_port_1, device_uuid_2, device_port_2):
-        async def disconnect_devices():
-            response = await self.client.call(
-                self.client.qm_stub.DisconnectDevices,
+                ),
+            on_done, on_error)
+
+    def disconnect_devices(self, device_uuid_1, device_port_1, device_uuid_2, device_port_2,
+                           on_done=None, on_error=None):
+        return self._dispatch(
+            self._call(
+                "qm_stub", "DisconnectDevices",
                 MSG.DisconnectDevicesRequest(
                     device_uuid_1=device_uuid_1,
                     device_port_1=device_port_1,
                     device_uuid_2=device_uuid_2,
                     device_port_2=device_port_2
                     )
-                )
-            return response
-        return self.run_in_loop(disconnect_devices())
+                ),
+            on_done, on_error)
 
-    def add_device(self, device):
-        async def get_device():
-            response = await self.client.call(
-                self.client.qm_stub.AddDevice,
+    def add_device(self, device, on_done=None, on_error=None):
+        return self._dispatch(
+            self._call(
+                "qm_stub", "AddDevice",
                 MSG.AddDeviceRequest(device=device)
-                )
-            return response
-        return self.run_in_loop(get_device())
+                ),
+            on_done, on_error)
 
-    def remove_device(self, device_uuid):
-        async def remove_device():
-            response = await self.client.call(
-                self.client.qm_stub.RemoveDevice,
+    def remove_device(self, device_uuid, on_done=None, on_error=None):
+        return self._dispatch(
+            self._call(
+                "qm_stub", "RemoveDevice",
                 MSG.RemoveDeviceRequest(device_uuid=device_uuid)
-                )
-            return response
-        return self.run_in_loop(remove_device())
-
-    def get_all_devices(self):
-        async def get_all_devices():
-            response = await self.client.call(
-                self.client.qm_stub.GetDevices,
-                MSG.GetDevicesRequest()
-                )
-            return response
-        return self.run_in_loop(get_all_devices())
-
-    def get_all_icons(self):
-        async def get_all_icons():
-            response = await self.client.call(
-                self.client.qm_stub.GetIcons,
-                MSG.GetIconRequest()
-                )
-            return response
-        return self.run_in_loop(get_all_icons())
-
-    def get_all_signals(self):
-        async def get_all_signals():
-            response = await self.client.call(
-                self.client.qm_stub.GetSignals,
-                MSG.GetSignalsRequest()
-                )
-            return response
-        return self.run_in_loop(get_all_signals())
-
-    def generate_new_device(self, device):
-        async def generate_new_device():
-            response = await self.client.call(
-                self.client.qm_stub.GenerateDevices,
+                ),
+            on_done, on_error)
+
+    def get_all_devices(self, on_done=None, on_error=None):
+        return self._dispatch(
+            self._call("qm_stub", "GetDevices", MSG.GetDevicesRequest()),
+            on_done, on_error)
+
+    def get_all_icons(self, on_done=None, on_error=None):
+        return self._dispatch(
+            self._call("qm_stub", "GetIcons", MSG.GetIconRequest()),
+            on_done, on_error)
+
+    def get_all_signals(self, on_done=None, on_error=None):
+        return self._dispatch(
+            self._call("qm_stub", "GetSignals", MSG.GetSignalsRequest()),
+            on_done, on_error)
+
+    def generate_new_device(self, device, on_done=None, on_error=None):
+        return self._dispatch(
+            self._call(
+                "qm_stub", "GenerateDevices",
                 MSG.GenerateDeviceRequest(device=device)
-                )
-            return response
-        return self.run_in_loop(generate_new_device())
+                ),
+            on_done, on_error)
 
-    def update_device_properties(self, device:MSG.Device):
-        async def update_device_properties():
-            response = await self.client.call(
-                self.client.qm_stub.UpdateDeviceProperties,
-                MSG.UpdateDevicePropertiesRequest(
-                    device=device))
-            return response
-        return self.run_in_loop(update_device_properties())
+    def update_device_properties(self, device:MSG.Device, on_done=None, on_error=None):
+        return self._dispatch(
+            self._call(
+                "qm_stub", "UpdateDeviceProperties",
+                MSG.UpdateDevicePropertiesRequest(device=device)
+                ),
+            on_done, on_error)
 
     def stop(self, timeout=5):
         """
@@ -404,16 +750,12 @@ class ServeManager:
         """
         if self.server_process is None:
             return
-        async def terminate():
-            response = await self.client.call(
-                self.client.server_stub.Terminate,
-                MSG.TerminateRequest()
-            )
-            return response
-
+        self.supervisor.release()
         try:
             # Attempt to terminate the server gracefully
-            response = self.run_in_loop(terminate())
+            response = self.run_in_loop(
+                self._call("server_stub", "Terminate", MSG.TerminateRequest())
+                )
             print(f"Server termination response: {response}")
         except Exception as e:
             print(f"Error during graceful termination request: {e}")
@@ -436,24 +778,16 @@ class ServeManager:
         print("Server stopped.")
 
     def start_simulation(self, scheme:str, simulation_id, simulation_time:float):
-        print(MSG.StartSimulationRequest(
-                    scheme_path=str(scheme),
-                    simulation_id=str(simulation_id),
-                    simulation_time=simulation_time
-                ))
-        async def start_simulation():
-            response = await self.client.call(
-                self.client.simulation_stub.StartSimulation,
+        response = self.run_in_loop(
+            self._call(
+                "simulation_stub", "StartSimulation",
                 MSG.StartSimulationRequest(
                     scheme_path=str(scheme),
                     simulation_id=str(simulation_id),
                     simulation_time=simulation_time
                 )
             )
-            return response
-
-        
-        response = self.run_in_loop(start_simulation())
+        )
         if response.status == "failure":
             print(f"Simulation Failed to start:{response.message}")
         elif self.loop is not None:
@@ -463,14 +797,34 @@ class ServeManager:
             )
 
     async def subscribe_to_logs(self, simulation_id):
+        """
+        Reads the simulation log stream. The logs are buffered and
+        handed to the gui in batches, see `LogStreamBuffer`.
+        """
         request = MSG.SimulationLogStreamRequest()
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        SiM = LMH.get_logic(LogicModuleEnum.SIMULATION_MANAGER)
+        conf = PM.load_config()
+
+        def new_buffer():
+            return LogStreamBuffer(
+                SiM.handle_log_batch, self.dispatch_to_ui,
+                fps=conf.get("log_flush_fps", LOG_FLUSH_FPS),
+                capacity=conf.get("log_buffer_size", LOG_BUFFER_SIZE),
+                policy=conf.get("log_backpressure", LogPolicy.BLOCK),
+                )
+
+        buffer = new_buffer()
         try:
             stream = self.client.simulation_stub.SimulationLogStream(request)
-            SiM = LMH.get_logic(LogicModuleEnum.SIMULATION_MANAGER)
             async for response in stream:
-                SiM.handle_logs(response)
+                await buffer.put(response.log)
                 if response.log.end:
-                    SiM.handle_simulation_end()
+                    # Simulation ends once all of its logs are displayed
+                    await buffer.close()
+                    self.dispatch_to_ui(SiM.handle_simulation_end)
+                    buffer = new_buffer()
+            await buffer.close()
 
         except Exception as e:
             print("ASYNCIO ERROR")
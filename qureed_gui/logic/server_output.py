@@ -0,0 +1,96 @@
+"""
+This module implements the pump of the project server output. Both
+output streams are read concurrently and the lines are kept in a
+bounded ring buffer, from which the server console renders.
+"""
+from __future__ import annotations
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+SERVER_OUTPUT_LINES = 5000
+
+
+class OutputLine(NamedTuple):
+    """
+    One line of the server output
+    """
+    seq: int
+    timestamp: float
+    pid: int
+    stream: str
+    text: str
+
+
+class ServerOutput:
+    """
+    ServerOutput keeps the last `maxlen` lines printed by the project
+    servers. Every line gets a sequence number, so that the readers can
+    incrementally fetch only the lines they haven't seen yet.
+
+    Attributes:
+    -----------
+    lines (deque[OutputLine]): Ring buffer of the output lines
+    echo (bool): If True the lines are printed to the gui stdout as well
+
+    Methods:
+    --------
+    pump(process): Starts reading stdout and stderr of the process
+    append(pid, stream, text): Appends a line to the buffer
+    since(seq): Returns the buffered lines newer than seq
+    clear(): Clears the buffer
+    """
+    def __init__(self, maxlen: int = SERVER_OUTPUT_LINES, echo: bool = False):
+        self.lines = deque(maxlen=maxlen)
+        self.echo = echo
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def pump(self, process) -> None:
+        """
+        Starts one reader thread per output stream of the process, so
+        a chatty stream can never block the other one.
+        """
+        for stream, pipe in (("stdout", process.stdout), ("stderr", process.stderr)):
+            threading.Thread(
+                target=self._read, args=(process.pid, stream, pipe), daemon=True
+                ).start()
+
+    def _read(self, pid: int, stream: str, pipe) -> None:
+        try:
+            for line in iter(pipe.readline, ""):
+                self.append(pid, stream, line.rstrip("\n"))
+        except (OSError, ValueError):
+            pass
+        finally:
+            pipe.close()
+
+    def append(self, pid: int, stream: str, text: str) -> None:
+        """
+        Appends the line to the ring buffer
+        """
+        with self._lock:
+            self._seq += 1
+            self.lines.append(OutputLine(self._seq, time.time(), pid, stream, text))
+        if self.echo:
+            print(f"[SERVER {stream.upper()}] {text}")
+
+    def since(self, seq: int) -> list[OutputLine]:
+        """
+        Returns the lines with a sequence number larger than seq. Lines
+        which were already dropped from the buffer are skipped.
+        """
+        with self._lock:
+            if not self.lines or seq >= self._seq:
+                return []
+            first = self.lines[0].seq
+            start = max(seq + 1 - first, 0)
+            return [self.lines[i] for i in range(start, len(self.lines))]
+
+    def clear(self) -> None:
+        """
+        Clears the buffer, the sequence numbers keep increasing
+        """
+        with self._lock:
+            self.lines.clear()
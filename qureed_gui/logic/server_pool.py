@@ -0,0 +1,294 @@
+"""
+This module implements the project server processes and the pool
+of warm standby servers, which are spawned ahead of time so that
+opening a project doesn't have to wait for a cold server start.
+"""
+from __future__ import annotations
+import socket
+import subprocess
+import sys
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+import grpc
+
+from logic.server_output import ServerOutput
+
+SERVER_START_TIMEOUT = 10
+SERVER_START_ATTEMPTS = 3
+STANDBY_POOL_SIZE = 1
+STANDBY_POOL_VENVS = 2
+
+
+def find_unused_port() -> int:
+    """
+    Lets the operating system assign a free port on the loopback
+    interface. The socket is closed right away, so the port can be
+    handed over to the server.
+
+    Returns:
+    - int: An unused port.
+    """
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def venv_python(venv) -> Path:
+    """
+    Returns the python executable of the given virtual environment
+    """
+    return Path(venv) / (
+        "bin/python" if sys.platform != "win32" else "Scripts/python.exe"
+    )
+
+
+class ProjectServer:
+    """
+    ProjectServer is a handle of one `qureed_project_server` subprocess.
+
+    Attributes:
+    -----------
+    venv (str): Virtual environment the server runs in
+    output (ServerOutput): Buffer collecting the server output
+    port (int): The port the server listens on
+    process (Optional[Subprocess]): Server subprocess after it was spawned
+    timings (dict[str, float]): Durations (s) of the spawn and ready phases
+    ready (threading.Event): Set once the server accepts connections
+
+    Methods:
+    --------
+    start(attempts, timeout): Spawns the server and waits until it is ready
+    spawn(): Spawns the server subprocess
+    wait_ready(timeout): Blocks until the server accepts connections
+    alive(): Checks if the process is still running
+    kill(): Kills the process
+    """
+    def __init__(self, venv, output: ServerOutput):
+        self.venv = str(venv)
+        self.output = output
+        self.port = None
+        self.process = None
+        self.timings = {}
+        self.ready = threading.Event()
+
+    def start(self, attempts: int = SERVER_START_ATTEMPTS,
+              timeout: float = SERVER_START_TIMEOUT) -> None:
+        """
+        Spawns the server and waits until it accepts connections. If the
+        server exits during the startup (e.g. it lost the port race) the
+        startup is retried on a fresh port.
+
+        Raises:
+        -------
+        TimeoutError: If the server did not become ready in time
+        RuntimeError: If all of the attempts failed
+        """
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            self.spawn()
+            spawned = time.perf_counter()
+            self.timings["spawn"] = spawned - started
+            try:
+                # Server imports its modules and binds the port
+                self.wait_ready(timeout)
+                self.timings["ready"] = time.perf_counter() - spawned
+                return
+            except RuntimeError as e:
+                print(f"Server startup attempt {attempt + 1} failed: {e}")
+            except Exception:
+                self.kill()
+                raise
+        raise RuntimeError(f"Server failed to start after {attempts} attempts")
+
+    def spawn(self) -> None:
+        """
+        Spawns the server subprocess on a port assigned by the OS.
+        """
+        python_executable = venv_python(self.venv)
+        if not python_executable.exists():
+            raise FileNotFoundError(
+                f"Python executable not found in virtual environment: {python_executable}"
+                )
+        self.ready.clear()
+        self.port = find_unused_port()
+        command = [str(python_executable), "-u", "-m",
+                   "qureed_project_server.server", "--port", str(self.port)]
+        self.process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            bufsize=1,
+            encoding="utf-8"
+            )
+        print(f"Server started with PID {self.process.pid} on interface 127.0.0.1:{self.port}")
+        self.poll_output()
+
+    def poll_output(self) -> None:
+        """
+        Pumps the server output into the output buffer. Output of the
+        standby servers must be drained as well, otherwise the server
+        blocks on a full pipe.
+        """
+        self.output.pump(self.process)
+
+    def wait_ready(self, timeout: float) -> None:
+        """
+        Blocks until the server accepts connections. The readiness is
+        established by a probe gRPC channel, the wait is event driven
+        and fails fast if the server process exits.
+
+        Parameters:
+        -----------
+        timeout (float): Maximum time to wait in seconds
+
+        Raises:
+        -------
+        TimeoutError: If the server did not become ready in time
+        RuntimeError: If the server process exited during the startup
+        """
+        if self.ready.is_set():
+            return
+        channel = grpc.insecure_channel(
+            f"localhost:{self.port}",
+            options=[
+                ("grpc.initial_reconnect_backoff_ms", 20),
+                ("grpc.min_reconnect_backoff_ms", 20),
+                ("grpc.max_reconnect_backoff_ms", 200),
+            ]
+        )
+        ready = grpc.channel_ready_future(channel)
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                try:
+                    ready.result(timeout=0.2)
+                    self.ready.set()
+                    return
+                except grpc.FutureTimeoutError:
+                    pass
+                if self.process.poll() is not None:
+                    raise RuntimeError(
+                        f"Server exited with code {self.process.returncode}"
+                        )
+                if time.monotonic() > deadline:
+                    raise TimeoutError("Server did not become ready in time.")
+        finally:
+            ready.cancel()
+            channel.close()
+
+    def alive(self) -> bool:
+        """
+        Checks if the server process is still running
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def kill(self) -> None:
+        """
+        Kills the server process
+        """
+        if self.alive():
+            self.process.kill()
+            self.process.wait()
+
+
+class ServerPool:
+    """
+    ServerPool keeps pre-spawned (and pre-imported) project servers per
+    virtual environment, so that opening a project only has to claim a
+    warm server and connect it to the project.
+
+    Attributes:
+    -----------
+    output (ServerOutput): Buffer collecting the output of the servers
+    size (int): Number of standby servers kept per virtual environment
+    max_venvs (int): Number of virtual environments with standby servers,
+        least recently used environments are evicted
+    standby (OrderedDict[str, list[ProjectServer]]): Standby servers
+
+    Methods:
+    --------
+    claim(venv): Takes a standby server out of the pool
+    replenish(venv): Spawns standby servers in the background
+    shutdown(): Kills all of the standby servers
+    """
+    def __init__(self, output: ServerOutput, size: int = STANDBY_POOL_SIZE,
+                 max_venvs: int = STANDBY_POOL_VENVS):
+        self.output = output
+        self.size = size
+        self.max_venvs = max_venvs
+        self.standby = OrderedDict()
+        self._lock = threading.Lock()
+
+    def claim(self, venv) -> ProjectServer | None:
+        """
+        Takes a ready standby server for the given venv out of the
+        pool. Servers which are still starting are left to their startup
+        thread, which may still respawn them on another port.
+
+        Returns:
+        --------
+        Optional[ProjectServer]: the standby server or None
+        """
+        venv = str(venv)
+        with self._lock:
+            servers = self.standby.get(venv, [])
+            for server in list(servers):
+                if not server.ready.is_set():
+                    continue
+                servers.remove(server)
+                if server.alive():
+                    return server
+        return None
+
+    def replenish(self, venv) -> None:
+        """
+        Spawns the missing standby servers for the venv in the background
+        and evicts the least recently used venvs over the limit.
+        """
+        venv = str(venv)
+        evicted = []
+        with self._lock:
+            # Starting servers are kept, they remove themselves on failure
+            servers = [
+                s for s in self.standby.pop(venv, [])
+                if not s.ready.is_set() or s.alive()
+                ]
+            self.standby[venv] = servers
+            while len(self.standby) > max(self.max_venvs, 0):
+                _, old = self.standby.popitem(last=False)
+                evicted.extend(old)
+            missing = self.size - len(servers) if venv in self.standby else 0
+            new_servers = [ProjectServer(venv, self.output) for _ in range(max(missing, 0))]
+            if venv in self.standby:
+                servers.extend(new_servers)
+
+        for server in evicted:
+            server.kill()
+        for server in new_servers:
+            threading.Thread(
+                target=self._start_standby, args=(server,), daemon=True
+                ).start()
+
+    def _start_standby(self, server: ProjectServer) -> None:
+        try:
+            server.start()
+        except Exception as e:
+            print(f"Standby server for {server.venv} failed to start: {e}")
+            with self._lock:
+                servers = self.standby.get(server.venv, [])
+                if server in servers:
+                    servers.remove(server)
+
+    def shutdown(self) -> None:
+        """
+        Kills all of the standby servers
+        """
+        with self._lock:
+            servers = [s for servers in self.standby.values() for s in servers]
+            self.standby.clear()
+        for server in servers:
+            server.kill()
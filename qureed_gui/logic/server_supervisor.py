@@ -0,0 +1,108 @@
+"""
+This module implements the supervisor of the project server, which
+detects when the server process exits or stops responding.
+"""
+from __future__ import annotations
+import threading
+import typing
+
+import grpc
+
+if typing.TYPE_CHECKING:
+    from qureed_gui.logic.server_pool import ProjectServer
+
+HEARTBEAT_INTERVAL = 2.0
+HEARTBEAT_TIMEOUT = 1.0
+HEARTBEAT_MISSES = 3
+# The heartbeat calls a method the server doesn't implement, a server
+# which handles requests answers with UNIMPLEMENTED, a hung one doesn't
+# answer before the deadline
+HEARTBEAT_METHOD = "/qureed_gui.Supervisor/Heartbeat"
+MISSED_HEARTBEAT_CODES = (grpc.StatusCode.DEADLINE_EXCEEDED, grpc.StatusCode.UNAVAILABLE)
+
+
+class ServerSupervisor:
+    """
+    ServerSupervisor watches one project server at a time. It reports a
+    failure if the server process exits or if the server misses
+    consecutive heartbeats (heartbeat rpc isn't answered within the
+    timeout). The channel staying connected isn't enough, a hung server
+    still accepts connections.
+    Hung servers are killed before the failure is reported.
+
+    Attributes:
+    -----------
+    on_failure (callable): Called with the failed server and the reason,
+        from the supervisor thread
+    interval (float): Time between the heartbeats in seconds
+    timeout (float): Heartbeat timeout in seconds
+    misses (int): Number of consecutive missed heartbeats, after which
+        the server is considered hung
+
+    Methods:
+    --------
+    watch(server): Starts supervising the server
+    release(): Stops supervising, must be called before intentional stops
+    """
+    def __init__(self, on_failure, interval: float = HEARTBEAT_INTERVAL,
+                 timeout: float = HEARTBEAT_TIMEOUT, misses: int = HEARTBEAT_MISSES):
+        self.on_failure = on_failure
+        self.interval = interval
+        self.timeout = timeout
+        self.misses = misses
+        self.server = None
+        self._released = None
+
+    def watch(self, server: ProjectServer) -> None:
+        """
+        Starts supervising the given server, the previously watched
+        server is released.
+        """
+        self.release()
+        self.server = server
+        self._released = threading.Event()
+        threading.Thread(
+            target=self._supervise, args=(server, self._released), daemon=True
+            ).start()
+
+    def release(self) -> None:
+        """
+        Stops supervising the current server
+        """
+        if self._released is not None:
+            self._released.set()
+        self.server = None
+        self._released = None
+
+    def _supervise(self, server: ProjectServer, released: threading.Event) -> None:
+        channel = grpc.insecure_channel(f"localhost:{server.port}")
+        heartbeat = channel.unary_unary(HEARTBEAT_METHOD)
+        missed = 0
+        reason = None
+        try:
+            while not released.wait(self.interval):
+                if server.process.poll() is not None:
+                    reason = f"server exited with code {server.process.returncode}"
+                    break
+                if self._beat(heartbeat):
+                    missed = 0
+                else:
+                    missed += 1
+                    if missed >= self.misses:
+                        reason = f"server missed {missed} heartbeats"
+                        server.kill()
+                        break
+        finally:
+            channel.close()
+        if reason is not None and not released.is_set():
+            self.on_failure(server, reason)
+
+    def _beat(self, heartbeat) -> bool:
+        """
+        Sends one heartbeat, returns True if the server answered
+        """
+        try:
+            heartbeat(b"", timeout=self.timeout)
+        except grpc.RpcError as e:
+            return e.code() not in MISSED_HEARTBEAT_CODES
+        return True
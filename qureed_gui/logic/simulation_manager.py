@@ -1,9 +1,25 @@
 import asyncio
 import uuid 
+from pathlib import Path
 from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+from logic.log_store import LogStore
+from logic.log_archive import LogArchive, ArchivedRun, LOG_ARCHIVE_NAME
+from logic.log_index import LogIndex
 
 LMH = LogicModuleHandler()
 
+# Number of the logs of the live run kept in memory, after which the
+# log view is backed by the archive
+LOG_MEMORY_CAP = 50000
+
+
+def decode_log(payload: bytes):
+    """
+    Deserializes the archived log message
+    """
+    import qureed_project_server.server_pb2 as MSG
+    return MSG.SimulationLogStreamResponse().log.__class__.FromString(payload)
+
 class SimulationManager:
     _instance = None
 
@@ -19,6 +35,14 @@ class SimulationManager:
             self.log_component=None
             self.simulation_time=None
             self.scheme = None
+            self.simulation_id = None
+            self.log_store = LogStore()
+            self.log_index = LogIndex()
+            self.log_filter = None
+            self.view = self.log_store
+            self.archive = None
+            self.run = None
+            self.memory_cap = LOG_MEMORY_CAP
             self.initialized=True
 
     def set_simulation_time(self, simulation_time:float) -> None:
@@ -34,30 +58,144 @@ class SimulationManager:
     def update_executable_schemes(self, schemes) -> None:
         if self.simulation_tab:
             self.simulation_tab.update_executable_schemes(schemes)
+        self.update_runs()
+
+    def get_archive(self):
+        """
+        Returns the log archive of the opened project
+        """
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        if PM.path is None:
+            return None
+        path = Path(PM.path) / "logs" / LOG_ARCHIVE_NAME
+        if self.archive is None or self.archive.path != path:
+            if self.archive is not None:
+                self.archive.close()
+            self.archive = LogArchive(path, decode=decode_log)
+        return self.archive
+
+    def update_runs(self) -> None:
+        """
+        Lists the archived runs in the simulation tab
+        """
+        archive = self.get_archive()
+        if self.simulation_tab and archive is not None:
+            self.simulation_tab.update_runs(archive.runs())
+
+    def open_run(self, simulation_id) -> None:
+        """
+        Displays the logs of an archived run, they are paged from the
+        archive as the log view scrolls
+        """
+        archive = self.get_archive()
+        if archive is None:
+            return
+        if self.run is not None and self.run.simulation_id == str(simulation_id):
+            self.log_store = self.run
+        else:
+            self.log_store = ArchivedRun(archive, simulation_id)
+        # Archived runs are filtered by the archive
+        self.log_index.clear()
+        self.show_logs()
+
+    def apply_filter(self, log_filter=None) -> None:
+        """
+        Displays only the logs matching the filter (`LogFilter`), logs
+        in memory are queried through the index, the archived runs
+        through the archive
+        """
+        if log_filter is not None and log_filter.is_empty():
+            log_filter = None
+        self.log_filter = log_filter
+        self.show_logs()
+
+    def show_logs(self) -> None:
+        """
+        Displays the current store, filtered by the current filter
+        """
+        if self.log_filter is None:
+            self.view = self.log_store
+        elif isinstance(self.log_store, LogStore):
+            self.view = LogStore()
+            self.view.extend(self.log_index.query(self.log_filter))
+        else:
+            self.view = ArchivedRun(
+                self.log_store.archive, self.log_store.simulation_id, self.log_filter
+                )
+        if self.log_component:
+            self.log_component.show_store(self.view)
 
     def select_scheme(self, scheme=None):
         self.scheme = scheme
         print(f"Selected a new scheme {self.scheme}")
 
     def clear_logs(self):
-        if self.log_component:
-            self.log_component.clear_logs()
+        """
+        Clears the displayed logs, the archived logs are kept
+        """
+        self.log_store = LogStore()
+        self.log_index.clear()
+        self.show_logs()
 
     def simulation_start(self):
         self.clear_logs()
         SeM = LMH.get_logic(LogicModuleEnum.SERVER_MANAGER)
         self.simulation_id = uuid.uuid4()
         if self.scheme:
+            archive = self.get_archive()
+            if archive is not None:
+                PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+                self.memory_cap = PM.load_config().get("log_memory_cap", LOG_MEMORY_CAP)
+                archive.start_run(self.simulation_id, self.scheme)
+                self.run = ArchivedRun(archive, self.simulation_id)
+                self.update_runs()
             response = SeM.start_simulation(
                 self.scheme,
                 self.simulation_id,
                 self.simulation_time)
 
     def handle_logs(self, response):
+        self.handle_log_batch([response.log])
+
+    def handle_log_batch(self, logs, dropped: int = 0):
+        """
+        Stores the batch of the streamed logs and displays them, dropped
+        is the number of the logs the stream buffer dropped since the
+        last batch. The log component receives the insertion positions.
+        Every log is archived, once the run outgrows the memory cap the
+        log view is backed by the archive.
+        """
+        TC = LMH.get_logic(LogicModuleEnum.THUMBNAIL_CACHE)
+        for log in logs:
+            if log.figure:
+                TC.prefetch(log.figure)
+        positions = []
+        if self.run is not None:
+            positions = self.run.extend(logs)
+        if isinstance(self.log_store, LogStore):
+            positions = self.log_store.extend(logs)
+            self.log_index.extend(logs)
+            if self.run is not None and len(self.log_store) > self.memory_cap:
+                self.open_run(self.run.simulation_id)
+        elif self.log_store is not self.run:
+            # An older run is displayed
+            return
+        if self.view is not self.log_store:
+            if isinstance(self.view, LogStore):
+                logs = [log for log in logs if self.log_filter.matches(log)]
+                positions = self.view.extend(logs)
+            else:
+                # Positions in the filtered archive are unknown
+                self.view.refresh()
+                positions = None
         if self.log_component:
-            self.log_component.submit_log(response.log)
+            self.log_component.insert_logs(logs, positions, dropped)
         else:
             print("COMPONENT NOT REGISTERED")
 
     def handle_simulation_end(self):
+        if self.run is not None:
+            self.run.archive.end_run(self.simulation_id)
+            self.run = None
+            self.update_runs()
         self.simulation_id = None
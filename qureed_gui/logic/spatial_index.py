@@ -0,0 +1,171 @@
+"""
+This module implements the spatial index of the board components. The
+board is divided into a uniform grid of cells, every component is
+registered in the cells its bounds overlap, so that the rectangle and
+point queries only look at the components in the queried cells.
+"""
+from __future__ import annotations
+import math
+
+# Size of one grid cell (in pixels), about the size of a device
+GRID_CELL_SIZE = 256
+
+
+def intersects(a: tuple, b: tuple) -> bool:
+    """
+    Checks if the (left, top, right, bottom) rectangles intersect
+    """
+    return a[0] <= b[2] and b[0] <= a[2] and a[1] <= b[3] and b[1] <= a[3]
+
+
+def contains(outer: tuple, inner: tuple) -> bool:
+    """
+    Checks if the outer rectangle strictly contains the inner one
+    """
+    return (outer[0] < inner[0] and inner[2] < outer[2]
+            and outer[1] < inner[1] and inner[3] < outer[3])
+
+
+def distance(point: tuple, bounds: tuple) -> float:
+    """
+    Distance of the point from the rectangle (0 if it is inside)
+    """
+    dx = max(bounds[0] - point[0], 0, point[0] - bounds[2])
+    dy = max(bounds[1] - point[1], 0, point[1] - bounds[3])
+    return math.hypot(dx, dy)
+
+
+class SpatialGrid:
+    """
+    SpatialGrid is a uniform grid index of the rectangles of the items.
+    Query results are returned in the order in which the items were
+    inserted (the z-order of the board components). The items are
+    identified by their identity, not by equality.
+
+    Attributes:
+    -----------
+    cell_size (float): Size of one cell
+    cells (dict[tuple[int, int], set[int]]): Item ids by the cell
+    items (dict[int, tuple]): Item id -> (item, bounds, order)
+
+    Methods:
+    --------
+    insert(item, bounds): Indexes the item
+    move(item, bounds): Updates the bounds of the item
+    remove(item): Removes the item
+    query(rect): Items intersecting the rectangle
+    contained(rect): Items inside of the rectangle
+    at(point): Items containing the point, topmost first
+    nearest(point, radius): Items within the radius, nearest first
+    clear(): Removes all of the items
+    """
+    def __init__(self, cell_size: float = GRID_CELL_SIZE):
+        self.cell_size = cell_size
+        self.clear()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __contains__(self, item) -> bool:
+        return id(item) in self.items
+
+    def clear(self) -> None:
+        self.cells = {}
+        self.items = {}
+        self._order = 0
+
+    def _cells(self, bounds: tuple):
+        size = self.cell_size
+        for cx in range(math.floor(bounds[0] / size), math.floor(bounds[2] / size) + 1):
+            for cy in range(math.floor(bounds[1] / size), math.floor(bounds[3] / size) + 1):
+                yield (cx, cy)
+
+    def insert(self, item, bounds: tuple) -> None:
+        if id(item) in self.items:
+            self.move(item, bounds)
+            return
+        self._order += 1
+        self.items[id(item)] = (item, tuple(bounds), self._order)
+        for cell in self._cells(bounds):
+            self.cells.setdefault(cell, set()).add(id(item))
+
+    def move(self, item, bounds: tuple) -> None:
+        """
+        Updates the bounds of the item, only the cells which the item
+        entered or left are touched
+        """
+        entry = self.items.get(id(item))
+        if entry is None:
+            self.insert(item, bounds)
+            return
+        old = set(self._cells(entry[1]))
+        new = set(self._cells(bounds))
+        for cell in old - new:
+            self._discard(cell, id(item))
+        for cell in new - old:
+            self.cells.setdefault(cell, set()).add(id(item))
+        self.items[id(item)] = (item, tuple(bounds), entry[2])
+
+    def remove(self, item) -> None:
+        entry = self.items.pop(id(item), None)
+        if entry is None:
+            return
+        for cell in self._cells(entry[1]):
+            self._discard(cell, id(item))
+
+    def _discard(self, cell: tuple, item_id: int) -> None:
+        ids = self.cells.get(cell)
+        if ids is not None:
+            ids.discard(item_id)
+            if not ids:
+                del self.cells[cell]
+
+    def _candidates(self, rect: tuple) -> list[tuple]:
+        size = self.cell_size
+        cells_x = math.floor(rect[2] / size) - math.floor(rect[0] / size) + 1
+        cells_y = math.floor(rect[3] / size) - math.floor(rect[1] / size) + 1
+        if cells_x * cells_y > len(self.cells):
+            # The rectangle covers more cells than are occupied
+            ids = set().union(*(
+                ids for (cx, cy), ids in self.cells.items()
+                if rect[0] // size <= cx <= rect[2] // size
+                and rect[1] // size <= cy <= rect[3] // size
+            ))
+        else:
+            ids = set()
+            for cell in self._cells(rect):
+                ids.update(self.cells.get(cell, ()))
+        return sorted((self.items[i] for i in ids), key=lambda entry: entry[2])
+
+    def query(self, rect: tuple) -> list:
+        """
+        Returns the items intersecting the rectangle
+        """
+        return [item for item, bounds, _ in self._candidates(rect) if intersects(bounds, rect)]
+
+    def contained(self, rect: tuple) -> list:
+        """
+        Returns the items strictly inside of the rectangle
+        """
+        return [item for item, bounds, _ in self._candidates(rect) if contains(rect, bounds)]
+
+    def at(self, point: tuple) -> list:
+        """
+        Returns the items containing the point, the topmost first
+        """
+        rect = (point[0], point[1], point[0], point[1])
+        return self.query(rect)[::-1]
+
+    def nearest(self, point: tuple, radius: float) -> list:
+        """
+        Returns the items within the radius of the point, the nearest
+        first
+        """
+        rect = (point[0] - radius, point[1] - radius, point[0] + radius, point[1] + radius)
+        found = [
+            (distance(point, bounds), item)
+            for item, bounds, _ in self._candidates(rect)
+            if distance(point, bounds) <= radius
+        ]
+        found.sort(key=lambda entry: entry[0])
+        return [item for _, item in found]
@@ -0,0 +1,134 @@
+"""
+This module implements the summaries of the logged tensors. Large
+tensors (e.g. density matrices of multi-mode simulations) are never
+rendered whole, the viewer displays the summary statistics, a
+downsampled heatmap and one page of the entries at a time.
+"""
+from __future__ import annotations
+import base64
+import struct
+import zlib
+
+import numpy as np
+
+# Size of the longer side of the heatmap (in pixels)
+HEATMAP_SIZE = 128
+# Number of the largest entries in the summary
+TOP_ENTRIES = 5
+
+# Anchors of the heatmap colormap (dark blue -> teal -> yellow)
+COLORMAP = np.array([
+    [13, 8, 135],
+    [33, 145, 140],
+    [253, 231, 37],
+], dtype=float)
+
+
+def as_matrix(array: np.ndarray) -> np.ndarray:
+    """
+    Views the tensor as a matrix, vectors become one row and the
+    trailing dimensions of the higher order tensors are flattened
+    """
+    if array.ndim == 0:
+        return array.reshape(1, 1)
+    if array.ndim == 1:
+        return array.reshape(1, -1)
+    return array.reshape(array.shape[0], -1)
+
+
+def summarize(array: np.ndarray, top: int = TOP_ENTRIES) -> dict:
+    """
+    Computes the summary statistics of the tensor
+
+    Returns:
+    --------
+    dict: shape, dtype, norm (Frobenius), trace (square matrices only),
+        max_abs (list of the (index, value) of the largest entries)
+    """
+    flat = array.ravel()
+    magnitudes = np.abs(flat)
+    top = min(top, flat.size)
+    largest = np.argpartition(magnitudes, -top)[-top:] if top else np.array([], dtype=int)
+    largest = largest[np.argsort(magnitudes[largest])[::-1]]
+    summary = {
+        "shape": array.shape,
+        "dtype": str(array.dtype),
+        "norm": float(np.linalg.norm(flat)),
+        "trace": None,
+        "max_abs": [
+            (tuple(int(i) for i in np.unravel_index(i, array.shape)), flat[i].item())
+            for i in largest
+        ],
+    }
+    if array.ndim == 2 and array.shape[0] == array.shape[1]:
+        summary["trace"] = np.trace(array).item()
+    return summary
+
+
+def downsample(array: np.ndarray, size: int = HEATMAP_SIZE) -> np.ndarray:
+    """
+    Downsamples the magnitudes of the tensor to at most size x size
+    pixels, every pixel holds the maximum of its block, so that the
+    isolated large entries stay visible
+    """
+    matrix = np.abs(as_matrix(array)).astype(float)
+    height, width = matrix.shape
+    fy = -(-height // size)
+    fx = -(-width // size)
+    if fy == 1 and fx == 1:
+        return matrix
+    padded = np.zeros((-(-height // fy) * fy, -(-width // fx) * fx))
+    padded[:height, :width] = matrix
+    return padded.reshape(
+        padded.shape[0] // fy, fy, padded.shape[1] // fx, fx
+        ).max(axis=(1, 3))
+
+
+def colorize(values: np.ndarray) -> np.ndarray:
+    """
+    Maps the values to RGB colors of the colormap
+    """
+    peak = values.max() if values.size else 0
+    scaled = values / peak if peak > 0 else np.zeros_like(values)
+    anchors = np.linspace(0, 1, len(COLORMAP))
+    channels = [np.interp(scaled, anchors, COLORMAP[:, c]) for c in range(3)]
+    return np.stack(channels, axis=-1).round().astype(np.uint8)
+
+
+def encode_png(rgb: np.ndarray) -> bytes:
+    """
+    Encodes the RGB image (height x width x 3, uint8) as PNG
+    """
+    height, width, _ = rgb.shape
+    # Every scanline starts with the filter type (0, no filter)
+    raw = np.zeros((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (
+            struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF)
+        )
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(raw.tobytes()))
+        + chunk(b"IEND", b"")
+    )
+
+
+def heatmap(array: np.ndarray, size: int = HEATMAP_SIZE) -> str:
+    """
+    Renders the downsampled magnitudes of the tensor as a PNG image,
+    encoded in base64 (as expected by `ft.Image.src_base64`)
+    """
+    return base64.b64encode(encode_png(colorize(downsample(array, size)))).decode()
+
+
+def page(array: np.ndarray, row: int, col: int, rows: int, cols: int) -> np.ndarray:
+    """
+    Returns the block of the tensor (viewed as a matrix) starting at
+    (row, col), the block is a view and isn't copied
+    """
+    return as_matrix(array)[row:row + rows, col:col + cols]
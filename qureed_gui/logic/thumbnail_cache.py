@@ -0,0 +1,174 @@
+"""
+This module implements the cache of the plot previews. Figure logs and
+the plot gallery display small previews, which are rendered once in
+a worker thread, the full resolution plots are loaded only on demand.
+"""
+from __future__ import annotations
+import base64
+import io
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from PIL import Image
+
+from logic.logic_module_handler import LogicModuleEnum, LogicModuleHandler
+
+LMH = LogicModuleHandler()
+
+# Size of the longer side of the preview (in pixels)
+THUMBNAIL_SIZE = 320
+# Number of the cached previews
+THUMBNAIL_CACHE_SIZE = 256
+# Extensions of the plots listed in the gallery
+PLOT_EXTENSIONS = (".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp")
+
+
+def file_key(path) -> tuple:
+    """
+    Key of the cached preview, the preview is rendered again when the
+    file changes
+    """
+    stat = os.stat(path)
+    return (str(path), stat.st_mtime_ns, stat.st_size)
+
+
+def render_thumbnail(path, size: int = THUMBNAIL_SIZE) -> str:
+    """
+    Renders the preview of the image, encoded in base64
+    """
+    with Image.open(path) as image:
+        image.thumbnail((size, size))
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA")
+        buffer = io.BytesIO()
+        image.save(buffer, format="PNG", optimize=True)
+    return base64.b64encode(buffer.getvalue()).decode("utf-8")
+
+
+class ThumbnailCache:
+    """
+    ThumbnailCache (Singleton) keeps the previews of the plots, keyed
+    by the path, modification time and size of the file. Previews are
+    rendered in a worker thread, concurrent requests of the same preview
+    share one rendering. The least recently used previews are evicted.
+
+    Attributes:
+    -----------
+    entries (OrderedDict[tuple, str]): file key -> base64 preview
+    waiting (dict[tuple, list]): callbacks waiting for the rendering
+    initialized (bool): Initialization flag for the Singleton Pattern
+
+    Methods:
+    --------
+    get(path, on_done): Hands the preview to the callback
+    prefetch(path): Renders the preview in the background
+    plots(): Lists the plots of the opened project
+
+    Examples:
+    ---------
+        >>> TC = LogicModuleHandler().get_logic(LogicModuleEnum.THUMBNAIL_CACHE)
+        >>> TC.get(log.figure, self.preview_loaded)
+
+    Notes:
+    ------
+    This Singleton instance is initiated once in the `logic/__init__.py`
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if not cls._instance:
+            cls._instance = super(ThumbnailCache, cls).__new__(cls, *args, **kwargs)
+        return cls._instance
+
+    def __init__(self, size: int = THUMBNAIL_SIZE, capacity: int = THUMBNAIL_CACHE_SIZE):
+        if not hasattr(self, "initialized"):
+            self.size = size
+            self.capacity = capacity
+            self.entries = OrderedDict()
+            self.waiting = {}
+            self._lock = threading.Lock()
+            self._executor = ThreadPoolExecutor(
+                max_workers=2, thread_name_prefix="thumbnails"
+                )
+            LMH.register(LogicModuleEnum.THUMBNAIL_CACHE, self)
+            self.initialized = True
+
+    def get(self, path, on_done=None) -> bool:
+        """
+        Hands the preview of the plot to the callback. A cached preview
+        is handed right away, otherwise the callback is called in the
+        worker thread once the preview is rendered.
+
+        Parameters:
+        -----------
+        path (str): Path of the plot
+        on_done (callable): called with the base64 preview, or None if
+            the plot can't be read
+
+        Returns:
+        --------
+        bool: True if the preview was served from the cache
+        """
+        try:
+            key = file_key(path)
+        except OSError:
+            if on_done:
+                on_done(None)
+            return False
+        with self._lock:
+            preview = self.entries.get(key)
+            if preview is not None:
+                self.entries.move_to_end(key)
+            else:
+                callbacks = self.waiting.get(key)
+                render = callbacks is None
+                if render:
+                    callbacks = self.waiting[key] = []
+                if on_done:
+                    callbacks.append(on_done)
+        if preview is not None:
+            if on_done:
+                on_done(preview)
+            return True
+        if render:
+            self._executor.submit(self._render, key)
+        return False
+
+    def prefetch(self, path) -> None:
+        """
+        Renders the preview in the background, e.g. when the figure log
+        arrives
+        """
+        self.get(path)
+
+    def _render(self, key: tuple) -> None:
+        try:
+            preview = render_thumbnail(key[0], self.size)
+        except Exception as e:
+            print(f"Failed to render the preview of {key[0]}: {e}")
+            preview = None
+        with self._lock:
+            if preview is not None:
+                self.entries[key] = preview
+                while len(self.entries) > self.capacity:
+                    self.entries.popitem(last=False)
+            callbacks = self.waiting.pop(key, [])
+        for callback in callbacks:
+            callback(preview)
+
+    def plots(self) -> list[Path]:
+        """
+        Lists the plots in the plots/ directory of the opened project,
+        newest first
+        """
+        PM = LMH.get_logic(LogicModuleEnum.PROJECT_MANAGER)
+        if PM.path is None:
+            return []
+        plots = [
+            path for path in (Path(PM.path) / "plots").rglob("*")
+            if path.suffix.lower() in PLOT_EXTENSIONS
+        ]
+        return sorted(plots, key=lambda path: path.stat().st_mtime, reverse=True)
@@ -7,7 +7,7 @@ import threading
 import flet as ft
 
 from components import Toolbar, StatusBar
-from panels import BoardPanel, SimulationPanel
+from panels import BoardPanel, SimulationPanel, ServerPanel
 from theme import ThemeManager
 
 from logic.keyboard import KeyboardEventDispatcher, start_pynput_listener
@@ -82,6 +82,14 @@ def main(page: ft.Page) -> None:
                         content=ft.Text("Simulation", size=15, color="white")
                     ),
                     content=SimulationPanel(page)
+                ),
+                ft.Tab(
+                    tab_content=ft.Container(
+                        height=20,
+                        alignment=ft.alignment.center,
+                        content=ft.Text("Server", size=15, color="white")
+                    ),
+                    content=ServerPanel(page)
                 )
             ],
         )
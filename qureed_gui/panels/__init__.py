@@ -1,2 +1,3 @@
 from .board_panel import BoardPanel
-from .simulation_panel import SimulationPanel
\ No newline at end of file
+from .simulation_panel import SimulationPanel
+from .server_panel import ServerPanel
\ No newline at end of file
@@ -0,0 +1,16 @@
+import flet as ft
+
+from components import ServerConsole
+
+
+class ServerPanel(ft.Stack):
+    """
+    Server Panel displays the output of the project server
+    """
+    def __init__(self, page:ft.Page):
+        super().__init__()
+        self.page = page
+        self.expand = True
+        self.controls = [
+            ServerConsole()
+            ]
@@ -15,6 +15,7 @@ setup(
     packages=find_packages(where="."),
     install_requires=[
         "flet==0.27.6",
+        "Pillow",
         "toml",
     ],
     package_data={
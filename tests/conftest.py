@@ -0,0 +1,63 @@
+"""
+Fixtures of the headless tests, which run the logic modules against
+the in-process FakeProjectServer.
+"""
+import sys
+import types
+from pathlib import Path
+
+import pytest
+
+GUI_PATH = Path(__file__).resolve().parents[1] / "qureed_gui"
+for path in (GUI_PATH.parent, GUI_PATH):
+    if str(path) not in sys.path:
+        sys.path.insert(0, str(path))
+
+# The logic modules are imported one by one, the package __init__ would
+# also start the keyboard listener and import the flet components
+if "logic" not in sys.modules:
+    logic_package = types.ModuleType("logic")
+    logic_package.__path__ = [str(GUI_PATH / "logic")]
+    sys.modules["logic"] = logic_package
+# The same for the components, which would need the full application
+if "components" not in sys.modules:
+    components_package = types.ModuleType("components")
+    components_package.__path__ = [str(GUI_PATH / "components")]
+    sys.modules["components"] = components_package
+
+
+@pytest.fixture
+def managers():
+    """
+    Creates (or returns) the logic singletons, without the flet page
+    """
+    from logic.project_manager import ProjectManager
+    from logic.board_manager import BoardManager
+    from logic.connection_manager import ConnectionManager
+    from logic.selection_manager import SelectionManager
+    from logic.server_manager import ServeManager
+    from logic.catalog_cache import CatalogCache
+
+    return types.SimpleNamespace(
+        PM=ProjectManager(),
+        BM=BoardManager(),
+        CM=ConnectionManager(),
+        SeM=SelectionManager(),
+        SvM=ServeManager(),
+        CC=CatalogCache(),
+    )
+
+
+@pytest.fixture
+def fake_server(managers):
+    """
+    FakeProjectServer attached to the ServeManager
+    """
+    from fake_server import FakeProjectServer
+
+    server = FakeProjectServer()
+    managers.SvM.metrics.reset()
+    managers.SvM.replay_log.clear()
+    server.attach(managers.SvM)
+    yield server
+    server.detach(managers.SvM)
@@ -0,0 +1,372 @@
+"""
+In-process stand-in for the qureed project server.
+
+FakeProjectServer answers the calls of the ServeManager without a venv
+or a server subprocess. It replaces the GrpcClient of the manager, so
+the requests still go through ServeManager._call (metrics, replay log,
+batching and callbacks), only the transport is skipped. Latency and
+failures can be injected per method and the device catalog and schemes
+are synthetic.
+
+Examples:
+---------
+    >>> server = FakeProjectServer(catalog=synthetic_catalog(50))
+    >>> server.add_scheme("big.json", *synthetic_scheme(2000))
+    >>> server.latency = {"OpenBoard": 0.05}
+    >>> server.fail("AddDevice", error=ConnectionError("unavailable"))
+    >>> server.attach(SvM)
+    >>> SvM.open_scheme("big.json")
+"""
+from __future__ import annotations
+import asyncio
+import threading
+import time
+import uuid
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+from qureed_project_server import server_pb2
+
+
+class FakeResponse(SimpleNamespace):
+    """
+    Response of the methods, for which the gui only reads the fields
+    """
+    def ByteSize(self) -> int:
+        size = 0
+        for value in vars(self).values():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for v in values:
+                if hasattr(v, "ByteSize"):
+                    size += v.ByteSize()
+                elif isinstance(v, str):
+                    size += len(v.encode())
+        return size
+
+
+class FakeMethod:
+    """
+    Stand-in of a stub method, identified by its name
+    """
+    def __init__(self, name: str):
+        self.name = name
+
+
+class FakeStub:
+    """
+    Stand-in of a gRPC stub, every attribute is a stub method
+    """
+    def __getattr__(self, name: str) -> FakeMethod:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return FakeMethod(name)
+
+
+class FakeClient:
+    """
+    Stand-in of the `qureed_project_server.client.GrpcClient`
+    """
+    def __init__(self, server: FakeProjectServer):
+        self.server = server
+        self.qm_stub = FakeStub()
+        self.venv_stub = FakeStub()
+        self.server_stub = FakeStub()
+        self.simulation_stub = FakeStub()
+
+    async def call(self, stub_method: FakeMethod, request):
+        return await self.server.handle(stub_method.name, request)
+
+
+def synthetic_device(index: int, inputs: int = 1, outputs: int = 1) -> server_pb2.Device:
+    """
+    Creates a catalog device with the given number of ports
+    """
+    ports = [
+        server_pb2.Port(label=f"in{i}", direction="input", signal_type="GenericSignal")
+        for i in range(inputs)
+    ] + [
+        server_pb2.Port(label=f"out{i}", direction="output", signal_type="GenericSignal")
+        for i in range(outputs)
+    ]
+    return server_pb2.Device(
+        class_name=f"SyntheticDevice{index}",
+        gui_name=f"Synthetic Device {index}",
+        gui_tags=["synthetic"],
+        module_class=f"synthetic.devices.SyntheticDevice{index}",
+        ports=ports,
+        device_properties=server_pb2.DeviceProperties(
+            properties={"gain": {"type": "float", "value": 1.0}}
+            ),
+        )
+
+
+def synthetic_catalog(size: int = 20) -> list[server_pb2.Device]:
+    """
+    Creates a device catalog of the given size
+    """
+    return [synthetic_device(i) for i in range(size)]
+
+
+def synthetic_scheme(devices: int, columns: int = 50) -> tuple[list, list]:
+    """
+    Creates a scheme with the devices placed on a grid and chained
+    output to input.
+
+    Returns:
+    --------
+    tuple[list[server_pb2.Device], list[dict]]: devices and connections
+    """
+    placed = []
+    for i in range(devices):
+        device = synthetic_device(i % 20)
+        device.uuid = str(uuid.uuid4())
+        device.location[:] = [200 * (i % columns), 150 * (i // columns)]
+        placed.append(device)
+    connections = [
+        {
+            "device_one_uuid": a.uuid, "device_one_port_label": "out0",
+            "device_two_uuid": b.uuid, "device_two_port_label": "in0",
+        }
+        for a, b in zip(placed, placed[1:])
+    ]
+    return placed, connections
+
+
+class FakeProjectServer:
+    """
+    FakeProjectServer keeps the board state of one project in memory
+    and answers the rpc methods used by the ServeManager.
+
+    Attributes:
+    -----------
+    catalog (list[server_pb2.Device]): Devices returned by GetDevices
+    icons (list[server_pb2.GetIconResponse]): Icons returned by GetIcons
+    signals (list[SimpleNamespace]): Signals returned by GetSignals
+    schemes (dict[str, tuple[list, list]]): Saved schemes
+    devices (dict[str, server_pb2.Device]): Devices of the opened scheme
+    connections (list[dict]): Connections of the opened scheme
+    latency (float | dict[str, float]): Delay of every call, or per method
+        ("*" is the default)
+    calls (list[tuple[str, Message]]): Every received call
+
+    Methods:
+    --------
+    attach(manager): Replaces the client of the manager with this server
+    detach(manager): Removes the server from the manager
+    add_scheme(name, devices, connections): Adds a saved scheme
+    fail(method, error, times): Injects failures
+    on(method, handler): Replaces the handler of the method
+    calls_to(method): Requests received by the method
+    """
+    def __init__(self, catalog: list = None, latency=0.0):
+        self.catalog = list(catalog) if catalog is not None else synthetic_catalog()
+        self.icons = [
+            server_pb2.GetIconResponse(name="synthetic.png", abs_path="/icons/synthetic.png")
+        ]
+        self.signals = [
+            SimpleNamespace(name="GenericSignal", module_class="synthetic.signals.GenericSignal")
+        ]
+        self.schemes = {}
+        self.devices = {}
+        self.connections = []
+        self.latency = latency
+        self.calls = []
+        self.handlers = {}
+        self._failures = defaultdict(deque)
+        self._lock = threading.Lock()
+
+    def attach(self, manager) -> None:
+        """
+        Makes the manager talk to this server, the manager loop is
+        started if it is not running yet.
+        """
+        manager.start_loop()
+        manager.client = FakeClient(self)
+
+    def detach(self, manager) -> None:
+        manager.client = None
+
+    def add_scheme(self, name: str, devices: list, connections: list = ()) -> None:
+        self.schemes[name] = (list(devices), list(connections))
+
+    def fail(self, method: str, error=None, times: int = 1) -> None:
+        """
+        Makes the next `times` calls of the method fail. If error is an
+        exception it is raised (transport error), otherwise a response
+        with the failure status and error as message is returned.
+        """
+        for _ in range(times):
+            self._failures[method].append(error if error is not None else "injected failure")
+
+    def on(self, method: str, handler) -> None:
+        """
+        Replaces the handler of the method, handler receives the request
+        and returns the response
+        """
+        self.handlers[method] = handler
+
+    def calls_to(self, method: str) -> list:
+        with self._lock:
+            return [request for name, request in self.calls if name == method]
+
+    async def handle(self, method: str, request):
+        with self._lock:
+            self.calls.append((method, request))
+            failure = self._failures[method].popleft() if self._failures[method] else None
+        latency = self.latency
+        if isinstance(latency, dict):
+            latency = latency.get(method, latency.get("*", 0.0))
+        if latency:
+            await asyncio.sleep(latency)
+        if isinstance(failure, BaseException):
+            raise failure
+        if failure is not None:
+            return FakeResponse(status="failure", message=str(failure))
+        handler = self.handlers.get(method) or getattr(self, f"_{method}", None)
+        if handler is None:
+            raise NotImplementedError(f"FakeProjectServer doesn't implement {method}")
+        return handler(request)
+
+    @staticmethod
+    def _success(**fields) -> FakeResponse:
+        return FakeResponse(status="success", message="", **fields)
+
+    def _Connect(self, request):
+        return self._success()
+
+    def _Terminate(self, request):
+        return self._success()
+
+    def _StartSimulation(self, request):
+        return self._success()
+
+    def _OpenBoard(self, request):
+        devices, connections = self.schemes.setdefault(request.board, ([], []))
+        self.devices = {device.uuid: device for device in devices}
+        self.connections = list(connections)
+        response = server_pb2.OpenBoardResponse(
+            status="success", message="", devices=devices
+            )
+        for connection in connections:
+            response.connections.add(**connection)
+        return response
+
+    def _SaveBoard(self, request):
+        # Like the project server, the device list is replaced
+        self.devices = {device.uuid: device for device in request.devices}
+        self.schemes[request.board] = (list(self.devices.values()), list(self.connections))
+        return self._success()
+
+    def _GetDevice(self, request):
+        for device in self.catalog:
+            if device.module_class == request.module_path:
+                return self._success(device=device)
+        return FakeResponse(status="failure", message=f"{request.module_path} not found")
+
+    def _GetDevices(self, request):
+        return self._success(devices=list(self.catalog))
+
+    def _GetIcons(self, request):
+        return self._success(icons_list=list(self.icons))
+
+    def _GetSignals(self, request):
+        return self._success(signals=list(self.signals))
+
+    def _GenerateDevices(self, request):
+        self.catalog.append(request.device)
+        return self._success()
+
+    def _AddDevice(self, request):
+        device = server_pb2.Device()
+        device.CopyFrom(request.device)
+        if not device.uuid:
+            device.uuid = str(uuid.uuid4())
+        self.devices[device.uuid] = device
+        return self._success(device=device)
+
+    def _RemoveDevice(self, request):
+        if self.devices.pop(request.device_uuid, None) is None:
+            return FakeResponse(status="failure", message="Device not found")
+        self.connections = [
+            c for c in self.connections
+            if request.device_uuid not in (c["device_one_uuid"], c["device_two_uuid"])
+        ]
+        return self._success()
+
+    def _ConnectDevices(self, request):
+        for device_uuid in (request.device_uuid_1, request.device_uuid_2):
+            if device_uuid not in self.devices:
+                return FakeResponse(status="failure", message="Device not found")
+        self.connections.append({
+            "device_one_uuid": request.device_uuid_1,
+            "device_one_port_label": request.device_port_1,
+            "device_two_uuid": request.device_uuid_2,
+            "device_two_port_label": request.device_port_2,
+        })
+        return self._success()
+
+    def _DisconnectDevices(self, request):
+        connection = {
+            "device_one_uuid": request.device_uuid_1,
+            "device_one_port_label": request.device_port_1,
+            "device_two_uuid": request.device_uuid_2,
+            "device_two_port_label": request.device_port_2,
+        }
+        if connection not in self.connections:
+            return FakeResponse(status="failure", message="Connection not found")
+        self.connections.remove(connection)
+        return self._success()
+
+    def _UpdateDeviceProperties(self, request):
+        device = self.devices.get(request.device.uuid)
+        if device is None:
+            return FakeResponse(status="failure", message="Device not found")
+        device.device_properties.CopyFrom(request.device.device_properties)
+        return self._success()
+
+
+class RecordingBoard:
+    """
+    Headless stand-in of the flet Board, registered with the
+    BoardManager. It records the loaded devices and connections.
+    """
+    def __init__(self):
+        self.devices = []
+        self.connections = []
+        self.device_controls = []
+        self.cleared = 0
+
+    def clear_board(self):
+        self.devices = []
+        self.connections = []
+        self.device_controls = []
+        self.cleared += 1
+
+    def load_devices_bulk(self, devices):
+        self.devices.extend(devices)
+        self.device_controls.extend(
+            SimpleNamespace(device=device, left=device.location[0], top=device.location[1])
+            for device in devices
+            )
+
+    def load_connections_bulk(self, connections):
+        self.connections.extend(connections)
+
+    def remove_component(self, component):
+        self.devices.remove(component)
+
+    def get_device(self, uuid):
+        return None
+
+
+def wait_until(predicate, timeout: float = 5.0, interval: float = 0.005) -> bool:
+    """
+    Waits until the predicate is true, the callbacks of the non-blocking
+    calls run after the returned futures are resolved.
+    """
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(interval)
+    return predicate()
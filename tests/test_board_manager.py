@@ -0,0 +1,193 @@
+"""
+Headless tests of the BoardManager against the FakeProjectServer
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("qureed_project_server")
+pytest.importorskip("grpc")
+
+from fake_server import RecordingBoard, synthetic_scheme, wait_until
+from logic.scheme_journal import SchemeAutosave
+import qureed_project_server.server_pb2 as MSG
+
+
+@pytest.fixture
+def board(managers, fake_server, tmp_path):
+    board = RecordingBoard()
+    managers.PM.path = str(tmp_path)
+    managers.SeM.register_device_settings(SimpleNamespace(hide_settings=lambda: None))
+    managers.BM.register_board(board)
+    managers.BM.opened_scheme = None
+    yield board
+    managers.BM.close_scheme()
+    managers.BM.register_board(None)
+    managers.BM.opened_scheme = None
+    managers.BM.opening_scheme = None
+    managers.PM.path = None
+
+
+def test_open_scheme_loads_board(managers, fake_server, board):
+    fake_server.add_scheme("big.json", *synthetic_scheme(2000))
+
+    managers.BM.open_scheme("big.json")
+
+    assert wait_until(lambda: managers.BM.opened_scheme == "big.json")
+    assert len(board.devices) == 2000
+    assert len(board.connections) == 1999
+    assert managers.SvM.metrics.get("Board.load_devices_bulk")["calls"] == 1
+
+
+def test_failed_open_keeps_scheme(managers, fake_server, board):
+    fake_server.fail("OpenBoard", error="board is corrupted")
+
+    managers.BM.open_scheme("broken.json")
+
+    assert wait_until(lambda: fake_server.calls_to("OpenBoard"))
+    assert not wait_until(lambda: managers.BM.opened_scheme, timeout=0.2)
+    assert board.devices == []
+
+
+def test_failed_removal_keeps_device(managers, fake_server, board):
+    device = SimpleNamespace(device=SimpleNamespace(uuid="missing"))
+    board.board = SimpleNamespace(controls=[device])
+
+    managers.BM.remove_device(device)
+
+    assert wait_until(lambda: fake_server.calls_to("RemoveDevice"))
+    assert board.board.controls == [device]
+
+
+def open_scheme(managers, fake_server, devices=3):
+    fake_server.add_scheme("scheme.json", *synthetic_scheme(devices))
+    managers.BM.open_scheme("scheme.json")
+    assert wait_until(lambda: managers.BM.opened_scheme == "scheme.json")
+    return list(fake_server.devices.values())
+
+
+def save(managers):
+    responses = []
+    managers.BM.save_scheme(on_done=responses.append)
+    assert wait_until(lambda: responses)
+    return responses[0]
+
+
+def test_unchanged_scheme_is_not_saved(managers, fake_server, board):
+    open_scheme(managers, fake_server)
+
+    assert save(managers) is None
+    assert fake_server.calls_to("SaveBoard") == []
+
+
+def test_save_sends_all_devices(managers, fake_server, board):
+    devices = open_scheme(managers, fake_server)
+    moved = board.device_controls[1]
+    moved.left, moved.top = 400, 300
+
+    managers.BM.mark_moved(moved)
+    response = save(managers)
+
+    assert response.status == "success"
+    request = fake_server.calls_to("SaveBoard")[0]
+    assert [d.uuid for d in request.devices] == [d.uuid for d in devices]
+    assert list(request.devices[1].location) == [400, 300]
+    assert not managers.BM.has_unsaved_changes
+
+
+def test_edit_without_move_keeps_the_devices(managers, fake_server, board):
+    devices = open_scheme(managers, fake_server)
+
+    managers.BM.mark_changed()
+    save(managers)
+
+    assert len(fake_server.calls_to("SaveBoard")[0].devices) == 3
+    assert list(fake_server.devices) == [d.uuid for d in devices]
+
+
+def test_failed_save_keeps_changes(managers, fake_server, board):
+    devices = open_scheme(managers, fake_server)
+    managers.BM.mark_moved(SimpleNamespace(device=devices[0], left=10, top=10))
+    fake_server.fail("SaveBoard", error="disk full")
+
+    assert save(managers).status == "failure"
+    assert list(managers.BM.moved_devices) == [devices[0].uuid]
+
+
+def test_scheme_opens_after_a_transport_error_of_the_save(managers, fake_server, board):
+    devices = open_scheme(managers, fake_server)
+    managers.BM.mark_moved(SimpleNamespace(device=devices[0], left=10, top=10))
+    fake_server.add_scheme("other.json", *synthetic_scheme(2))
+    fake_server.fail("SaveBoard", error=ConnectionError("unavailable"))
+
+    managers.BM.open_scheme("other.json")
+
+    assert wait_until(lambda: managers.BM.opened_scheme == "other.json")
+    assert len(board.devices) == 2
+
+
+def test_repeated_open_is_ignored(managers, fake_server, board):
+    fake_server.add_scheme("slow.json", *synthetic_scheme(2))
+    fake_server.latency = {"OpenBoard": 0.1}
+
+    managers.BM.open_scheme("slow.json")
+    managers.BM.open_scheme("slow.json")
+
+    assert wait_until(lambda: managers.BM.opened_scheme == "slow.json")
+    assert len(fake_server.calls_to("OpenBoard")) == 1
+    assert managers.BM.opening_scheme is None
+
+
+def test_edits_are_journaled_until_saved(managers, fake_server, board):
+    devices = open_scheme(managers, fake_server)
+    journal = SchemeAutosave.journal_for(managers.PM.path, "scheme.json")
+
+    managers.SvM.remove_device(devices[0].uuid)
+    managers.BM.mark_changed()
+
+    assert [e["method"] for e in journal.entries()] == ["RemoveDevice"]
+    save(managers)
+    assert journal.entries() == []
+
+
+def test_journal_is_replayed_on_open(managers, fake_server, board):
+    devices, connections = synthetic_scheme(3)
+    fake_server.add_scheme("scheme.json", devices, connections)
+    journal = SchemeAutosave.journal_for(managers.PM.path, "scheme.json")
+    request = MSG.RemoveDeviceRequest(device_uuid=devices[0].uuid)
+    managers.BM.autosave.journal = journal
+    managers.BM.autosave.record_rpc("qm_stub", "RemoveDevice", request)
+    managers.BM.autosave.journal = None
+    journal.append({"op": "move", "uuid": devices[1].uuid, "location": [42, 24]})
+
+    managers.BM.open_scheme("scheme.json")
+
+    assert wait_until(lambda: managers.BM.opened_scheme == "scheme.json")
+    assert [d.uuid for d in board.devices] == [d.uuid for d in devices[1:]]
+    assert list(board.devices[0].location) == [42, 24]
+    assert len(fake_server.calls_to("SaveBoard")) == 1
+    assert journal.entries() == []
+
+
+def test_journaled_property_edit_keeps_the_device(managers, fake_server, board):
+    devices, connections = synthetic_scheme(2)
+    fake_server.add_scheme("scheme.json", devices, connections)
+    journal = SchemeAutosave.journal_for(managers.PM.path, "scheme.json")
+    edit = MSG.Device(
+        uuid=devices[0].uuid,
+        device_properties=MSG.DeviceProperties(properties={"offset": {"value": 2.0}}),
+        )
+    managers.BM.autosave.journal = journal
+    managers.BM.autosave.record_rpc(
+        "qm_stub", "UpdateDeviceProperties", MSG.UpdateDevicePropertiesRequest(device=edit)
+        )
+    managers.BM.autosave.journal = None
+
+    managers.BM.open_scheme("scheme.json")
+
+    assert wait_until(lambda: managers.BM.opened_scheme == "scheme.json")
+    saved = fake_server.devices[devices[0].uuid]
+    assert saved.module_class == devices[0].module_class
+    assert [p.label for p in saved.ports] == ["in0", "out0"]
+    assert list(saved.location) == list(devices[0].location)
+    assert set(saved.device_properties.properties.keys()) == {"gain", "offset"}
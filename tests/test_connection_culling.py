@@ -0,0 +1,104 @@
+"""
+Tests of the culling of the rendered connections, when several schemes
+are opened one after another
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("flet")
+
+import flet.canvas as cv
+
+from logic import spatial_index
+from logic.connection_manager import ConnectionManager
+from logic.spatial_index import intersects
+
+VISIBLE = (0, 0, 1000, 1000)
+
+
+class FakePort:
+    """
+    Port stand-in at the given board location
+    """
+    def __init__(self, x, y):
+        self.location = (x, y)
+        self.connection = None
+
+    def set_connection(self, connection=None, update=True):
+        self.connection = connection
+
+
+@pytest.fixture
+def CM():
+    CM = ConnectionManager()
+    CM.register_canvas(SimpleNamespace(canvas=cv.Canvas()))
+    CM.clear_connections()
+    yield CM
+    CM.clear_connections()
+
+
+def open_scheme(CM, xs):
+    """
+    Clears the board and loads a connection at each x, like
+    Board.clear_board and Board.load_connections_bulk do
+    """
+    CM.canvas.canvas.shapes = []
+    CM.clear_connections()
+    for x in xs:
+        CM.load_connection(FakePort(x, 10), FakePort(x + 50, 20), update=False)
+    CM.cull_connections(VISIBLE)
+
+
+def test_second_scheme_replaces_the_connections(CM):
+    open_scheme(CM, [100, 5000])
+    first = CM.connections()
+    assert [c.mounted for c in first] == [True, False]
+
+    open_scheme(CM, [200, 300, 6000])
+    CM.cull_connections((4000, 0, 7000, 1000))
+
+    assert len(CM.connections()) == 3
+    shapes = CM.canvas.canvas.shapes
+    assert shapes == [c.connection for c in CM.connections() if c.mounted]
+    assert len(shapes) == 1
+    assert not any(c.connection in shapes for c in first)
+
+
+def test_hide_after_the_canvas_was_cleared(CM):
+    open_scheme(CM, [100])
+    connection, = CM.connections()
+    CM.canvas.canvas.shapes = []
+
+    connection.hide()
+
+    assert not connection.mounted
+
+
+def test_cull_only_looks_at_the_visible_area(CM, monkeypatch):
+    open_scheme(CM, [100, 5000, 9000])
+    near, far, farther = CM.connections()
+    checked = []
+
+    def counting_intersects(bounds, area):
+        checked.append(bounds)
+        return intersects(bounds, area)
+
+    monkeypatch.setattr(spatial_index, "intersects", counting_intersects)
+
+    CM.cull_connections((4000, 0, 7000, 1000))
+
+    assert [c.mounted for c in (near, far, farther)] == [False, True, False]
+    assert checked == [far.bounds()]
+
+
+def test_moved_connections_are_reindexed(CM):
+    open_scheme(CM, [5000])
+    connection, = CM.connections()
+    connection.move(connection.port_a, -4900, 0, update=False)
+    connection.move(connection.port_b, -4900, 0, update=False)
+
+    CM.moved([connection])
+    CM.cull_connections(VISIBLE)
+
+    assert connection.mounted
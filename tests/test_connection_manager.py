@@ -0,0 +1,74 @@
+"""
+Headless tests of the ConnectionManager against the FakeProjectServer
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("qureed_project_server")
+pytest.importorskip("grpc")
+
+from fake_server import synthetic_scheme, wait_until
+
+
+class FakePort:
+    """
+    Port stand-in, records the connection updates
+    """
+    def __init__(self, device_uuid, port_label):
+        self.device = SimpleNamespace(uuid=device_uuid)
+        self.port_label = port_label
+        self.connection = None
+        self.resets = 0
+
+    def set_connection(self, connection=None):
+        self.connection = connection
+        if connection is None:
+            self.resets += 1
+
+
+@pytest.fixture
+def scheme(managers, fake_server):
+    fake_server.add_scheme("scheme.json", *synthetic_scheme(2))
+    managers.SvM.open_scheme("scheme.json")
+    managers.CM.first_port = None
+    managers.CM.all_connections = {}
+    return list(fake_server.devices)
+
+
+def test_connect_action(managers, fake_server, scheme, monkeypatch):
+    loaded = []
+    monkeypatch.setattr(managers.CM, "load_connection", lambda a, b: loaded.append((a, b)))
+    port_a, port_b = FakePort(scheme[0], "out0"), FakePort(scheme[1], "in0")
+    fake_server.connections = []
+
+    managers.CM.connect_action(port_a)
+    managers.CM.connect_action(port_b)
+
+    assert wait_until(lambda: loaded == [(port_a, port_b)])
+    assert len(fake_server.connections) == 1
+
+
+def test_failed_connect_resets_ports(managers, fake_server, scheme):
+    fake_server.fail("ConnectDevices", error="incompatible signals")
+    port_a, port_b = FakePort(scheme[0], "out0"), FakePort(scheme[1], "in0")
+
+    managers.CM.connect_action(port_a)
+    managers.CM.connect_action(port_b)
+
+    assert wait_until(lambda: port_a.resets == 1 and port_b.resets == 1)
+
+
+def test_disconnect(managers, fake_server, scheme):
+    port_a, port_b = FakePort(scheme[0], "out0"), FakePort(scheme[1], "in0")
+    removed = []
+    connection = SimpleNamespace(
+        port_a=port_a, port_b=port_b, remove=lambda: removed.append(True)
+        )
+    managers.CM.register_connection(port_a, port_b, connection)
+
+    managers.CM.disconnect(port_a)
+
+    assert wait_until(lambda: removed == [True])
+    assert fake_server.connections == []
+    assert managers.CM.all_connections[port_a] == []
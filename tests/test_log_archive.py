@@ -0,0 +1,71 @@
+"""
+Tests of the on-disk simulation log archive
+"""
+import json
+import random
+from types import SimpleNamespace
+
+from logic.log_archive import LogArchive, ArchivedRun
+from logic.log_index import LogFilter
+from logic.log_store import LogStore
+
+
+def make_log(timestamp, index=0, device="Laser"):
+    return SimpleNamespace(
+        simulation_timestamp=str(timestamp), index=index,
+        device_name=device, log_type="INFO"
+        )
+
+
+def encode(log) -> bytes:
+    return json.dumps(vars(log)).encode()
+
+
+def decode(payload: bytes):
+    return SimpleNamespace(**json.loads(payload))
+
+
+def make_archive(tmp_path):
+    return LogArchive(tmp_path / "logs" / "simulation_logs.sqlite", decode=decode, encode=encode)
+
+
+def test_positions_match_the_memory_store(tmp_path):
+    random.seed(2)
+    archive = make_archive(tmp_path)
+    archive.start_run("run", "main.json")
+    store = LogStore()
+    logs = [make_log(round(random.uniform(0, 10), 1), i) for i in range(1000)]
+
+    for start in range(0, len(logs), 100):
+        batch = logs[start:start + 100]
+        assert archive.append("run", batch) == store.extend(batch)
+
+    run = ArchivedRun(archive, "run", page_size=64, cached_pages=2)
+    assert len(run) == 1000
+    assert [log.index for log in run] == [log.index for log in store]
+    assert len(run.pages) == 2
+
+
+def test_runs_are_reopened(tmp_path):
+    archive = make_archive(tmp_path)
+    archive.start_run("first", "main.json")
+    archive.append("first", [make_log(t, t, "Laser" if t % 2 else "Detector") for t in range(10)])
+    archive.end_run("first")
+    archive.close()
+
+    archive = make_archive(tmp_path)
+    (run,) = archive.runs()
+    assert run["simulation_id"] == "first" and run["ended"] is not None
+    detector = ArchivedRun(archive, "first", LogFilter(device="Detector"))
+    assert [log.index for log in detector] == [0, 2, 4, 6, 8]
+
+
+def test_live_run_drops_the_stale_pages(tmp_path):
+    archive = make_archive(tmp_path)
+    run = ArchivedRun(archive, "live", page_size=4)
+    run.extend([make_log(t, t) for t in range(8)])
+    assert run[5].index == 5
+
+    assert run.extend([make_log(4.5, 100)]) == [5]
+    assert len(run) == 9
+    assert [log.index for log in run] == [0, 1, 2, 3, 4, 100, 5, 6, 7]
@@ -0,0 +1,91 @@
+"""
+Tests of the search index of the simulation logs
+"""
+import random
+from types import SimpleNamespace
+
+from logic.log_index import LogFilter, LogIndex
+
+DEVICES = [("Laser", "IdealLaser"), ("Splitter", "BeamSplitter"), ("Detector", "PhotonDetector")]
+MESSAGES = ["Emitting photon", "Photon detected", "State updated", "Splitting the beam"]
+
+
+def make_log(timestamp, index):
+    device, device_type = DEVICES[index % len(DEVICES)]
+    return SimpleNamespace(
+        simulation_timestamp=str(timestamp), index=index, device_name=device,
+        device_type=device_type, log_type="INFO" if index % 5 else "WARNING",
+        message=f"{MESSAGES[index % len(MESSAGES)]} #{index}",
+        )
+
+
+def make_logs(count, seed=3):
+    random.seed(seed)
+    return [make_log(round(random.uniform(0, 100), 2), i) for i in range(count)]
+
+
+def ordered(logs):
+    return [log.index for log in sorted(logs, key=lambda log: (float(log.simulation_timestamp), log.index))]
+
+
+FILTERS = [
+    LogFilter(),
+    LogFilter(device="Detector"),
+    LogFilter(device="Laser", log_type="WARNING"),
+    LogFilter(device_type="BeamSplitter", start=10, end=20.5),
+    LogFilter(text="phot"),
+    LogFilter(text="photon det", start=50),
+    LogFilter(device="Unknown"),
+]
+
+
+def test_query_matches_the_scan():
+    logs = make_logs(3000)
+    index = LogIndex()
+    index.extend(logs)
+
+    for log_filter in FILTERS:
+        expected = ordered([log for log in logs if log_filter.matches(log)])
+        assert [log.index for log in index.query(log_filter)] == expected, log_filter
+
+
+def test_values_and_clear():
+    index = LogIndex()
+    index.extend(make_logs(30))
+
+    assert index.values("device") == ["Detector", "Laser", "Splitter"]
+    index.clear()
+    assert len(index) == 0 and index.query(LogFilter(device="Laser")) == []
+
+
+class TrackedLog(SimpleNamespace):
+    """
+    Log which counts the reads of its fields while tracking is enabled
+    """
+    tracking = False
+    reads = 0
+
+    def __getattribute__(self, name):
+        if type(self).tracking:
+            type(self).reads += 1
+        return super().__getattribute__(name)
+
+
+def test_query_uses_the_index_for_large_runs():
+    random.seed(4)
+    # Streams are mostly ordered, with a small jitter
+    logs = [
+        TrackedLog(**vars(make_log(round(i * 0.001 + random.uniform(0, 0.005), 4), i)))
+        for i in range(200000)
+    ]
+    index = LogIndex()
+    index.extend(logs)
+
+    TrackedLog.reads, TrackedLog.tracking = 0, True
+    try:
+        assert index.query(LogFilter(device="Detector", log_type="WARNING", start=10, end=20))
+        assert index.query(LogFilter(text="detected #1999"))
+    finally:
+        TrackedLog.tracking = False
+    # A scan would read the fields of every log
+    assert TrackedLog.reads < 1000
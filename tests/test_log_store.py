@@ -0,0 +1,58 @@
+"""
+Tests of the ordered simulation log store
+"""
+import random
+from types import SimpleNamespace
+
+from logic.log_store import LogStore
+
+
+def make_log(timestamp, index=0):
+    return SimpleNamespace(simulation_timestamp=str(timestamp), index=index)
+
+
+def apply(view, logs, positions):
+    for log, position in zip(logs, positions):
+        view.insert(position, log)
+
+
+def test_in_order_logs_are_appended():
+    store = LogStore()
+    logs = [make_log(t) for t in range(100)]
+
+    assert store.extend(logs) == list(range(100))
+    assert list(store) == logs
+
+
+def test_positions_reproduce_the_order():
+    random.seed(1)
+    store = LogStore()
+    view = []
+    logs = [make_log(random.uniform(0, 10), i) for i in range(2000)]
+
+    for start in range(0, len(logs), 100):
+        batch = logs[start:start + 100]
+        apply(view, batch, store.extend(batch))
+
+    timestamps = [float(log.simulation_timestamp) for log in view]
+    assert timestamps == sorted(timestamps)
+    assert view == list(store)
+
+
+def test_equal_timestamps_keep_arrival_order():
+    store = LogStore()
+    logs = [make_log(1.0, 0), make_log(2.0, 1), make_log(1.0, 2), make_log(1.0, 3)]
+
+    store.extend(logs)
+
+    assert [log.index for log in store] == [0, 2, 3, 1]
+
+
+def test_clear():
+    store = LogStore()
+    store.extend([make_log(1.0)])
+
+    store.clear()
+
+    assert len(store) == 0
+    assert store.insert(make_log(0.5)) == 0
@@ -0,0 +1,81 @@
+"""
+Tests of the batched simulation log streaming
+"""
+import asyncio
+from types import SimpleNamespace
+
+from logic.log_stream import LogPolicy, LogStreamBuffer
+
+
+def make_log(index, end=False, figure=""):
+    return SimpleNamespace(
+        index=index, end=end, figure=figure,
+        tensor=SimpleNamespace(real_values=[])
+        )
+
+
+def stream(logs, **kwargs):
+    """
+    Streams the logs through the buffer, returns the flushed batches
+    """
+    batches = []
+
+    async def run():
+        buffer = LogStreamBuffer(
+            lambda batch, dropped: batches.append((batch, dropped)),
+            lambda callback: callback(),
+            **kwargs
+            )
+        for log in logs:
+            await buffer.put(log)
+        await buffer.close()
+        return buffer
+
+    buffer = asyncio.run(run())
+    return batches, buffer
+
+
+def flushed(batches):
+    return [log.index for batch, _ in batches for log in batch]
+
+
+def test_logs_are_batched():
+    batches, buffer = stream([make_log(i) for i in range(1000)], fps=1000, batch_size=300)
+
+    assert flushed(batches) == list(range(1000))
+    assert all(len(batch) <= 300 for batch, _ in batches)
+    assert len(batches) < 1000
+    assert buffer.total_dropped == 0
+
+
+def test_block_policy_keeps_every_log():
+    batches, buffer = stream(
+        [make_log(i) for i in range(500)], fps=1000, capacity=10, policy=LogPolicy.BLOCK
+        )
+
+    assert flushed(batches) == list(range(500))
+    assert buffer.total_dropped == 0
+
+
+def test_drop_oldest_policy():
+    batches, buffer = stream(
+        [make_log(i) for i in range(500)], fps=1000, capacity=10,
+        policy=LogPolicy.DROP_OLDEST
+        )
+
+    indices = flushed(batches)
+    assert indices[-10:] == list(range(490, 500))
+    assert len(indices) + buffer.total_dropped == 500
+    assert sum(dropped for _, dropped in batches) == buffer.total_dropped
+
+
+def test_decimate_policy_keeps_essential_logs():
+    logs = [make_log(i, figure="plot.png" if i % 100 == 0 else "") for i in range(500)]
+    logs.append(make_log(500, end=True))
+
+    batches, buffer = stream(logs, fps=1000, capacity=20, policy=LogPolicy.DECIMATE)
+
+    indices = flushed(batches)
+    assert buffer.total_dropped > 0
+    assert {0, 100, 200, 300, 400, 500} <= set(indices)
+    assert indices == sorted(indices)
@@ -0,0 +1,50 @@
+"""
+Tests of the property write buffer against the FakeProjectServer
+"""
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("qureed_project_server")
+pytest.importorskip("grpc")
+
+from fake_server import synthetic_scheme, wait_until
+from logic.property_buffer import PropertyState, PropertyWriteBuffer
+import qureed_project_server.server_pb2 as MSG
+
+
+@pytest.fixture
+def component(managers, fake_server):
+    fake_server.add_scheme("scheme.json", *synthetic_scheme(1))
+    response = managers.SvM.open_scheme("scheme.json")
+    device = MSG.Device()
+    device.CopyFrom(response.devices[0])
+    return SimpleNamespace(device=device)
+
+
+def test_update_sends_the_whole_device(managers, fake_server, component):
+    states = []
+    buffer = PropertyWriteBuffer(component, debounce={"float": 0})
+    buffer.on_state = lambda name, state, message: states.append((name, state))
+
+    buffer.write("offset", {"type": "float", "value": 2.0})
+
+    assert wait_until(lambda: ("offset", PropertyState.COMMITTED) in states)
+    request, = fake_server.calls_to("UpdateDeviceProperties")
+    assert request.device.module_class == component.device.module_class
+    assert [p.label for p in request.device.ports] == ["in0", "out0"]
+    saved = fake_server.devices[component.device.uuid].device_properties.properties
+    assert set(saved.keys()) == {"gain", "offset"}
+
+
+def test_rapid_edits_are_coalesced(managers, fake_server, component):
+    states = []
+    buffer = PropertyWriteBuffer(component, debounce={"float": 0.05})
+    buffer.on_state = lambda name, state, message: states.append((name, state))
+
+    for value in range(5):
+        buffer.write("gain", {"type": "float", "value": float(value)})
+
+    assert wait_until(lambda: ("gain", PropertyState.COMMITTED) in states)
+    request, = fake_server.calls_to("UpdateDeviceProperties")
+    assert request.device.device_properties.properties["gain"]["value"] == 4.0
@@ -0,0 +1,232 @@
+"""
+Headless tests of the ServeManager against the FakeProjectServer
+"""
+import asyncio
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("qureed_project_server")
+pytest.importorskip("grpc")
+
+from fake_server import synthetic_scheme, wait_until
+from logic.server_manager import BatchAborted, MutationBatch
+
+
+class InlineManager:
+    """
+    Runs the submitted batch right away, in place of the ServeManager
+    """
+    def __init__(self):
+        self.errors = []
+
+    def report_error(self, error):
+        self.errors.append(error)
+
+    def submit(self, coro, on_done=None, on_error=None):
+        try:
+            result = asyncio.run(coro)
+        except Exception as e:
+            on_error(e)
+            return
+        on_done(result)
+
+
+def test_open_large_scheme(managers, fake_server):
+    devices, connections = synthetic_scheme(2000)
+    fake_server.add_scheme("big.json", devices, connections)
+
+    response = managers.SvM.open_scheme("big.json")
+
+    assert response.status == "success"
+    assert len(response.devices) == 2000
+    assert len(response.connections) == 1999
+    stats = managers.SvM.metrics.get("OpenBoard")
+    assert stats["calls"] == 1
+    assert stats["response_bytes"] == response.ByteSize()
+
+
+def test_latency_is_recorded(managers, fake_server):
+    fake_server.latency = {"GetDevices": 0.05}
+
+    managers.SvM.get_all_devices()
+    managers.SvM.get_all_signals()
+
+    assert managers.SvM.metrics.get("GetDevices")["wall"]["max"] >= 0.05
+    assert managers.SvM.metrics.get("GetSignals")["wall"]["max"] < 0.05
+
+
+def test_non_blocking_call_runs_callback(managers, fake_server):
+    results = []
+
+    future = managers.SvM.get_all_icons(on_done=results.append)
+
+    assert future.result(timeout=5).status == "success"
+    assert wait_until(lambda: len(results) == 1)
+    assert results[0].icons_list[0].name == "synthetic.png"
+
+
+def test_injected_error_reaches_on_error(managers, fake_server):
+    fake_server.fail("GetDevices", error=ConnectionError("unavailable"))
+    errors = []
+
+    managers.SvM.get_all_devices(on_error=errors.append)
+
+    assert wait_until(lambda: len(errors) == 1)
+    assert isinstance(errors[0], ConnectionError)
+    statuses = managers.SvM.metrics.get("GetDevices")["statuses"]
+    assert statuses == {"ConnectionError": 1}
+
+
+def test_injected_failure_status(managers, fake_server):
+    fake_server.fail("OpenBoard", error="board is corrupted")
+
+    response = managers.SvM.open_scheme("broken.json")
+
+    assert response.status == "failure"
+    assert response.message == "board is corrupted"
+
+
+def test_batch_stages_run_in_order(managers, fake_server):
+    fake_server.add_scheme("scheme.json", *synthetic_scheme(3))
+    managers.SvM.open_scheme("scheme.json")
+    uuids = list(fake_server.devices)
+    done = threading.Event()
+
+    with managers.SvM.batch() as batch:
+        managers.SvM.disconnect_devices(uuids[0], "out0", uuids[1], "in0", on_done=lambda _: None)
+        managers.SvM.disconnect_devices(uuids[1], "out0", uuids[2], "in0", on_done=lambda _: None)
+        batch.barrier()
+        managers.SvM.remove_device(uuids[1], on_done=lambda _: done.set())
+
+    assert done.wait(5)
+    methods = [name for name, _ in fake_server.calls]
+    assert methods[-3:] == ["DisconnectDevices", "DisconnectDevices", "RemoveDevice"]
+    assert fake_server.connections == []
+    assert uuids[1] not in fake_server.devices
+
+
+def test_barrier_waits_for_the_whole_stage():
+    events = []
+
+    async def step(name, delay):
+        events.append(f"start {name}")
+        await asyncio.sleep(delay)
+        events.append(f"end {name}")
+        return name
+
+    batch = MutationBatch(InlineManager())
+    first = batch.add(step("a", 0.05))
+    batch.add(step("b", 0.01))
+    batch.barrier()
+    batch.barrier()
+    last = batch.add(step("c", 0))
+    # Repeated barriers don't add empty stages
+    assert len(batch.stages) == 2
+    batch.flush()
+
+    assert events == ["start a", "start b", "end b", "end a", "start c", "end c"]
+    assert first.result() == "a" and last.result() == "c"
+
+
+def test_batch_failures_reach_their_own_callbacks():
+    async def ok():
+        return "ok"
+
+    async def broken():
+        raise ConnectionError("unavailable")
+
+    manager = InlineManager()
+    batch = MutationBatch(manager)
+    done, errors = [], []
+    batch.add(ok(), on_done=done.append)
+    batch.add(broken(), on_error=errors.append)
+    failed = batch.add(broken())
+    batch.flush()
+
+    assert done == ["ok"]
+    assert [type(e) for e in errors] == [ConnectionError]
+    assert isinstance(failed.exception(), ConnectionError)
+    assert [type(e) for e in manager.errors] == [ConnectionError]
+
+
+def test_failed_stage_aborts_the_later_stages():
+    sent = []
+
+    async def request(name, status="success"):
+        sent.append(name)
+        return SimpleNamespace(status=status)
+
+    manager = InlineManager()
+    batch = MutationBatch(manager)
+    done, errors = [], []
+    batch.add(request("disconnect", status="failure"), on_done=done.append)
+    batch.barrier()
+    skipped = batch.add(request("remove"), on_error=errors.append)
+    batch.flush()
+
+    assert sent == ["disconnect"]
+    assert [r.status for r in done] == ["failure"]
+    assert [type(e) for e in errors] == [BatchAborted]
+    assert isinstance(skipped.exception(), BatchAborted)
+
+
+def test_batch_is_discarded_if_the_context_raised(managers, fake_server):
+    fake_server.add_scheme("scheme.json", *synthetic_scheme(2))
+    managers.SvM.open_scheme("scheme.json")
+    uuid = next(iter(fake_server.devices))
+
+    with pytest.raises(KeyError):
+        with managers.SvM.batch():
+            future = managers.SvM.remove_device(uuid, on_done=lambda _: None)
+            raise KeyError("gesture failed")
+
+    assert future.cancelled()
+    assert fake_server.calls_to("RemoveDevice") == []
+    assert uuid in fake_server.devices
+
+
+def test_empty_batch_is_not_submitted():
+    batch = MutationBatch(InlineManager())
+    batch.barrier()
+
+    assert batch.flush() is None
+
+
+def test_replay_log(managers, fake_server):
+    fake_server.add_scheme("scheme.json", *synthetic_scheme(2))
+    managers.SvM.open_scheme("scheme.json")
+    device = next(iter(fake_server.devices.values()))
+
+    managers.SvM.remove_device(device.uuid)
+
+    assert [method for _, method, _ in managers.SvM.replay_log] == ["RemoveDevice"]
+    managers.SvM.replay("scheme.json")
+    # Replayed edits are kept until the scheme is saved
+    assert [method for _, method, _ in managers.SvM.replay_log] == ["RemoveDevice"]
+    assert device.uuid not in fake_server.devices
+
+
+def test_simulation_start_is_recorded(managers, fake_server):
+    fake_server.fail("StartSimulation", error="no simulation")
+
+    managers.SvM.start_simulation("scheme.json", "sim-1", 1.0)
+
+    assert managers.SvM.metrics.get("StartSimulation")["statuses"] == {"failure": 1}
+    request = fake_server.calls_to("StartSimulation")[0]
+    assert request.simulation_id == "sim-1"
+
+
+def test_failed_client_channel_is_closed(managers, fake_server):
+    closed = []
+
+    async def close():
+        closed.append(True)
+
+    managers.SvM.client = SimpleNamespace(channel=SimpleNamespace(close=close))
+
+    managers.SvM.close_client()
+
+    assert closed == [True]
+    assert managers.SvM.client is None
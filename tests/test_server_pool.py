@@ -0,0 +1,111 @@
+"""
+Tests of the pool of the standby project servers, with stubbed
+server processes
+"""
+import threading
+import time
+
+import pytest
+
+pytest.importorskip("grpc")
+
+from logic.server_pool import ProjectServer, ServerPool
+
+
+class FakeProcess:
+    def __init__(self):
+        self.returncode = None
+
+    def poll(self):
+        return self.returncode
+
+    def kill(self):
+        self.returncode = -9
+
+    def wait(self):
+        return self.returncode
+
+
+@pytest.fixture
+def startups(monkeypatch):
+    """
+    Stubs the server startup, every startup blocks on its own gate
+    until the test releases it
+    """
+    gates = []
+    lock = threading.Lock()
+
+    def start(server, attempts=1, timeout=1):
+        gate = threading.Event()
+        with lock:
+            gates.append(gate)
+        server.process = FakeProcess()
+        gate.wait(5)
+        server.ready.set()
+
+    monkeypatch.setattr(ProjectServer, "start", start)
+    return gates
+
+
+def wait_for(predicate, timeout=5):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_starting_standby_is_not_claimed(startups):
+    pool = ServerPool(output=None, size=1)
+    pool.replenish("venv")
+    assert wait_for(lambda: len(startups) == 1)
+
+    assert pool.claim("venv") is None
+
+    startups[0].set()
+    server, = pool.standby["venv"]
+    assert wait_for(server.ready.is_set)
+    assert pool.claim("venv") is server
+    assert pool.standby["venv"] == []
+
+
+def test_replenish_keeps_starting_standbys(startups):
+    pool = ServerPool(output=None, size=1)
+    pool.replenish("venv")
+    assert wait_for(lambda: len(startups) == 1)
+
+    pool.replenish("venv")
+
+    assert len(pool.standby["venv"]) == 1
+    assert len(startups) == 1
+    startups[0].set()
+
+
+def test_dead_standby_is_discarded(startups):
+    pool = ServerPool(output=None, size=1)
+    pool.replenish("venv")
+    assert wait_for(lambda: len(startups) == 1)
+    startups[0].set()
+    server, = pool.standby["venv"]
+    assert wait_for(server.ready.is_set)
+    server.process.kill()
+
+    assert pool.claim("venv") is None
+    assert pool.standby["venv"] == []
+
+
+def test_least_recently_used_venv_is_evicted(startups):
+    pool = ServerPool(output=None, size=1, max_venvs=1)
+    pool.replenish("old")
+    assert wait_for(lambda: len(startups) == 1)
+    startups[0].set()
+    old, = pool.standby["old"]
+    assert wait_for(old.ready.is_set)
+
+    pool.replenish("new")
+
+    assert list(pool.standby) == ["new"]
+    assert not old.alive()
+    assert wait_for(lambda: len(startups) == 2)
+    startups[1].set()
@@ -0,0 +1,81 @@
+"""
+Tests of the project server supervisor against in-process grpc servers
+"""
+import threading
+import time
+from concurrent import futures
+from types import SimpleNamespace
+
+import pytest
+
+grpc = pytest.importorskip("grpc")
+
+from logic.server_supervisor import ServerSupervisor
+
+
+class HungHandler(grpc.GenericRpcHandler):
+    """
+    Accepts every call and never answers, like a hung server
+    """
+    def __init__(self):
+        self.release = threading.Event()
+
+    def service(self, handler_call_details):
+        return grpc.unary_unary_rpc_method_handler(
+            lambda request, context: self.release.wait(5) and b""
+            )
+
+
+def serve(handlers=()):
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=4), handlers=handlers)
+    port = server.add_insecure_port("localhost:0")
+    server.start()
+    return server, port
+
+
+def fake_process(port):
+    killed = []
+    return SimpleNamespace(
+        port=port,
+        process=SimpleNamespace(poll=lambda: None, returncode=None),
+        kill=lambda: killed.append(True),
+        killed=killed,
+        )
+
+
+def test_hung_server_is_detected():
+    handler = HungHandler()
+    grpc_server, port = serve([handler])
+    failures = []
+    failed = threading.Event()
+
+    def on_failure(server, reason):
+        failures.append(reason)
+        failed.set()
+
+    supervisor = ServerSupervisor(on_failure, interval=0.05, timeout=0.1, misses=2)
+    server = fake_process(port)
+    try:
+        supervisor.watch(server)
+        assert failed.wait(5)
+        assert failures == ["server missed 2 heartbeats"]
+        assert server.killed == [True]
+    finally:
+        supervisor.release()
+        handler.release.set()
+        grpc_server.stop(None)
+
+
+def test_responsive_server_is_not_reported():
+    grpc_server, port = serve()
+    failures = []
+    supervisor = ServerSupervisor(
+        lambda server, reason: failures.append(reason), interval=0.05, timeout=0.5, misses=2
+        )
+    try:
+        supervisor.watch(fake_process(port))
+        time.sleep(0.5)
+        assert failures == []
+    finally:
+        supervisor.release()
+        grpc_server.stop(None)
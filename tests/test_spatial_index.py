@@ -0,0 +1,86 @@
+"""
+Tests of the spatial index of the board components
+"""
+import random
+
+from logic import spatial_index
+from logic.spatial_index import SpatialGrid, contains, intersects
+
+
+class Item:
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return self.name
+
+
+def brute_force(boxes, rect, predicate):
+    return [item for item, bounds in boxes.items() if predicate(bounds, rect)]
+
+
+def test_queries_match_brute_force():
+    rng = random.Random(3)
+    grid = SpatialGrid(cell_size=100)
+    boxes = {}
+    items = [Item(f"d{i}") for i in range(500)]
+    for item in items:
+        x, y = rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)
+        boxes[item] = (x, y, x + rng.uniform(20, 300), y + rng.uniform(20, 150))
+        grid.insert(item, boxes[item])
+    for item in rng.sample(items, 200):
+        x, y = rng.uniform(-2000, 2000), rng.uniform(-2000, 2000)
+        boxes[item] = (x, y, x + 120, y + 80)
+        grid.move(item, boxes[item])
+    for item in rng.sample(items, 50):
+        del boxes[item]
+        grid.remove(item)
+
+    for _ in range(100):
+        x, y = rng.uniform(-2500, 2500), rng.uniform(-2500, 2500)
+        rect = (x, y, x + rng.uniform(0, 1500), y + rng.uniform(0, 1500))
+        assert set(grid.query(rect)) == set(brute_force(boxes, rect, intersects))
+        assert set(grid.contained(rect)) == set(
+            brute_force(boxes, rect, lambda b, r: contains(r, b)))
+    assert len(grid) == 450
+
+
+def test_results_keep_insertion_order():
+    grid = SpatialGrid()
+    c, a, b = Item("c"), Item("a"), Item("b")
+    for item in (c, a, b):
+        grid.insert(item, (0, 0, 50, 50))
+    assert grid.query((10, 10, 20, 20)) == [c, a, b]
+    assert grid.at((25, 25)) == [b, a, c]
+    grid.move(c, (400, 400, 450, 450))
+    assert grid.query((-1000, -1000, 1000, 1000)) == [c, a, b]
+    assert grid.at((25, 25)) == [b, a]
+
+
+def test_nearest():
+    grid = SpatialGrid()
+    far, near = Item("far"), Item("near")
+    grid.insert(far, (100, 0, 120, 20))
+    grid.insert(near, (30, 0, 50, 20))
+    assert grid.nearest((0, 10), 110) == [near, far]
+    assert grid.nearest((0, 10), 50) == [near]
+    assert grid.nearest((0, 10), 10) == []
+
+
+def test_dense_board_selection_visits_the_queried_cells(monkeypatch):
+    grid = SpatialGrid()
+    for i in range(10000):
+        x, y = (i % 100) * 300, (i // 100) * 200
+        grid.insert(Item(str(i)), (x, y, x + 150, y + 100))
+    checked = []
+
+    def counting_contains(outer, inner):
+        checked.append(inner)
+        return contains(outer, inner)
+
+    monkeypatch.setattr(spatial_index, "contains", counting_contains)
+    selected = grid.contained((999, 0, 1999, 700))
+
+    assert len(selected) == 6
+    # Only the items around the rectangle are checked, not all 10000
+    assert len(checked) < 50
@@ -0,0 +1,55 @@
+"""
+Tests of the summaries of the logged tensors
+"""
+import base64
+import struct
+import zlib
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from logic.tensor_summary import downsample, heatmap, page, summarize
+
+
+def test_summary_of_a_density_matrix():
+    state = np.zeros(64, dtype=complex)
+    state[[3, 10]] = [0.6, 0.8j]
+    rho = np.outer(state, state.conj())
+
+    summary = summarize(rho, top=3)
+
+    assert summary["shape"] == (64, 64)
+    assert summary["trace"] == pytest.approx(1)
+    assert summary["norm"] == pytest.approx(1)
+    assert summary["max_abs"][0][0] == (10, 10)
+    assert abs(summary["max_abs"][0][1]) == pytest.approx(0.64)
+
+
+def test_downsample_keeps_the_peaks():
+    matrix = np.zeros((1000, 300))
+    matrix[999, 7] = -5
+
+    pooled = downsample(matrix, size=100)
+
+    assert pooled.shape == (100, 100)
+    assert pooled.max() == 5 and pooled[99, 2] == 5
+
+
+def test_heatmap_is_a_png():
+    png = base64.b64decode(heatmap(np.arange(12.0).reshape(3, 4)))
+
+    assert png.startswith(b"\x89PNG\r\n\x1a\n")
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == (4, 3)
+    start = png.index(b"IDAT") + 4
+    length = struct.unpack(">I", png[start - 8:start - 4])[0]
+    assert len(zlib.decompress(png[start:start + length])) == 3 * (4 * 3 + 1)
+
+
+def test_pages_of_higher_order_tensors():
+    tensor = np.arange(2 * 3 * 4).reshape(2, 3, 4)
+
+    block = page(tensor, 1, 10, 16, 8)
+
+    assert block.tolist() == [[22, 23]]
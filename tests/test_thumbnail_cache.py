@@ -0,0 +1,56 @@
+"""
+Tests of the cache of the plot previews
+"""
+import os
+import struct
+import threading
+import zlib
+
+import pytest
+
+pytest.importorskip("PIL")
+
+from logic.thumbnail_cache import ThumbnailCache
+
+
+def tiny_png() -> bytes:
+    def chunk(kind, data):
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", struct.pack(">IIBBBBB", 1, 1, 8, 2, 0, 0, 0))
+        + chunk(b"IDAT", zlib.compress(b"\x00\xff\x00\x00"))
+        + chunk(b"IEND", b"")
+    )
+
+
+def get(cache, path):
+    done = threading.Event()
+    previews = []
+
+    def loaded(preview):
+        previews.append(preview)
+        done.set()
+
+    cached = cache.get(path, loaded)
+    assert done.wait(5)
+    return cached, previews[0]
+
+
+def test_previews_are_cached_until_the_plot_changes(tmp_path):
+    cache = ThumbnailCache()
+    plot = tmp_path / "plot.png"
+    plot.write_bytes(tiny_png())
+    os.utime(plot, ns=(1, 1))
+
+    cached, first = get(cache, plot)
+    assert not cached
+    assert get(cache, plot) == (True, first)
+
+    os.utime(plot, ns=(2, 2))
+    assert get(cache, plot)[0] is False
+
+
+def test_missing_plot(tmp_path):
+    assert get(ThumbnailCache(), tmp_path / "missing.png") == (False, None)